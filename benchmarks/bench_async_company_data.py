@@ -0,0 +1,160 @@
+"""
+Throughput benchmark of the async company data path against the threaded sync path.
+
+Serves the same number of insert requests through `InsertCompanyData` on a thread
+pool and through `InsertCompanyDataAsync` on a single event loop. With
+``--mongo-uri`` the Mongo divisions are used; otherwise the vanilla divisions are
+used with a simulated round trip of ``--latency-ms`` per database call, slept with
+``time.sleep`` on the sync path and ``asyncio.sleep`` on the async one.
+
+Usage
+-----
+python -m benchmarks.bench_async_company_data --requests 5000 --concurrency 1000 --threads 32
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bisslog import bisslog_db as db
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.insert_company_data import INSERT_COMPANY_DATA
+from src.domain.use_cases.company_data.insert_company_data_async import \
+    INSERT_COMPANY_DATA_ASYNC
+from src.infra.database.implementations.vanilla_cache.async_vanilla_cache_divisions import (
+    AsyncSchemaVanillaCacheDivision, AsyncStoresVanillaCacheDivision)
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+SCHEMA = Schema(schema_keyname="company", schema_name="Company",
+                schema_description="Company schema for benchmarks",
+                current_schema_definition={
+                    "type": "object",
+                    "properties": {"name": {"type": "string"},
+                                   "revenue": {"type": "number"}},
+                    "required": ["name"]
+                })
+
+
+class SyncLatency:
+    """Division proxy sleeping the simulated round trip before every call."""
+
+    def __init__(self, division, latency: float):
+        self.division = division
+        self.latency = latency
+
+    def __getattr__(self, name):
+        method = getattr(self.division, name)
+
+        def call(*args, **kwargs):
+            time.sleep(self.latency)
+            return method(*args, **kwargs)
+        return call
+
+
+class AsyncLatency(SyncLatency):
+    """Async division proxy awaiting the simulated round trip before every call."""
+
+    def __getattr__(self, name):
+        method = getattr(self.division, name)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(self.latency)
+            return await method(*args, **kwargs)
+        return call
+
+
+def register_vanilla(latency: float) -> None:
+    """Register vanilla divisions behind the simulated latency."""
+    stores = StoresVanillaCacheDivision(thread_safe=True)
+    schemas = SchemaVanillaCacheDivision(thread_safe=True)
+    schemas.create_schema(SCHEMA)
+    stores.create_store_of_schema(SCHEMA)
+    db.register_adapters(
+        stores=SyncLatency(stores, latency), schema=SyncLatency(schemas, latency),
+        stores_async=AsyncLatency(AsyncStoresVanillaCacheDivision(stores), latency),
+        schema_async=AsyncLatency(AsyncSchemaVanillaCacheDivision(schemas), latency))
+
+
+def register_mongo(uri: str, database_name: str) -> None:
+    """Register the Mongo divisions, with the schema served from memory."""
+    # pylint: disable=import-outside-toplevel
+    from src.infra.database.implementations.pymongo.async_stores_pymongo_division import \
+        AsyncStoresMongoDivision
+    from src.infra.database.implementations.pymongo.client import (
+        build_async_mongo_client, build_mongo_client)
+    from src.infra.database.implementations.pymongo.stores_pymongo_division import \
+        StoresMongoDivision
+    schemas = SchemaVanillaCacheDivision(thread_safe=True)
+    schemas.create_schema(SCHEMA)
+    stores = StoresMongoDivision(build_mongo_client(uri), database_name)
+    stores.create_store_of_schema(SCHEMA)
+    db.register_adapters(
+        stores=stores, schema=schemas,
+        stores_async=AsyncStoresMongoDivision(build_async_mongo_client(uri), database_name),
+        schema_async=AsyncSchemaVanillaCacheDivision(schemas))
+
+
+def make_record(i: int) -> dict:
+    """Build a synthetic company record."""
+    return {"name": f"company-{i}", "revenue": i * 1.5}
+
+
+def run_sync(requests: int, threads: int) -> float:
+    """Serve the requests on a thread pool and return the elapsed seconds."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for result in executor.map(lambda i: INSERT_COMPANY_DATA("company", make_record(i)),
+                                   range(requests)):
+            assert "inserted" in result
+    return time.perf_counter() - started
+
+
+async def run_async(requests: int, concurrency: int) -> float:
+    """Serve the requests on the event loop and return the elapsed seconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int):
+        async with semaphore:
+            result = await INSERT_COMPANY_DATA_ASYNC("company", make_record(i))
+            assert "inserted" in result
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--mongo-uri", default=None)
+    parser.add_argument("--mongo-database", default="company_registry_bench")
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        register_mongo(args.mongo_uri, args.mongo_database)
+    else:
+        register_vanilla(args.latency_ms / 1000)
+
+    sync_seconds = run_sync(args.requests, args.threads)
+    async_seconds = asyncio.run(run_async(args.requests, args.concurrency))
+    print(json.dumps({
+        "backend": "mongo" if args.mongo_uri else "vanilla",
+        "requests": args.requests,
+        "simulated_latency_ms": None if args.mongo_uri else args.latency_ms,
+        "sync": {"threads": args.threads, "seconds": round(sync_seconds, 3),
+                 "requests_per_second": round(args.requests / sync_seconds)},
+        "async": {"concurrency": args.concurrency, "seconds": round(async_seconds, 3),
+                  "requests_per_second": round(args.requests / async_seconds)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Memory and speed benchmark of the dict and columnar layouts of the vanilla stores.
+
+Loads the same synthetic company records into a store of each layout and reports
+the memory they take, measured with tracemalloc, along with the load, point read
+and full scan times.
+
+Usage
+-----
+python -m benchmarks.bench_store_layouts --records 100000 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.columnar import LAYOUTS
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+SCHEMA = Schema(schema_keyname="bench_company", schema_name="Bench company",
+                schema_description="Company schema for benchmarks",
+                current_schema_definition={
+                    "type": "object",
+                    "properties": {"name": {"type": "string"},
+                                   "country": {"type": "string"},
+                                   "size": {"enum": ["small", "medium", "large"]},
+                                   "revenue": {"type": "number"},
+                                   "employees": {"type": "integer"},
+                                   "listed": {"type": "boolean"}}
+                })
+
+
+def make_record(i: int) -> dict:
+    """Build a synthetic company record."""
+    return {"name": f"company-{i}", "country": f"c{i % 50}",
+            "size": ("small", "medium", "large")[i % 3], "revenue": i * 1.5,
+            "employees": i % 5000, "listed": i % 2 == 0}
+
+
+def run(layout: str, records: int) -> dict:
+    """Load ``records`` records in a store of the given layout and measure it."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stores = StoresVanillaCacheDivision(layout=layout)
+    stores.create_store_of_schema(SCHEMA)
+    started = time.perf_counter()
+    sample = []
+    for start in range(0, records, 10_000):
+        batch = [make_record(i) for i in range(start, min(records, start + 10_000))]
+        uids = stores.insert_many_into_store(SCHEMA.schema_keyname, batch)
+        sample.extend(uids[:10_000 - len(sample)])
+    load_seconds = time.perf_counter() - started
+    del batch, uids
+    gc.collect()
+    stored_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for uid in sample:
+        stores.get_one_data_from_store(SCHEMA.schema_keyname, uid)
+    point_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    stores.get_data_from_store(SCHEMA.schema_keyname, {"country": "c7"})
+    scan_seconds = time.perf_counter() - started
+    return {"layout": layout, "records": records,
+            "stored_mb": round(stored_bytes / 2 ** 20, 1),
+            "bytes_per_record": round(stored_bytes / records, 1),
+            "load_seconds": round(load_seconds, 3),
+            "point_read_us": round(point_seconds / len(sample) * 1e6, 2),
+            "filtered_scan_seconds": round(scan_seconds, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    results = [run(layout, records) for records in args.records for layout in LAYOUTS]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
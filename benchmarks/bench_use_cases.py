@@ -0,0 +1,200 @@
+"""
+Benchmark suite of the company data and schema use cases.
+
+Drives the use cases through the adapters registered by `setup()` over a store
+preloaded with each of the requested numbers of records. Every size runs in its own
+process, so divisions start empty and the peak memory belongs to that size only.
+Reports operations per second and p50/p99 latency per use case, and the peak
+resident memory per size, after the preload and after every use case, as JSON, to
+be kept and compared across releases. Background store migrations are disabled, so
+schema updates do not re-validate the preloaded store while being measured.
+
+Usage
+-----
+python -m benchmarks.bench_use_cases --sizes 1000 10000 100000 1000000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional
+
+SCHEMA_KEYNAME = "bench_company"
+SCHEMA_DEFINITION = {
+    "type": "object",
+    "properties": {"name": {"type": "string"},
+                   "country": {"type": "string", "x-index": True},
+                   "sector": {"type": "string"},
+                   "revenue": {"type": "number"}},
+    "required": ["name", "country"]
+}
+COUNTRIES = 50
+SECTORS = 20
+USE_CASES = ("insert_company_data", "get_company_data_unfiltered",
+             "get_company_data_filtered_indexed", "get_company_data_filtered_scan",
+             "update_company_data", "delete_data_company", "create_schema",
+             "update_schema_definition")
+
+
+def make_record(i: int) -> dict:
+    """Build a synthetic company record."""
+    return {"name": f"company-{i}", "country": f"c{i % COUNTRIES}",
+            "sector": f"s{i % SECTORS}", "revenue": i * 1.5}
+
+
+def measure(operation: Callable[[int], object], ops: int) -> Dict[str, float]:
+    """Run an operation ``ops`` times and summarize its latencies."""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(ops):
+        op_started = time.perf_counter_ns()
+        operation(i)
+        latencies.append(time.perf_counter_ns() - op_started)
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    return {"ops": ops, "seconds": round(seconds, 4),
+            "ops_per_second": round(ops / seconds, 1) if seconds else None,
+            "p50_us": round(percentile(latencies, 50) / 1000, 1),
+            "p99_us": round(percentile(latencies, 99) / 1000, 1)}
+
+
+def percentile(sorted_values: List[int], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return float(sorted_values[int(rank) - 1])
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_size(size: int, ops: int, scan_ops: int, use_cases: List[str],
+             seed: int) -> dict:
+    """Preload ``size`` records and measure every requested use case over them."""
+    # read when the use cases are imported, before which it must be set
+    os.environ["STORE_MIGRATION"] = "0"
+    # pylint: disable=import-outside-toplevel
+    from bisslog import bisslog_db as db
+
+    from src.domain.use_cases.company_data.delete_company_data import delete_data_company
+    from src.domain.use_cases.company_data.get_company_data import GetCompanyData
+    from src.domain.use_cases.company_data.insert_company_data import INSERT_COMPANY_DATA
+    from src.domain.use_cases.company_data.update_company_data import UpdateCompanyData
+    from src.domain.use_cases.schema.create_schema import CREATE_SCHEMA
+    from src.domain.use_cases.schema.update_schema_definition import UpdateSchemaDefinition
+    from src.infra.entry_points.setup import setup
+
+    setup()
+    rnd = random.Random(seed)
+    get_company_data = GetCompanyData()
+    update_company_data = UpdateCompanyData()
+    update_schema_definition = UpdateSchemaDefinition()
+
+    CREATE_SCHEMA({"schema_keyname": SCHEMA_KEYNAME, "schema_name": "Bench company",
+                   "schema_description": "Company schema for benchmarks",
+                   "current_schema_definition": SCHEMA_DEFINITION})
+    started = time.perf_counter()
+    uids = []
+    for start in range(0, size, 10_000):
+        batch = [make_record(i) for i in range(start, min(size, start + 10_000))]
+        uids.extend(db.stores.insert_many_into_store(SCHEMA_KEYNAME, batch))
+    load_seconds = round(time.perf_counter() - started, 3)
+    load_peak_rss_mb = peak_rss_mb()
+
+    scenarios = {
+        "insert_company_data": (
+            lambda i: INSERT_COMPANY_DATA(SCHEMA_KEYNAME, make_record(size + i)), ops),
+        "get_company_data_unfiltered": (
+            lambda i: get_company_data(SCHEMA_KEYNAME), scan_ops),
+        "get_company_data_filtered_indexed": (
+            lambda i: get_company_data(SCHEMA_KEYNAME, {"country": f"c{i % COUNTRIES}"}),
+            scan_ops),
+        "get_company_data_filtered_scan": (
+            lambda i: get_company_data(SCHEMA_KEYNAME, {"sector": f"s{i % SECTORS}"}),
+            scan_ops),
+        "update_company_data": (
+            lambda i: update_company_data(SCHEMA_KEYNAME, {"revenue": float(i)},
+                                          uids[rnd.randrange(len(uids))]), ops),
+        "delete_data_company": (
+            lambda i: delete_data_company(SCHEMA_KEYNAME, uids.pop()), min(ops, len(uids))),
+        "create_schema": (
+            lambda i: CREATE_SCHEMA({"schema_keyname": f"bench_schema_{i}",
+                                     "schema_name": f"Bench schema {i}",
+                                     "schema_description": "Schema created by benchmarks",
+                                     "current_schema_definition": SCHEMA_DEFINITION}), ops),
+        "update_schema_definition": (
+            lambda i: update_schema_definition(
+                SCHEMA_KEYNAME, dict(SCHEMA_DEFINITION, description=f"revision {i}")), ops),
+    }
+
+    rnd.shuffle(uids)
+    results = []
+    for name in use_cases:
+        operation, count = scenarios[name]
+        result = {"records": size, "use_case": name}
+        result.update(measure(operation, count))
+        results.append(result)
+    return {"size": {"records": size, "load_seconds": load_seconds,
+                     "load_peak_rss_mb": load_peak_rss_mb, "peak_rss_mb": peak_rss_mb()},
+            "results": results}
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the benchmarked tree, if it is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: List[int], ops: int, scan_ops: int, use_cases: List[str], seed: int) -> dict:
+    """Run every size in a fresh process and return the JSON-serializable report."""
+    measured_sizes, results = [], []
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            measured = executor.submit(run_size, size, ops, scan_ops, use_cases, seed).result()
+        measured_sizes.append(measured["size"])
+        results.extend(measured["results"])
+    return {"meta": {"timestamp": datetime.now(timezone.utc).isoformat(),
+                     "git_revision": git_revision(),
+                     "python": platform.python_version(), "platform": platform.platform(),
+                     "ops": ops, "scan_ops": scan_ops, "seed": seed},
+            "sizes": measured_sizes, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=1000,
+                        help="operations measured per use case")
+    parser.add_argument("--scan-ops", type=int, default=20,
+                        help="operations measured per read returning many records")
+    parser.add_argument("--use-cases", nargs="+", choices=USE_CASES, default=list(USE_CASES))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="JSON file, stdout by default")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.ops, args.scan_ops, args.use_cases, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
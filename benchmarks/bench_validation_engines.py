@@ -0,0 +1,67 @@
+"""
+Speed benchmark of the compiled validators against jsonschema's Draft7Validator.
+
+Validates the same synthetic company records, valid and invalid ones, with a
+validator of each engine and reports the records validated per second.
+
+Usage
+-----
+python -m benchmarks.bench_validation_engines --records 100000
+"""
+import argparse
+import json
+import time
+
+from jsonschema.validators import Draft7Validator
+
+from src.domain.validation.compiled_validator import compile_validator
+
+DEFINITION = {
+    "type": "object",
+    "properties": {"name": {"type": "string", "minLength": 1},
+                   "country": {"type": "string", "pattern": "^[a-z]{2}$"},
+                   "size": {"enum": ["small", "medium", "large"]},
+                   "revenue": {"type": "number", "minimum": 0},
+                   "employees": {"type": "integer", "minimum": 0},
+                   "listed": {"type": "boolean"}},
+    "required": ["name", "country"],
+    "additionalProperties": False
+}
+ENGINES = {"jsonschema": Draft7Validator, "compiled": compile_validator}
+
+
+def make_record(i: int, valid: bool) -> dict:
+    """Build a synthetic company record, with three errors if not valid."""
+    record = {"name": f"company-{i}", "country": f"c{chr(97 + i % 26)}",
+              "size": ("small", "medium", "large")[i % 3], "revenue": i * 1.5,
+              "employees": i % 5000, "listed": i % 2 == 0}
+    if not valid:
+        record.update(country="COL", employees=-1, other=True)
+    return record
+
+
+def run(engine: str, records: int, valid: bool) -> dict:
+    """Validate ``records`` records with the given engine and measure it."""
+    started = time.perf_counter()
+    validator = ENGINES[engine](DEFINITION)
+    compile_seconds = time.perf_counter() - started
+    data = [make_record(i, valid) for i in range(records)]
+    started = time.perf_counter()
+    errors = sum(len(list(validator.iter_errors(record))) for record in data)
+    seconds = time.perf_counter() - started
+    return {"engine": engine, "records": records, "valid": valid, "errors": errors,
+            "compile_ms": round(compile_seconds * 1e3, 3),
+            "records_per_second": round(records / seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000])
+    args = parser.parse_args()
+    results = [run(engine, records, valid) for records in args.records
+               for valid in (True, False) for engine in ENGINES]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
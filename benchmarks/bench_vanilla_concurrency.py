@@ -0,0 +1,74 @@
+"""
+Multi-threaded throughput benchmark of the thread-safe vanilla store division.
+
+Runs a mixed workload of inserts, indexed reads and updates from a growing number of
+threads, each thread working on its own store or all of them on a shared one, and
+reports the operations per second reached with each thread count.
+
+Usage
+-----
+python -m benchmarks.bench_vanilla_concurrency --threads 1 2 4 8 --ops 20000
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+def make_schema(keyname: str) -> Schema:
+    """Build a schema with an indexed 'country' property."""
+    return Schema(schema_keyname=keyname, schema_name=keyname,
+                  schema_description="Schema for benchmarks",
+                  current_schema_definition={
+                      "type": "object",
+                      "properties": {"country": {"type": "string", "x-index": True},
+                                     "revenue": {"type": "number"}}
+                  })
+
+
+def worker(stores: StoresVanillaCacheDivision, keyname: str, ops: int) -> None:
+    """Run ``ops`` operations: 50% indexed reads, 30% inserts and 20% updates."""
+    uid = stores.insert_data_into_store(keyname, {"country": "c0", "revenue": 0})
+    for i in range(ops):
+        kind = i % 10
+        if kind < 5:
+            stores.get_data_from_store(keyname, {"country": f"c{i % 50}"})
+        elif kind < 8:
+            uid = stores.insert_data_into_store(keyname, {"country": f"c{i % 50}", "revenue": i})
+        else:
+            stores.update_data_in_store(keyname, {"revenue": i}, uid)
+
+
+def run(threads: int, ops: int, shared: bool) -> dict:
+    """Run the workload with the given number of threads and return its measures."""
+    stores = StoresVanillaCacheDivision(thread_safe=True)
+    keynames = ["shared"] if shared else [f"store{i}" for i in range(threads)]
+    for keyname in keynames:
+        stores.create_store_of_schema(make_schema(keyname))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(worker, stores, keynames[i % len(keynames)], ops)
+                   for i in range(threads)]
+        for future in futures:
+            future.result()
+    seconds = time.perf_counter() - started
+    return {"threads": threads, "shared_store": shared, "ops": threads * ops,
+            "seconds": round(seconds, 3), "ops_per_second": round(threads * ops / seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ops", type=int, default=20_000, help="operations per thread")
+    args = parser.parse_args()
+    results = [run(threads, args.ops, shared)
+               for shared in (False, True) for threads in args.threads]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
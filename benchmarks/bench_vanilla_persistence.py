@@ -0,0 +1,83 @@
+"""
+Restart-to-ready benchmark of the durable vanilla store division.
+
+Fills a store, takes a snapshot, writes a log tail on top of it and measures how
+long a new division takes to be ready from those files.
+
+Usage
+-----
+python -m benchmarks.bench_vanilla_persistence --records 1000000 --tail 10000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+SCHEMA = Schema(schema_keyname="company", schema_name="Company",
+                schema_description="Company schema for benchmarks",
+                current_schema_definition={
+                    "type": "object",
+                    "properties": {"name": {"type": "string"},
+                                   "country": {"type": "string", "x-index": True},
+                                   "revenue": {"type": "number"}}
+                })
+
+
+def make_records(start: int, count: int) -> list:
+    """Build ``count`` synthetic company records."""
+    return [{"name": f"company-{i}", "country": f"c{i % 50}", "revenue": i * 1.5}
+            for i in range(start, start + count)]
+
+
+def run(records: int, tail: int, batch: int = 10_000) -> dict:
+    """Run the benchmark and return its measures."""
+    with tempfile.TemporaryDirectory() as directory:
+        stores = StoresVanillaCacheDivision(VanillaPersistence(directory, "stores",
+                                                               snapshot_every=0))
+        stores.create_store_of_schema(SCHEMA)
+        started = time.perf_counter()
+        for start in range(0, records, batch):
+            count = min(batch, records - start)
+            stores.insert_many_into_store("company", make_records(start, count))
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stores.checkpoint()
+        snapshot_seconds = time.perf_counter() - started
+
+        for i in range(tail):
+            stores.insert_data_into_store("company", make_records(records + i, 1)[0])
+        stores._persistence.close()  # pylint: disable=protected-access
+
+        started = time.perf_counter()
+        restored = StoresVanillaCacheDivision(VanillaPersistence(directory, "stores"))
+        restart_seconds = time.perf_counter() - started
+
+        restored_records = len(restored.get_data_from_store("company", {"country": "c1"}))
+        return {
+            "records": records, "wal_tail": tail,
+            "load_seconds": round(load_seconds, 3),
+            "snapshot_seconds": round(snapshot_seconds, 3),
+            "snapshot_bytes": os.path.getsize(os.path.join(directory, "stores.snapshot")),
+            "wal_bytes": os.path.getsize(os.path.join(directory, "stores.wal")),
+            "restart_to_ready_seconds": round(restart_seconds, 3),
+            "indexed_matches_after_restart": restored_records,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--tail", type=int, default=10_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.records, args.tail), indent=2))
+
+
+if __name__ == "__main__":
+    main()
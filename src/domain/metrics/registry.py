@@ -0,0 +1,176 @@
+"""
+Module for the in-process metrics registry.
+
+Counters and latency histograms are kept in memory and rendered on demand in the
+Prometheus text exposition format, so they can be scraped without any client library.
+Metric objects are resolved once and kept by their callers, leaving a lock and a
+bisect as the only cost of each observation.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Monotonic counter of events."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Add ``amount`` to the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds in seconds.
+
+    Attributes
+    ----------
+    buckets : tuple of float
+        Sorted upper bounds of the buckets, the implicit ``+Inf`` one excluded.
+    counts : list of int
+        Observations per bucket, not cumulative, the last one being ``+Inf``.
+    sum : float
+        Sum of every observed value.
+    count : int
+        Number of observed values.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a value in the first bucket whose bound is not below it."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the seconds spent in the ``with`` block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class _Family:
+    """Metrics sharing a name, one per set of label values."""
+
+    __slots__ = ("kind", "help_text", "metrics")
+
+    def __init__(self, kind: str, help_text: str):
+        self.kind = kind
+        self.help_text = help_text
+        self.metrics: Dict[Labels, object] = {}
+
+
+class MetricsRegistry:
+    """Registry of named counters and histograms.
+
+    Asking twice for the same name and labels returns the same metric object.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._lock = Lock()
+
+    def counter(self, name: str, help_text: str, **labels: str) -> Counter:
+        """Get or create the counter of ``name`` with the given labels."""
+        return self._get(name, "counter", help_text, labels, Counter)
+
+    def histogram(self, name: str, help_text: str,
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels: str) -> Histogram:
+        """Get or create the histogram of ``name`` with the given labels."""
+        return self._get(name, "histogram", help_text, labels, lambda: Histogram(buckets))
+
+    def _get(self, name, kind, help_text, labels, factory):
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = _Family(kind, help_text)
+            elif family.kind != kind:
+                raise ValueError(f"Metric '{name}' is already registered as a {family.kind}")
+            metric = family.metrics.get(key)
+            if metric is None:
+                metric = family.metrics[key] = factory()
+            return metric
+
+    def clear(self) -> None:
+        """Reset every metric to zero, keeping the objects held by callers."""
+        with self._lock:
+            for family in self._families.values():
+                for metric in family.metrics.values():
+                    with metric._lock:  # pylint: disable=protected-access
+                        if isinstance(metric, Counter):
+                            metric.value = 0
+                        else:
+                            metric.counts = [0] * len(metric.counts)
+                            metric.sum = 0.0
+                            metric.count = 0
+
+    def render_prometheus(self) -> str:
+        """Snapshot of every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            families = [(name, family, list(family.metrics.items()))
+                        for name, family in sorted(self._families.items())]
+        for name, family, metrics in families:
+            lines.append(f"# HELP {name} {family.help_text}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for labels, metric in sorted(metrics, key=lambda item: item[0]):
+                if isinstance(metric, Counter):
+                    lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+                else:
+                    lines.extend(_render_histogram(name, labels, metric))
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _render_histogram(name: str, labels: Labels, histogram: Histogram) -> List[str]:
+    with histogram._lock:  # pylint: disable=protected-access
+        counts = list(histogram.counts)
+        total, count = histogram.sum, histogram.count
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets + (float("inf"),), counts):
+        cumulative += bucket_count
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {total!r}")
+    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return lines
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+               for _, value in labels)
+    return "{" + ",".join(f'{label}="{value}"'
+                          for (label, _), value in zip(labels, escaped)) + "}"
+
+
+METRICS = MetricsRegistry()
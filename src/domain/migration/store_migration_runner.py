@@ -0,0 +1,152 @@
+"""
+Module for the background migration of the stores.
+
+Migrating a big store takes minutes, too long to be done while answering the
+request that changed the definition of its schema. The definition changes schedule
+the migration of the store instead, and a single worker thread runs the scheduled
+migrations one after the other with `MigrateStoreOfSchema`, throttled by a duty
+cycle so the live traffic keeps most of the time.
+
+A migration interrupted by a restart is resumed from its saved progress the next
+time the store is scheduled or the migration use case is called.
+"""
+import os
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from typing import Optional, Set
+
+from bisslog import bisslog_db as db
+
+from src.domain.use_cases.schema.migrate_store_of_schema import (
+    DEFAULT_BATCH_SIZE, MIGRATE_STORE_OF_SCHEMA, migration_job_name, new_migration_progress)
+
+
+class StoreMigrationRunner:
+    """Worker thread running the scheduled store migrations in the background.
+
+    Attributes
+    ----------
+    batch_size : int
+        The number of records migrated between two saves of the progress.
+    duty_cycle : float
+        Fraction of the time spent migrating, between 0 and 1.
+    fill_defaults : bool
+        Whether the properties missing from the records are set to their ``default``.
+    enabled : bool
+        Whether definition changes schedule a migration.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, duty_cycle: float = 0.5,
+                 fill_defaults: bool = False, enabled: bool = True):
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+        if not 0.0 < duty_cycle <= 1.0:
+            raise ValueError("duty_cycle must be greater than 0 and at most 1")
+        self.batch_size = batch_size
+        self.duty_cycle = duty_cycle
+        self.fill_defaults = fill_defaults
+        self.enabled = enabled
+        self._queue: "Queue[Optional[str]]" = Queue()
+        self._scheduled: Set[str] = set()
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "StoreMigrationRunner":
+        """
+        Build a runner from the environment variables.
+
+        ``STORE_MIGRATION`` set to ``0`` disables the background migrations, whose
+        settings are read from ``STORE_MIGRATION_BATCH_SIZE``,
+        ``STORE_MIGRATION_DUTY_CYCLE`` and ``STORE_MIGRATION_FILL_DEFAULTS``.
+        """
+        return cls(batch_size=int(os.environ.get("STORE_MIGRATION_BATCH_SIZE",
+                                                 DEFAULT_BATCH_SIZE)),
+                   duty_cycle=float(os.environ.get("STORE_MIGRATION_DUTY_CYCLE", "0.5")),
+                   fill_defaults=os.environ.get("STORE_MIGRATION_FILL_DEFAULTS", "")
+                   in ("1", "true", "yes"),
+                   enabled=os.environ.get("STORE_MIGRATION", "1") not in ("0", "false", "no"))
+
+    def schedule(self, schema_keyname: str) -> bool:
+        """
+        Schedule the migration of the store of a schema to its current definition.
+
+        The progress is reset to ``pending`` right away. A store already waiting for
+        its turn is not queued twice, the migration reading the definition current
+        when it starts.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema whose definition changed.
+
+        Returns
+        -------
+        bool
+            True if the migration was queued, False if the runner is disabled, the
+            schema no longer exists or its store was already waiting.
+        """
+        if not self.enabled:
+            return False
+        schema = db.schema.get_schema(schema_keyname)
+        if schema is None:
+            return False
+        db.job_checkpoint.save_checkpoint(migration_job_name(schema.schema_keyname),
+                                          new_migration_progress(schema))
+        with self._lock:
+            if schema.schema_keyname in self._scheduled:
+                return False
+            self._scheduled.add(schema.schema_keyname)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = Thread(target=self._work, name="store-migration", daemon=True)
+                self._thread.start()
+        self._queue.put(schema.schema_keyname)
+        return True
+
+    def join(self) -> None:
+        """Wait until every scheduled migration is over."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Stop the worker after its current batch, the progress being saved.
+
+        The migrations still waiting are dropped, their stores staying ``pending``.
+        """
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        with self._lock:
+            self._scheduled.clear()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except Empty:
+                    break
+                self._queue.task_done()
+
+    def _work(self) -> None:
+        while True:
+            schema_keyname = self._queue.get()
+            try:
+                if schema_keyname is None or self._stop.is_set():
+                    return
+                with self._lock:
+                    self._scheduled.discard(schema_keyname)
+                try:
+                    MIGRATE_STORE_OF_SCHEMA(schema_keyname, batch_size=self.batch_size,
+                                            duty_cycle=self.duty_cycle,
+                                            fill_defaults=self.fill_defaults,
+                                            stop=self._stop)
+                except Exception:  # pylint: disable=broad-except
+                    # the failure is saved in the progress of the migration
+                    pass
+            finally:
+                self._queue.task_done()
+
+
+STORE_MIGRATIONS = StoreMigrationRunner.from_env()
@@ -1,11 +1,15 @@
 from dataclasses import dataclass
-from typing import Any, Optional, Hashable
+from typing import Any, Optional, Hashable, List
 
 from jsonschema.validators import validator_for
 
 from src.domain.model.schema_base import SchemaBase
 
 
+INDEX_KEYWORD = "x-index"
+SORTED_INDEX = "sorted"
+
+
 @dataclass
 class Schema(SchemaBase):
     """Schema model for the database."""
@@ -18,6 +22,35 @@ class Schema(SchemaBase):
         self.validate_version(self.current_version)
         self.validate_schema_definition(self.current_schema_definition)
 
+    def get_indexed_fields(self) -> List[str]:
+        """Get the top-level properties of the current definition marked to be indexed.
+
+        A property is indexed when its subschema declares the ``x-index`` keyword
+        with a truthy value, e.g. ``{"type": "string", "x-index": true}``.
+
+        Returns
+        -------
+        list of str
+            The names of the indexed properties.
+        """
+        properties = self.current_schema_definition.get("properties") or {}
+        return [name for name, subschema in properties.items()
+                if isinstance(subschema, dict) and subschema.get(INDEX_KEYWORD)]
+
+    def get_sorted_indexed_fields(self) -> List[str]:
+        """Get the indexed properties whose index must also answer range queries.
+
+        They declare ``"x-index": "sorted"``, e.g. ``{"type": "number", "x-index": "sorted"}``.
+
+        Returns
+        -------
+        list of str
+            The names of the properties with a sorted index.
+        """
+        properties = self.current_schema_definition.get("properties") or {}
+        return [name for name, subschema in properties.items()
+                if isinstance(subschema, dict) and subschema.get(INDEX_KEYWORD) == SORTED_INDEX]
+
     @staticmethod
     def validate_schema_definition(val: Any):
         """Validate the schema definition."""
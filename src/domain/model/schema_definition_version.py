@@ -1,5 +1,5 @@
 from collections.abc import Hashable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -20,5 +20,5 @@ class SchemaDefinitionVersion:
     """
     schema_keyname: str
     schema_definition: dict
-    created_at: datetime = datetime.now()
+    created_at: datetime = field(default_factory=datetime.now)
     schema_version_id: Optional[Hashable] = None
@@ -0,0 +1,190 @@
+"""
+Module for the opt-in profiling of use case executions.
+
+A single invocation can be profiled with cProfile, tracemalloc or both, chosen by a
+sampling rate, by schema keyname or by the caller through the ``profile`` keyword.
+The profiles are written to a directory, named after the use case and the schema
+keyname, so a slow schema can be looked at without redeploying. When nothing asks
+for a profile, a use case call only pays for a keyword lookup and an attribute check.
+"""
+import cProfile
+import itertools
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+PROFILE_FLAG = "profile"
+MODES = ("cprofile", "tracemalloc")
+TRACEMALLOC_FRAMES = 25
+
+
+class UseCaseProfiler:
+    """Decides which use case calls are profiled and writes their profiles.
+
+    Attributes
+    ----------
+    sample_rate : float
+        Fraction of the calls profiled without being asked to, between 0 and 1.
+    modes : tuple of str
+        Profilers run on a profiled call, among ``cprofile`` and ``tracemalloc``.
+    schemas : frozenset of str, optional
+        If given, sampled calls are only profiled for these schema keynames.
+        Calls asking for a profile are always profiled.
+    directory : str
+        Directory the profiles are written to, created on first use.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, modes: Iterable[str] = ("cprofile",),
+                 schemas: Optional[Iterable[str]] = None, directory: Optional[str] = None):
+        self.configure(sample_rate, modes, schemas, directory)
+        self._sequence = itertools.count()
+        self._tracemalloc_lock = Lock()
+
+    def configure(self, sample_rate: float = 0.0, modes: Iterable[str] = ("cprofile",),
+                  schemas: Optional[Iterable[str]] = None,
+                  directory: Optional[str] = None) -> None:
+        """
+        Replace the profiling settings.
+
+        Parameters
+        ----------
+        sample_rate : float
+            Fraction of the calls profiled without being asked to, between 0 and 1.
+        modes : iterable of str
+            Profilers to run, among ``cprofile`` and ``tracemalloc``.
+        schemas : iterable of str, optional
+            Schema keynames sampled calls are restricted to.
+        directory : str, optional
+            Output directory, ``use_case_profiles`` in the temporary directory by default.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        modes = tuple(modes)
+        unknown = set(modes) - set(MODES)
+        if not modes or unknown:
+            raise ValueError(f"modes must be a non-empty subset of {MODES}")
+        self.sample_rate = sample_rate
+        self.modes = modes
+        self.schemas = frozenset(schemas) if schemas else None
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "use_case_profiles")
+
+    @classmethod
+    def from_env(cls) -> "UseCaseProfiler":
+        """
+        Build a profiler from the environment variables.
+
+        ``USE_CASE_PROFILING`` set to ``1`` profiles every call, otherwise
+        ``USE_CASE_PROFILING_SAMPLE_RATE`` gives the sampled fraction. The profilers,
+        schema keynames and output directory are read from ``USE_CASE_PROFILING_MODES``
+        and ``USE_CASE_PROFILING_SCHEMAS``, both comma separated, and
+        ``USE_CASE_PROFILING_DIR``.
+        """
+        if os.environ.get("USE_CASE_PROFILING", "") in ("1", "true", "yes"):
+            sample_rate = 1.0
+        else:
+            sample_rate = float(os.environ.get("USE_CASE_PROFILING_SAMPLE_RATE", "0"))
+        modes = _split(os.environ.get("USE_CASE_PROFILING_MODES", "cprofile"))
+        schemas = _split(os.environ.get("USE_CASE_PROFILING_SCHEMAS", ""))
+        return cls(sample_rate, modes, schemas, os.environ.get("USE_CASE_PROFILING_DIR"))
+
+    def is_sampled(self, args: tuple, kwargs: dict) -> bool:
+        """Whether a call that did not ask for a profile is sampled."""
+        if self.schemas is not None and _schema_keyname(args, kwargs) not in self.schemas:
+            return False
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def run(self, use_case_name: str, call: Callable[..., Any], args: tuple,
+            kwargs: dict) -> Any:
+        """
+        Execute a call under the configured profilers and write their output.
+
+        The profiles are written even if the call raises.
+
+        Parameters
+        ----------
+        use_case_name : str
+            Name the profiles are tagged with.
+        call : callable
+            The use case entrypoint.
+        args : tuple
+            Positional arguments of the call.
+        kwargs : dict
+            Keyword arguments of the call.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        profiler = cProfile.Profile() if "cprofile" in self.modes else None
+        traced = "tracemalloc" in self.modes and self._tracemalloc_lock.acquire(blocking=False)
+        started_tracing = False
+        if traced and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            started_tracing = True
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            base = self._base_path(use_case_name, _schema_keyname(args, kwargs))
+            if profiler is not None:
+                profiler.dump_stats(base + ".prof")
+            if traced:
+                try:
+                    tracemalloc.take_snapshot().dump(base + ".tracemalloc")
+                finally:
+                    if started_tracing:
+                        tracemalloc.stop()
+                    self._tracemalloc_lock.release()
+
+    def _base_path(self, use_case_name: str, schema_keyname: Optional[str]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        tags = [time.strftime("%Y%m%dT%H%M%S"), use_case_name, schema_keyname or "-",
+                str(os.getpid()), str(next(self._sequence))]
+        return os.path.join(self.directory, "-".join(_safe(tag) for tag in tags))
+
+
+class ProfiledUseCase:
+    """Mixin for `BasicUseCase` classes, placed before it, adding the profiling hook.
+
+    Passing ``profile=True`` to a call profiles it, whatever the sampling settings.
+    """
+
+    def __call__(self, *args, **kwargs):
+        if kwargs.pop(PROFILE_FLAG, False) or (PROFILER.sample_rate
+                                                and PROFILER.is_sampled(args, kwargs)):
+            return PROFILER.run(type(self).__name__, super().__call__, args, kwargs)
+        return super().__call__(*args, **kwargs)
+
+
+def _schema_keyname(args: tuple, kwargs: dict) -> Optional[str]:
+    """Schema keyname of a use case call, given by keyword, first argument or payload."""
+    keyname = kwargs.get("schema_keyname")
+    if keyname is None and args:
+        first = args[0]
+        if isinstance(first, str):
+            keyname = first
+        elif isinstance(first, dict):
+            keyname = first.get("schema_keyname")
+    return keyname if isinstance(keyname, str) else None
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _safe(tag: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.]", "_", tag)
+
+
+PROFILER = UseCaseProfiler.from_env()
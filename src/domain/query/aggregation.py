@@ -0,0 +1,163 @@
+"""
+Module for the aggregations of the company data.
+
+An aggregation counts the records matching a filter, optionally per group of
+values of some fields, and computes named metrics for every group:
+
+``{"group_by": ["country"], "metrics": {"revenue": {"sum": "revenue"}}}``
+
+The metrics are ``sum`` of the numbers, ``min`` and ``max`` of the numbers and
+strings, numbers ordering before strings, and the ``distinct`` values of a field.
+Null and missing values are left out of every metric but ``distinct``, which also
+leaves out missing values.
+"""
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from src.domain.query.filters import kind_of
+
+AGGREGATIONS = ("sum", "min", "max", "distinct")
+COUNT = "count"
+
+Metrics = Dict[str, Tuple[str, str]]
+
+
+def normalize_aggregation(group_by: Union[List[str], str, None],
+                          metrics: Optional[dict]) -> Tuple[List[str], Metrics]:
+    """
+    Validate the groups and metrics of an aggregation.
+
+    Parameters
+    ----------
+    group_by : list of str or str, optional
+        Fields whose values define the groups. A comma separated string is also accepted.
+    metrics : dict, optional
+        Name of each metric mapped to a single ``{aggregation: field}`` pair.
+
+    Returns
+    -------
+    tuple of (list of str, dict)
+        The grouped fields and every metric as its ``(aggregation, field)`` pair.
+
+    Raises
+    ------
+    ValueError
+        If a field or metric is malformed, an aggregation is unknown or a name is
+        used twice in the result.
+    """
+    if group_by is None:
+        group_by = []
+    elif isinstance(group_by, str):
+        group_by = [field.strip() for field in group_by.split(",") if field.strip()]
+    if not isinstance(group_by, (list, tuple)) or not all(_is_field(f) for f in group_by):
+        raise ValueError("group_by must be a list of field names")
+    res: Metrics = {}
+    for name, spec in (metrics or {}).items():
+        if not isinstance(spec, dict) or len(spec) != 1:
+            raise ValueError(f"Metric '{name}' must be a single {{aggregation: field}} pair")
+        (aggregation, field), = spec.items()
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{aggregation}', expected one of "
+                             f"{AGGREGATIONS}")
+        if not _is_field(field):
+            raise ValueError(f"Metric '{name}' must aggregate a field name")
+        res[name] = (aggregation, field)
+    names = list(group_by) + [COUNT] + list(res)
+    if not all(_is_field(name) and "." not in name for name in res):
+        raise ValueError("Metric names must not start with '$' nor contain '.'")
+    if len(set(names)) != len(names):
+        raise ValueError("group_by fields and metric names must be distinct from each "
+                         "other and from 'count'")
+    return list(group_by), res
+
+
+def _is_field(field: Any) -> bool:
+    return isinstance(field, str) and bool(field) and not field.startswith("$")
+
+
+class Aggregator:
+    """Single-pass accumulator of an aggregation, fed one record at a time."""
+
+    def __init__(self, group_by: List[str], metrics: Metrics):
+        self.group_by = group_by
+        self.metrics = list(metrics.items())
+        self._groups: Dict[Tuple[Hashable, ...], list] = {}
+
+    def add(self, item: dict) -> None:
+        """Account for a record of the filtered store."""
+        values = tuple(item.get(field) for field in self.group_by)
+        key = tuple(_freeze(value) for value in values)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [values, 0] + [_initial(aggregation)
+                                                       for _, (aggregation, _) in self.metrics]
+        group[1] += 1
+        for i, (_, (aggregation, field)) in enumerate(self.metrics, 2):
+            if aggregation == "distinct":
+                if field in item:
+                    group[i].setdefault(_freeze(item[field]), item[field])
+                continue
+            value = item.get(field)
+            if aggregation == "sum":
+                if kind_of(value) is float:
+                    group[i] += value
+            elif _is_ordered(value) and (group[i] is None or (
+                    _order(value) < _order(group[i]) if aggregation == "min"
+                    else _order(value) > _order(group[i]))):
+                group[i] = value
+
+    def result(self) -> List[dict]:
+        """
+        Get the aggregated groups.
+
+        Returns
+        -------
+        list of dict
+            For every group, its values of the grouped fields, its ``count`` and its
+            metrics. Without grouped fields there is always exactly one group.
+        """
+        groups = list(self._groups.values())
+        if not groups and not self.group_by:
+            groups = [[(), 0] + [_initial(aggregation) for _, (aggregation, _) in self.metrics]]
+        res = []
+        for group in groups:
+            row = dict(zip(self.group_by, group[0]))
+            row[COUNT] = group[1]
+            for i, (name, (aggregation, _)) in enumerate(self.metrics, 2):
+                row[name] = (sort_distinct(group[i].values()) if aggregation == "distinct"
+                             else group[i])
+            res.append(row)
+        return res
+
+
+def sort_distinct(values) -> list:
+    """Order distinct values: numbers, then strings, then the others as found."""
+    values = list(values)
+    ordered = sorted((value for value in values if _is_ordered(value)), key=_order)
+    return ordered + [value for value in values if not _is_ordered(value)]
+
+
+def _initial(aggregation: str) -> Any:
+    if aggregation == "sum":
+        return 0
+    if aggregation == "distinct":
+        return {}
+    return None
+
+
+def _is_ordered(value: Any) -> bool:
+    return kind_of(value) in (float, str) and value == value  # pylint: disable=R0124
+
+
+def _order(value: Any) -> Tuple[int, Any]:
+    return (0, value) if kind_of(value) is float else (1, value)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable stand-in of a value, for lists and dicts found in records."""
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((k, _freeze(v)) for k, v in value.items())))
+    if isinstance(value, list):
+        return ("list", tuple(_freeze(v) for v in value))
+    if isinstance(value, bool):
+        return ("bool", value)
+    return value
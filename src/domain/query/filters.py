@@ -0,0 +1,169 @@
+"""
+Module for the query operators of the company data filters.
+
+The ``params`` of a company data read map each field either to a value, matched by
+equality, or to an operator expression, a dict whose keys are all operators:
+
+``{"revenue": {"$gte": 1000, "$lt": 5000}, "country": {"$in": ["co", "es"]}}``
+
+The syntax is the Mongo one, so that backend receives it as is, while the in-memory
+one evaluates it with `compile_params`. Range operators only match values of the
+same kind as the bound: numbers (booleans excluded) with numbers, strings with
+strings and any other type with itself.
+"""
+import operator
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+RANGE_OPERATORS = {"$gt": operator.gt, "$gte": operator.ge,
+                   "$lt": operator.lt, "$lte": operator.le}
+OPERATORS = tuple(RANGE_OPERATORS) + ("$in", "$ne")
+
+Predicate = Callable[[Any], bool]
+
+
+def is_operator_expression(value: Any) -> bool:
+    """Check whether a filter value is an operator expression rather than a value."""
+    return isinstance(value, dict) and bool(value) and all(
+        isinstance(key, str) and key.startswith("$") for key in value)
+
+
+def validate_params(params: Optional[dict]) -> None:
+    """
+    Check the fields and operators of a filter.
+
+    Parameters
+    ----------
+    params : dict, optional
+        The filter to be checked.
+
+    Raises
+    ------
+    ValueError
+        If a field starts with ``$``, an operator is unknown, an expression mixes
+        operators and fields, or ``$in`` is not given a list.
+    """
+    if not params:
+        return
+    if not isinstance(params, dict):
+        raise ValueError("params must be a dictionary")
+    for field, value in params.items():
+        if not isinstance(field, str) or field.startswith("$"):
+            raise ValueError(f"'{field}' is not a valid field to filter by")
+        if not isinstance(value, dict) or not any(
+                isinstance(key, str) and key.startswith("$") for key in value):
+            continue
+        if not is_operator_expression(value):
+            raise ValueError(f"The filter of '{field}' mixes operators and fields")
+        for name, argument in value.items():
+            if name not in OPERATORS:
+                raise ValueError(f"Unknown operator '{name}', expected one of {OPERATORS}")
+            if name == "$in" and not isinstance(argument, list):
+                raise ValueError(f"The '$in' operator of '{field}' needs a list")
+
+
+def iter_conditions(value: Any) -> Iterator[Tuple[str, Any]]:
+    """Iterate over the ``(operator, argument)`` pairs of a filter value.
+
+    A value that is not an operator expression is an ``$eq`` condition.
+    """
+    if is_operator_expression(value):
+        yield from value.items()
+    else:
+        yield "$eq", value
+
+
+def compile_params(params: Optional[dict]) -> Callable[[dict], bool]:
+    """
+    Build the function telling whether a record matches a filter.
+
+    Parameters
+    ----------
+    params : dict, optional
+        A filter, already validated with `validate_params`.
+
+    Returns
+    -------
+    callable
+        Function of a record returning True when every condition holds.
+    """
+    if not params:
+        return lambda item: True
+    if not any(is_operator_expression(value) for value in params.values()):
+        equalities = list(params.items())
+        return lambda item: all(item.get(k) == v for k, v in equalities)
+    predicates: List[Tuple[str, Predicate]] = [
+        (field, _predicate(name, argument))
+        for field, value in params.items() for name, argument in iter_conditions(value)]
+    return lambda item: all(predicate(item.get(field)) for field, predicate in predicates)
+
+
+def kind_of(value: Any) -> type:
+    """Kind of a value for the range operators, ints and floats sharing one."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float
+    return type(value)
+
+
+def _predicate(name: str, argument: Any) -> Predicate:
+    if name == "$eq":
+        return lambda value: value == argument
+    if name == "$ne":
+        return lambda value: value != argument
+    if name == "$in":
+        return lambda value: value in argument
+    compare = RANGE_OPERATORS[name]
+    kind = kind_of(argument)
+
+    def in_range(value: Any) -> bool:
+        if kind_of(value) is not kind:
+            return False
+        try:
+            return compare(value, argument)
+        except TypeError:
+            return False
+    return in_range
+
+
+# the kinds of the bounds merged by range_bounds
+_ORDERED_KINDS = (float, str)
+
+
+def range_bounds(conditions: Dict[str, Any]) -> Optional[Tuple[Any, bool, Any, bool]]:
+    """
+    Merge the range operators of an expression into one interval.
+
+    Parameters
+    ----------
+    conditions : dict
+        An operator expression.
+
+    Returns
+    -------
+    tuple, optional
+        The lower bound, whether it is included, the upper bound and whether it is
+        included, a missing bound being None. None if the expression has no range
+        operator, or its bounds are of different kinds or of a kind other than
+        numbers and strings, which are not ordered by the indexes.
+    """
+    low, low_inclusive, high, high_inclusive = None, True, None, True
+    kinds = set()
+    for name, argument in conditions.items():
+        if name not in RANGE_OPERATORS:
+            continue
+        kinds.add(kind_of(argument))
+        if not kinds.issubset(_ORDERED_KINDS):
+            # the bounds of other kinds may not even be comparable with each other
+            return None
+        if name in ("$gt", "$gte"):
+            inclusive = name == "$gte"
+            if len(kinds) == 1 and (low is None or argument > low
+                                    or (argument == low and not inclusive)):
+                low, low_inclusive = argument, inclusive
+        else:
+            inclusive = name == "$lte"
+            if len(kinds) == 1 and (high is None or argument < high
+                                    or (argument == high and not inclusive)):
+                high, high_inclusive = argument, inclusive
+    if len(kinds) != 1:
+        return None
+    return low, low_inclusive, high, high_inclusive
@@ -0,0 +1,267 @@
+"""
+Module for the result cache of the company data reads.
+
+A few filtered reads of rarely written stores make most of the traffic, and each
+one scans the store again. The `ResultCache` keeps their results keyed by the
+schema keyname and the normalized reading options, along with the generation of
+the store they were read at. Every insert, update and delete of a store changes
+its generation, so a result is only served while its store has not been written,
+and the first read after a write drops every result of that store, and only of it.
+
+Only the stores of the schemas opted in are cached. The cache is bounded by the
+number of records it holds, the least recently used results being evicted first.
+Results are copied when cached and again when served, so the records are shared
+neither with the stores nor between the callers.
+"""
+import copy
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from src.domain.metrics.registry import METRICS, MetricsRegistry
+
+LOOKUPS_METRIC = "company_data_cache_lookups_total"
+EVICTIONS_METRIC = "company_data_cache_evictions_total"
+INVALIDATIONS_METRIC = "company_data_cache_invalidations_total"
+
+Key = Tuple[str, str]
+
+
+class ResultCache:
+    """Bounded LRU cache of the results of company data reads, per opted in schema.
+
+    Attributes
+    ----------
+    max_records : int
+        Maximum number of records held by the whole cache, the bound of its memory.
+    max_result_records : int
+        Maximum number of records of a result for it to be cached.
+    hits : int
+        Number of reads answered from the cache.
+    misses : int
+        Number of reads of opted in schemas that were not.
+    evictions : int
+        Number of results dropped because the cache was full.
+    invalidations : int
+        Number of results dropped because their store was written.
+    """
+
+    def __init__(self, max_records: int = 100_000, max_result_records: Optional[int] = None,
+                 schemas: Optional[List[str]] = None, registry: MetricsRegistry = METRICS):
+        if max_records < 1:
+            raise ValueError("max_records must be greater than 0")
+        self.max_records = max_records
+        self.max_result_records = (max(max_records // 4, 1) if max_result_records is None
+                                   else max_result_records)
+        self._schemas: Set[str] = set(schemas or ())
+        self._results: "OrderedDict[Key, Tuple[str, dict, int]]" = OrderedDict()
+        self._generations: Dict[str, str] = {}
+        self._records = 0
+        self._lock = Lock()
+        self._registry = registry
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """
+        Build a cache from the environment variables.
+
+        ``COMPANY_DATA_CACHE_SCHEMAS`` is the comma separated list of the keynames of
+        the schemas opted in, none by default, and ``COMPANY_DATA_CACHE_MAX_RECORDS``
+        the maximum number of records held.
+        """
+        schemas = os.environ.get("COMPANY_DATA_CACHE_SCHEMAS", "")
+        return cls(max_records=int(os.environ.get("COMPANY_DATA_CACHE_MAX_RECORDS", 100_000)),
+                   schemas=[name.strip() for name in schemas.split(",") if name.strip()])
+
+    def enable(self, schema_keyname: str) -> None:
+        """Opt the store of a schema in the cache."""
+        with self._lock:
+            self._schemas.add(schema_keyname)
+
+    def disable(self, schema_keyname: str) -> None:
+        """Opt the store of a schema out of the cache, dropping its results."""
+        with self._lock:
+            self._schemas.discard(schema_keyname)
+            self._drop_schema(schema_keyname)
+
+    def is_enabled(self, schema_keyname: str) -> bool:
+        """Check whether the store of a schema is opted in the cache."""
+        return schema_keyname in self._schemas
+
+    @staticmethod
+    def key(schema_keyname: str, params: Optional[dict], **options: Hashable) -> Key:
+        """
+        Key of a read, the same for the reads bound to return the same result.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is read.
+        params : dict, optional
+            The filters of the read, whose order does not matter.
+        **options
+            The other reading options, such as the projected fields or the page.
+
+        Returns
+        -------
+        tuple of (str, str)
+            The schema keyname and the normalized params and options.
+        """
+        normalized = json.dumps([params or {}, options], sort_keys=True, default=repr,
+                                separators=(",", ":"))
+        return schema_keyname, normalized
+
+    def get(self, key: Key, generation: str) -> Optional[dict]:
+        """
+        Get the result of a read made at the current generation of its store.
+
+        Parameters
+        ----------
+        key : tuple of (str, str)
+            The key of the read, from `key`.
+        generation : str
+            The current generation of the store.
+
+        Returns
+        -------
+        dict, optional
+            A copy of the cached result, None if there is none for this generation.
+        """
+        schema_keyname = key[0]
+        with self._lock:
+            if self._generations.get(schema_keyname, generation) != generation:
+                # the store was written since its results were read
+                self._drop_schema(schema_keyname)
+            cached = self._results.get(key)
+            if cached is not None and cached[0] == generation:
+                self._results.move_to_end(key)
+                self.hits += 1
+                hit = True
+            else:
+                cached = None
+                self.misses += 1
+                hit = False
+        self._lookups(schema_keyname, "hit" if hit else "miss").inc()
+        return _copy_result(cached[1]) if cached is not None else None
+
+    def put(self, key: Key, generation: str, result: dict, records: int) -> bool:
+        """
+        Cache the result of a read made at a generation of its store.
+
+        Parameters
+        ----------
+        key : tuple of (str, str)
+            The key of the read, from `key`.
+        generation : str
+            The generation of the store read before reading the result.
+        result : dict
+            The result of the read, copied along with the records of its ``data``.
+        records : int
+            The number of records of the result.
+
+        Returns
+        -------
+        bool
+            True if the result was cached, False if it is too big or the store was
+            written in the meantime.
+        """
+        schema_keyname = key[0]
+        evicted: List[str] = []
+        if schema_keyname not in self._schemas or records > self.max_result_records:
+            return False
+        result = _copy_result(result)
+        with self._lock:
+            current = self._generations.get(schema_keyname)
+            if current is not None and current != generation:
+                # a read made at another generation, older or newer, is not mixed in
+                return False
+            self._generations[schema_keyname] = generation
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._records -= previous[2]
+            self._results[key] = (generation, result, records)
+            self._records += records
+            while self._records > self.max_records:
+                (old_keyname, _), (_, _, old_records) = self._results.popitem(last=False)
+                self._records -= old_records
+                self._forget_generation(old_keyname)
+                evicted.append(old_keyname)
+            self.evictions += len(evicted)
+        for old_keyname in evicted:
+            self._registry.counter(EVICTIONS_METRIC, "Company data results evicted.",
+                                   schema=old_keyname).inc()
+        return True
+
+    def _drop_schema(self, schema_keyname: str) -> None:
+        """Drop every result of a store, holding the lock."""
+        keys = [key for key in self._results if key[0] == schema_keyname]
+        for key in keys:
+            self._records -= self._results.pop(key)[2]
+        self._generations.pop(schema_keyname, None)
+        if keys:
+            self.invalidations += len(keys)
+            self._registry.counter(INVALIDATIONS_METRIC,
+                                   "Company data results dropped after a write.",
+                                   schema=schema_keyname).inc(len(keys))
+
+    def _forget_generation(self, schema_keyname: str) -> None:
+        if not any(key[0] == schema_keyname for key in self._results):
+            self._generations.pop(schema_keyname, None)
+
+    def _lookups(self, schema_keyname: str, result: str):
+        return self._registry.counter(LOOKUPS_METRIC, "Company data reads looked up in the "
+                                      "result cache.", schema=schema_keyname, result=result)
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters, keeping the opted in schemas."""
+        with self._lock:
+            self._results.clear()
+            self._generations.clear()
+            self._records = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return the cache counters.
+
+        Returns
+        -------
+        dict
+            Current results and records held, maximum records, hits, misses, hit
+            rate, evictions and invalidations of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self._results), "records": self._records,
+                    "max_records": self.max_records, "hits": self.hits,
+                    "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "invalidations": self.invalidations}
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy of a result whose records can be modified without changing the original."""
+    if "data" not in result:
+        return dict(result)
+    return dict(result, data=[_copy_record(record) for record in result["data"]])
+
+
+def _copy_record(record: dict) -> dict:
+    # most records only hold scalars, for which a shallow copy is enough
+    if all(isinstance(value, _SCALARS) for value in record.values()):
+        return dict(record)
+    return copy.deepcopy(record)
+
+
+RESULT_CACHE = ResultCache.from_env()
@@ -0,0 +1,49 @@
+from typing import Optional, Union, List
+
+from bisslog import BasicUseCase, bisslog_db as db
+
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.query.aggregation import normalize_aggregation
+from src.domain.query.filters import validate_params
+
+
+class AggregateCompanyData(ProfiledUseCase, BasicUseCase):
+    """Class to count and aggregate company data without reading it out of the store."""
+
+    def use(self, schema_keyname: str, params: Optional[dict] = None,
+            group_by: Optional[Union[List[str], str]] = None,
+            metrics: Optional[dict] = None, *args, **kwargs) -> dict:
+        """
+        Count and aggregate the data of the store of the schema.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be aggregated.
+        params : dict, optional
+            Parameters to filter the data, with the syntax of `GetCompanyData`.
+        group_by : list of str or str, optional
+            Fields whose values define the groups. A comma separated string is also
+            accepted. If None, every matching record is in a single group.
+        metrics : dict, optional
+            Name of each metric mapped to one of ``sum``, ``min``, ``max`` or
+            ``distinct`` and the field it aggregates, e.g.
+            ``{"total_revenue": {"sum": "revenue"}}``.
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict
+            The groups, each one with its values of the grouped fields, its ``count``
+            of records and its metrics.
+        """
+        validate_params(params)
+        group_by, metrics = normalize_aggregation(group_by, metrics)
+        return {"groups": db.stores.aggregate_data_in_store(schema_keyname, params,
+                                                            group_by, metrics)}
+
+
+AGGREGATE_COMPANY_DATA = AggregateCompanyData()
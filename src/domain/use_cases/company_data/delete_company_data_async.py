@@ -0,0 +1,27 @@
+from collections.abc import Hashable
+
+from bisslog import bisslog_db as db, use_case
+from bisslog.exceptions.domain_exception import NotFound
+
+
+@use_case
+async def delete_data_company_async(schema_keyname: str, uid_data: Hashable):
+    """Execute the use case to delete company data, over the async divisions.
+
+    Parameters
+    ----------
+    schema_keyname : str
+        The keyname of the schema to delete.
+    uid_data : Hashable
+        The unique identifier of the data to delete.
+
+    Returns
+    -------
+    dict
+        The unique identifier of the deleted data.
+    """
+    deleted = await db.stores_async.delete_data_from_store(schema_keyname, uid_data)
+    if deleted is None:
+        raise NotFound("data-not-found",
+                       f"Data with (uid) {uid_data} not found in schema {schema_keyname}.")
+    return {"deleted": deleted}
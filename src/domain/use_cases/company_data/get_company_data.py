@@ -1,20 +1,60 @@
-from typing import Optional, Dict, Union
+import base64
+import binascii
+import json
+from collections.abc import Hashable
+from itertools import islice
+from typing import Optional, Dict, Union, List
 
 from bisslog import BasicUseCase, bisslog_db as db
 
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.query.filters import validate_params
+from src.domain.query.result_cache import RESULT_CACHE
 
-class GetCompanyData(BasicUseCase):
 
-    def use(self, schema_keyname: str, params: Optional[dict] = None, *args, **kwargs):
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+RESERVED_PARAMS = ("limit", "cursor", "fields", "if_generation")
+
+
+class GetCompanyData(ProfiledUseCase, BasicUseCase):
+
+    def use(self, schema_keyname: str, params: Optional[dict] = None,
+            limit: Optional[int] = None, cursor: Optional[str] = None,
+            fields: Optional[Union[List[str], str]] = None, *args,
+            if_generation: Optional[str] = None, **kwargs):
         """
         Get all data from the store of the schema in the database.
 
+        When ``limit`` or ``cursor`` is given the data is returned one page at a
+        time, together with an opaque ``next_cursor`` to request the following page.
+
+        The data comes with the ``generation`` of the store, which changes with every
+        write to it. Given back as ``if_generation``, while the store has not changed,
+        only ``not_modified`` is answered, without reading the store.
+
+        The results of the schemas opted in `RESULT_CACHE` are cached until their
+        store is written.
+
         Parameters
         ----------
         schema_keyname: str
             The name of the schema whose store is to be accessed.
         params : dict, optional
             Parameters to filter the data to be retrieved. If None, all data will be retrieved.
+            A field is matched by equality, or by an expression of the operators
+            ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$in`` and ``$ne``, e.g.
+            ``{"revenue": {"$gte": 1000}, "country": {"$in": ["co", "es"]}}``.
+        limit : int, optional
+            Maximum number of records of the page, up to 1000.
+        cursor : str, optional
+            The ``next_cursor`` returned with the previous page.
+        fields : list of str or str, optional
+            Fields to be returned for each record, besides ``uid``. A comma separated
+            string is also accepted. If None, whole records are returned.
+        if_generation : str, optional
+            The ``generation`` returned with data read before, also accepted as an
+            HTTP entity tag.
         args : tuple
             Positional arguments.
         kwargs : dict
@@ -23,7 +63,116 @@ class GetCompanyData(BasicUseCase):
         Returns
         -------
         dict
-            A list of dictionaries, each containing information about a record in the store.
+            A list of dictionaries, each containing information about a record in the store,
+            and the cursor of the next page if the data is paginated (None on the last page).
+            Only ``not_modified`` and the ``generation`` if the store has not changed
+            since ``if_generation``.
         """
+        params, reserved = _split_reserved_params(params)
+        validate_params(params)
+        limit = limit if limit is not None else reserved.get("limit")
+        cursor = cursor if cursor is not None else reserved.get("cursor")
+        fields = _parse_fields(fields if fields is not None else reserved.get("fields"))
+        if if_generation is None:
+            if_generation = reserved.get("if_generation")
+
+        # read before the data, so a write made meanwhile is seen as a change next time
+        generation = db.stores.get_store_generation(schema_keyname)
+        if generation is not None and _parse_generation(if_generation) == generation:
+            return {"not_modified": True, "generation": generation}
+
+        paginated = limit is not None or cursor is not None
+        if paginated:
+            limit = _validate_limit(limit)
+        key = None
+        if generation is not None and RESULT_CACHE.is_enabled(schema_keyname):
+            key = RESULT_CACHE.key(schema_keyname, params, limit=limit, cursor=cursor,
+                                   fields=sorted(fields) if fields is not None else None)
+            cached = RESULT_CACHE.get(key, generation)
+            if cached is not None:
+                return cached
+
+        if not paginated:
+            res = {"data": db.stores.get_data_from_store(schema_keyname, params, fields),
+                   "generation": generation}
+        else:
+            res = self._read_page(schema_keyname, params, limit, cursor, fields)
+            res["generation"] = generation
+        if key is not None:
+            RESULT_CACHE.put(key, generation, res, len(res["data"]))
+        return res
+
+    @staticmethod
+    def _read_page(schema_keyname: str, params: Optional[dict], limit: int,
+                   cursor: Optional[str], fields: Optional[List[str]]) -> dict:
+        """Read the page of records following the cursor."""
+        after = _decode_cursor(cursor) if cursor is not None else None
+
+        records = db.stores.iter_data_from_store(schema_keyname, params, after, fields)
+        page = list(islice(records, limit + 1))
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = _encode_cursor(page[-1][0])
+
+        return {"data": [record for _, record in page], "next_cursor": next_cursor}
+
+
+def _split_reserved_params(params: Optional[dict]) -> tuple:
+    """Take the reading options out of the query params mapped into ``params``."""
+    if not params or not any(name in params for name in RESERVED_PARAMS):
+        return params, {}
+    params = dict(params)
+    reserved = {name: params.pop(name) for name in RESERVED_PARAMS if name in params}
+    return params, reserved
+
+
+def _parse_fields(fields: Union[List[str], str, None]) -> Optional[List[str]]:
+    """Normalize the projected fields, splitting a comma separated string."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, (list, tuple)) or not all(isinstance(f, str) for f in fields):
+        raise ValueError("fields must be a list of field names")
+    return [field.strip() for field in fields if field.strip()]
+
+
+def _parse_generation(generation: Optional[str]) -> Optional[str]:
+    """Generation given by the client, taken out of its entity tag form if needed."""
+    if generation is None:
+        return None
+    if not isinstance(generation, str):
+        raise ValueError("if_generation must be a generation returned with the data")
+    generation = generation.strip()
+    if generation.startswith("W/"):
+        generation = generation[2:]
+    return generation.strip('"')
+
+
+def _validate_limit(limit: Union[int, str, None]) -> int:
+    """Validate the page size, falling back to the default one."""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError) as err:
+        raise ValueError("limit must be an integer") from err
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def _encode_cursor(position: Hashable) -> str:
+    """Encode a store position as an opaque cursor."""
+    raw = json.dumps({"p": position}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
 
-        return {"data": db.stores.get_data_from_store(schema_keyname, params)}
+def _decode_cursor(cursor: str) -> Hashable:
+    """Decode an opaque cursor into the store position it was built from."""
+    try:
+        payload: Dict = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return payload["p"]
+    except (AttributeError, binascii.Error, ValueError, KeyError, TypeError) as err:
+        raise ValueError("cursor is not valid") from err
@@ -0,0 +1,70 @@
+from typing import Optional, Union, List
+
+from bisslog import AsyncBasicUseCase, bisslog_db as db
+
+from src.domain.query.filters import validate_params
+from src.domain.use_cases.company_data.get_company_data import (
+    _decode_cursor, _encode_cursor, _parse_fields, _split_reserved_params, _validate_limit)
+
+
+class GetCompanyDataAsync(AsyncBasicUseCase):
+    """Asyncio variant of `GetCompanyData`, over the async divisions."""
+
+    async def use(self, schema_keyname: str, params: Optional[dict] = None,
+                  limit: Optional[int] = None, cursor: Optional[str] = None,
+                  fields: Optional[Union[List[str], str]] = None, *args, **kwargs):
+        """
+        Get data from the store of the schema in the database.
+
+        Takes the same arguments and returns the same result as `GetCompanyData`.
+
+        Parameters
+        ----------
+        schema_keyname: str
+            The name of the schema whose store is to be accessed.
+        params : dict, optional
+            Parameters to filter the data to be retrieved. If None, all data will be retrieved.
+        limit : int, optional
+            Maximum number of records of the page, up to 1000.
+        cursor : str, optional
+            The ``next_cursor`` returned with the previous page.
+        fields : list of str or str, optional
+            Fields to be returned for each record, besides ``uid``.
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict
+            The records, and the cursor of the next page if the data is paginated.
+        """
+        params, reserved = _split_reserved_params(params)
+        validate_params(params)
+        limit = limit if limit is not None else reserved.get("limit")
+        cursor = cursor if cursor is not None else reserved.get("cursor")
+        fields = _parse_fields(fields if fields is not None else reserved.get("fields"))
+
+        if limit is None and cursor is None:
+            return {"data": await db.stores_async.get_data_from_store(schema_keyname, params,
+                                                                      fields)}
+
+        limit = _validate_limit(limit)
+        after = _decode_cursor(cursor) if cursor is not None else None
+
+        page = []
+        async for record in db.stores_async.iter_data_from_store(schema_keyname, params,
+                                                                 after, fields):
+            page.append(record)
+            if len(page) > limit:
+                break
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = _encode_cursor(page[-1][0])
+
+        return {"data": [record for _, record in page], "next_cursor": next_cursor}
+
+
+GET_COMPANY_DATA_ASYNC = GetCompanyDataAsync()
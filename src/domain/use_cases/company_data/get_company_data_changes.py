@@ -0,0 +1,69 @@
+from typing import Optional, Tuple
+
+from bisslog import BasicUseCase, bisslog_db as db
+
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.use_cases.company_data.get_company_data import _validate_limit
+
+
+class GetCompanyDataChanges(ProfiledUseCase, BasicUseCase):
+    """Class to follow the changes of a company store from a sequence token."""
+
+    def use(self, schema_keyname: str, since: Optional[str] = None,
+            limit: Optional[int] = None, *args, **kwargs) -> dict:
+        """
+        Get the inserts, updates and deletes of the store of the schema since a token.
+
+        Every change is numbered by the store, and comes with the record as it is after
+        it (None for deletions), so applying them in order to a copy of the store keeps
+        it up to date. A consumer starts without ``since``, which returns the token of
+        the current position, reads the whole store with `GetCompanyData`, and then asks
+        for the changes since that token, and since the ``next_token`` of every answer.
+
+        Only the most recent changes are kept by the stores. When some of the changes
+        since the token are no longer kept, or the token was given by a store since
+        created again, ``reset`` is True: the consumer reads the whole store again and
+        goes on from the ``next_token`` given.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is followed.
+        since : str, optional
+            The ``next_token`` of the previous answer. If None, no change is returned,
+            only the token of the current position.
+        limit : int, optional
+            Maximum number of changes returned, up to 1000.
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict
+            The ``changes`` in order, each with its ``seq``, ``op``, ``uid`` and
+            ``data``, the ``next_token``, whether the consumer must ``reset`` and
+            whether the store ``has_more`` changes after these.
+        """
+        limit = _validate_limit(limit)
+        epoch, after = _parse_token(since) if since is not None else (None, None)
+
+        res = db.stores.get_changes_from_store(schema_keyname, after, limit)
+        if epoch is not None and epoch != res["epoch"]:
+            # the sequence numbers are the ones of another store with the same keyname
+            return {"changes": [], "next_token": f"{res['epoch']}-{res['last_seq']}",
+                    "reset": True, "has_more": False}
+        return {"changes": res["changes"], "next_token": f"{res['epoch']}-{res['position']}",
+                "reset": res["expired"], "has_more": res["position"] < res["last_seq"]}
+
+
+def _parse_token(token: str) -> Tuple[str, int]:
+    """Epoch of the store and sequence number of the last change seen by the consumer."""
+    epoch, _, seq = token.rpartition("-") if isinstance(token, str) else ("", "", "")
+    if not epoch or not (seq.isascii() and seq.isdigit()):
+        raise ValueError("since must be a token returned as next_token")
+    return epoch, int(seq)
+
+
+GET_COMPANY_DATA_CHANGES = GetCompanyDataChanges()
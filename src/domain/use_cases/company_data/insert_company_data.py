@@ -1,9 +1,17 @@
 from bisslog import BasicUseCase, bisslog_db as db
 from bisslog.exceptions.domain_exception import NotFound
-from jsonschema.validators import Draft7Validator
 
+from src.domain.metrics.registry import METRICS
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.messages import validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
 
-class InsertCompanyData(BasicUseCase):
+VALIDATION_DURATION = METRICS.histogram("use_case_stage_duration_seconds",
+                                        "Seconds spent in a stage of a use case.",
+                                        use_case="insert_company_data", stage="validation")
+
+
+class InsertCompanyData(ProfiledUseCase, BasicUseCase):
     """Class to insert company data into the database."""
 
     def use(self, schema_keyname: str, data: dict, *args, **kwargs) -> dict:
@@ -30,13 +38,11 @@ class InsertCompanyData(BasicUseCase):
         schema = db.schema.get_schema(schema_keyname)
         if not schema:
             raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
-        validator = Draft7Validator(schema.current_schema_definition)
-
-        errors = list(validator.iter_errors(data))
-
-        if errors:
-            error_messages = [f"Error in '{error.instance}': {error.message}" for error in errors]
+        with VALIDATION_DURATION.time():
+            validator = VALIDATOR_CACHE.get_validator(schema)
+            error_messages = validation_error_messages(validator, data)
 
+        if error_messages:
             return {"errors": error_messages}
 
 
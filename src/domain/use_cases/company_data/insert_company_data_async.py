@@ -0,0 +1,51 @@
+from bisslog import AsyncBasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.metrics.registry import METRICS
+from src.domain.validation.messages import validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+
+VALIDATION_DURATION = METRICS.histogram("use_case_stage_duration_seconds",
+                                        "Seconds spent in a stage of a use case.",
+                                        use_case="insert_company_data_async", stage="validation")
+
+
+class InsertCompanyDataAsync(AsyncBasicUseCase):
+    """Asyncio variant of `InsertCompanyData`, over the async divisions."""
+
+    async def use(self, schema_keyname: str, data: dict, *args, **kwargs) -> dict:
+        """
+        Insert company data into the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema to insert data into.
+        data : dict
+            The data to be inserted into the schema.
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict:
+            A dictionary containing the result of the insertion.
+        """
+        schema = await db.schema_async.get_schema(schema_keyname)
+        if not schema:
+            raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
+        with VALIDATION_DURATION.time():
+            validator = VALIDATOR_CACHE.get_validator(schema)
+            error_messages = validation_error_messages(validator, data)
+
+        if error_messages:
+            return {"errors": error_messages}
+
+        uid_data = await db.stores_async.insert_data_into_store(schema_keyname, data)
+
+        return {"inserted": uid_data}
+
+
+INSERT_COMPANY_DATA_ASYNC = InsertCompanyDataAsync()
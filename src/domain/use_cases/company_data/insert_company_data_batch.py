@@ -0,0 +1,72 @@
+from typing import List
+
+from bisslog import BasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.metrics.registry import METRICS
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.messages import validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+
+VALIDATION_DURATION = METRICS.histogram("use_case_stage_duration_seconds",
+                                        "Seconds spent in a stage of a use case.",
+                                        use_case="insert_company_data_batch", stage="validation")
+
+
+class InsertCompanyDataBatch(ProfiledUseCase, BasicUseCase):
+    """Class to insert several company data records into the database at once."""
+
+    def use(self, schema_keyname: str, data: List[dict], *args, **kwargs) -> dict:
+        """
+        Insert a batch of company data into the database.
+
+        The schema and its validator are resolved once for the whole batch and every
+        valid record is written with a single store operation.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema to insert data into.
+        data : list of dict
+            The records to be inserted into the schema.
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict:
+            The per-record results by index, each one with the inserted uid or
+            the validation errors, plus the number of inserted and failed records.
+        """
+        if not isinstance(data, list):
+            raise ValueError("data must be a list of records")
+
+        schema = db.schema.get_schema(schema_keyname)
+        if not schema:
+            raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
+        results = []
+        valid_indexes = []
+        valid_records = []
+        with VALIDATION_DURATION.time():
+            validator = VALIDATOR_CACHE.get_validator(schema)
+            for index, record in enumerate(data):
+                error_messages = validation_error_messages(validator, record)
+                if error_messages:
+                    results.append({"index": index, "errors": error_messages})
+                else:
+                    results.append({"index": index})
+                    valid_indexes.append(index)
+                    valid_records.append(record)
+
+        if valid_records:
+            uids = db.stores.insert_many_into_store(schema_keyname, valid_records)
+            for index, uid_data in zip(valid_indexes, uids):
+                results[index]["inserted"] = uid_data
+
+        return {"results": results, "inserted": len(valid_records),
+                "failed": len(data) - len(valid_records)}
+
+
+INSERT_COMPANY_DATA_BATCH = InsertCompanyDataBatch()
@@ -1,14 +1,28 @@
 from typing import Hashable
 
 from bisslog import BasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
 
+from src.domain.metrics.registry import METRICS
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.messages import patch_validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
 
-class UpdateCompanyData(BasicUseCase):
+VALIDATION_DURATION = METRICS.histogram("use_case_stage_duration_seconds",
+                                        "Seconds spent in a stage of a use case.",
+                                        use_case="update_company_data", stage="validation")
+
+
+class UpdateCompanyData(ProfiledUseCase, BasicUseCase):
 
     def use(self, schema_keyname:str, data: dict, uid_data: Hashable):
         """
         Update company data in the database.
 
+        The stored record is merged with ``data`` and validated against the current
+        schema definition, only the properties present in ``data`` being checked
+        along with the constraints on the whole record.
+
         Parameters
         ----------
         schema_keyname : str
@@ -21,7 +35,20 @@ class UpdateCompanyData(BasicUseCase):
         Returns
         -------
         dict
-            A dictionary containing the result of the update operation.
+            A dictionary containing the result of the update operation, or the
+            validation errors of the updated record.
         """
+        schema = db.schema.get_schema(schema_keyname)
+        if not schema:
+            raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
+        record = db.stores.get_one_data_from_store(schema_keyname, uid_data)
+        if record is None:
+            return {"updated": None}
+        with VALIDATION_DURATION.time():
+            validator = VALIDATOR_CACHE.get_patch_validator(schema)
+            error_messages = patch_validation_error_messages(validator, record, data)
+        if error_messages:
+            return {"errors": error_messages}
+
         uid_data = db.stores.update_data_in_store(schema_keyname, data, uid_data)
         return {"updated": uid_data}
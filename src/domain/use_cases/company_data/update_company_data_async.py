@@ -0,0 +1,53 @@
+from typing import Hashable
+
+from bisslog import AsyncBasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.metrics.registry import METRICS
+from src.domain.validation.messages import patch_validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+
+VALIDATION_DURATION = METRICS.histogram("use_case_stage_duration_seconds",
+                                        "Seconds spent in a stage of a use case.",
+                                        use_case="update_company_data_async", stage="validation")
+
+
+class UpdateCompanyDataAsync(AsyncBasicUseCase):
+    """Asyncio variant of `UpdateCompanyData`, over the async divisions."""
+
+    async def use(self, schema_keyname: str, data: dict, uid_data: Hashable):
+        """
+        Update company data in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema to update data in.
+        data : dict
+            The data to be updated in the schema.
+        uid_data: Hashable
+            The unique identifier of the data to be updated.
+
+        Returns
+        -------
+        dict
+            A dictionary containing the result of the update operation, or the
+            validation errors of the updated record.
+        """
+        schema = await db.schema_async.get_schema(schema_keyname)
+        if not schema:
+            raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
+        record = await db.stores_async.get_one_data_from_store(schema_keyname, uid_data)
+        if record is None:
+            return {"updated": None}
+        with VALIDATION_DURATION.time():
+            validator = VALIDATOR_CACHE.get_patch_validator(schema)
+            error_messages = patch_validation_error_messages(validator, record, data)
+        if error_messages:
+            return {"errors": error_messages}
+
+        uid_data = await db.stores_async.update_data_in_store(schema_keyname, data, uid_data)
+        return {"updated": uid_data}
+
+
+UPDATE_COMPANY_DATA_ASYNC = UpdateCompanyDataAsync()
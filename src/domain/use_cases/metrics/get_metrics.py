@@ -0,0 +1,28 @@
+from bisslog import BasicUseCase
+
+from src.domain.metrics.registry import METRICS, PROMETHEUS_CONTENT_TYPE
+
+
+class GetMetrics(BasicUseCase):
+    """Class to expose the in-process metrics to a scraper."""
+
+    def use(self, *args, **kwargs) -> dict:
+        """
+        Snapshot the registered metrics.
+
+        Parameters
+        ----------
+        args : tuple
+            Positional arguments.
+        kwargs : dict
+            Keyword arguments.
+
+        Returns
+        -------
+        dict:
+            The content type and the body of the Prometheus text exposition.
+        """
+        return {"content_type": PROMETHEUS_CONTENT_TYPE, "body": METRICS.render_prometheus()}
+
+
+GET_METRICS = GetMetrics()
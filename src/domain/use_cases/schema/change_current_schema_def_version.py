@@ -3,10 +3,13 @@ from collections.abc import Hashable
 from bisslog import BasicUseCase, bisslog_db as db
 from bisslog.exceptions.domain_exception import NotFound
 
+from src.domain.migration.store_migration_runner import STORE_MIGRATIONS
 from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
 
 
-class ChangeCurrentSchemaDefVersion(BasicUseCase):
+class ChangeCurrentSchemaDefVersion(ProfiledUseCase, BasicUseCase):
 
     def use(self, schema_keyname: str, uid_schema_version: Hashable, *args, **kwargs):
         """
@@ -29,8 +32,10 @@ class ChangeCurrentSchemaDefVersion(BasicUseCase):
         uid_schema = db.schema.update_schema_definition(
             schema_keyname=schema_keyname, new_version=uid_schema_version,
             definition=schema_version.schema_definition)
+        VALIDATOR_CACHE.invalidate(schema_keyname)
         if not uid_schema:
             raise NotFound("schema-not-found", f"Schema {schema_keyname} not found.")
+        STORE_MIGRATIONS.schedule(schema_keyname)
 
 
         return {"updated_schema": uid_schema, "schema_version": uid_schema_version}
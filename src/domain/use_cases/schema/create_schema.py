@@ -10,9 +10,10 @@ from bisslog.exceptions.external_interactions_errors import ExternalInteractionE
 
 from src.domain.model.schema import Schema
 from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
 
 
-class CreateSchema(BasicUseCase):
+class CreateSchema(ProfiledUseCase, BasicUseCase):
     """Use case for creating a schema in the database."""
 
 
@@ -26,7 +27,7 @@ class CreateSchema(BasicUseCase):
             schema_keyname=schema.schema_keyname, schema_definition=schema.current_schema_definition
         )
 
-        uid_schema_def_version = db.schema_def_version.create_schema_version(schema_def_version)
+        uid_schema_def_version = db.schema_version.create_schema_version(schema_def_version)
 
         self.log.info("Schema version was successfully created",
                       checkpoint_id="schema-version-created")
@@ -42,7 +43,7 @@ class CreateSchema(BasicUseCase):
             self.log.error("Schema was not successfully created: " + str(err),
                            checkpoint_id="schema-catcher")
             db.schema.delete_schema(schema.schema_keyname)
-            db.schema_def_version.delete_schema_version(uid_schema_def_version)
+            db.schema_version.delete_schema_version(uid_schema_def_version)
 
             self.log.info("Schema version was successfully deleted as a rollback",
                           checkpoint_id="schema-version-deleted-rollback")
@@ -56,7 +57,7 @@ class CreateSchema(BasicUseCase):
             self.log.error("Schema was not successfully created",
                            checkpoint_id="store-of-schema-created-catcher")
             db.schema.delete_schema(schema.schema_keyname)
-            db.schema_def_version.delete_schema_version(uid_schema_def_version)
+            db.schema_version.delete_schema_version(uid_schema_def_version)
 
             self.log.info("Schema was successfully deleted as a rollback",
                           checkpoint_id="schema-deleted-rollback")
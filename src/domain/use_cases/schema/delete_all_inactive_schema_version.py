@@ -1,29 +1,119 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional
+
 from bisslog import use_case, bisslog_db as db
 
+from src.domain.model.schema import Schema
+
+JOB_NAME = "delete_all_inactive_schema_versions"
+DEFAULT_BATCH_SIZE = 100
+VERSIONS_PAGE_SIZE = 100
+
+
 @use_case
-def delete_all_inactive_schema_versions(*_, **kwargs) -> dict:
+def delete_all_inactive_schema_versions(*_, days: int = 60,
+                                        batch_size: int = DEFAULT_BATCH_SIZE,
+                                        time_budget: Optional[float] = None,
+                                        workers: int = 1, **kwargs) -> dict:
     """Use case for deleting all inactive schema versions.
 
+    Schemas are processed in keyname order, ``batch_size`` at a time. The keyname of
+    the last processed schema is saved after every batch, so a run that fails or
+    runs out of time is resumed from there by the next one. The saved progress is
+    forgotten once every schema is processed.
+
     Parameters
     ----------
+    days : int
+        The number of days after which a schema version is considered inactive.
+    batch_size : int
+        The number of schemas processed between two saves of the progress.
+    time_budget : float, optional
+        Seconds after which no new batch is started. At least one batch is always
+        processed. If None, the run goes on until every schema is processed.
+    workers : int
+        The number of schemas of a batch processed in parallel. Values above 1 need
+        thread-safe divisions.
     **kwargs
         Keyword arguments for the use case.
 
     Returns
     -------
     dict
-        A dictionary containing the result of the use case.
+        The deleted versions and reclaimed bytes per schema keyname, their totals,
+        whether every schema was processed and, if not, the keyname to resume after.
     """
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+    if workers < 1:
+        raise ValueError("workers must be greater than 0")
 
-    schemas = db.schema.get_schemas()
-    days = kwargs.get('days', 60)
+    started = time.monotonic()
+    progress = db.job_checkpoint.get_checkpoint(JOB_NAME) or {}
+    after = progress.get("after")
+    prune = partial(_prune_schema, days=days)
     res = {}
-    for schema in schemas:
-        res_by_schema = db.schema_version.delete_inactive_schema_versions(
-            schema_keyname=schema.schema_keyname,
-            current_version=schema.current_version,
-            days=days
-        )
-        res[schema.schema_keyname] = res_by_schema
-
-    return {"result": res}
+    completed = False
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while True:
+            schemas = db.schema.get_schemas_page(after, batch_size)
+            reports = executor.map(prune, schemas) if executor is not None else map(prune, schemas)
+            for schema, report in zip(schemas, reports):
+                res[schema.schema_keyname] = report
+            if len(schemas) < batch_size:
+                completed = True
+                break
+            after = schemas[-1].schema_keyname
+            db.job_checkpoint.save_checkpoint(JOB_NAME, {"after": after})
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if completed:
+        db.job_checkpoint.delete_checkpoint(JOB_NAME)
+
+    return {"result": res,
+            "deleted": sum(len(report["deleted"]) for report in res.values()),
+            "bytes_reclaimed": sum(report["bytes_reclaimed"] for report in res.values()),
+            "completed": completed,
+            "resume_after": None if completed else after}
+
+
+def _prune_schema(schema: Schema, days: int) -> dict:
+    """Delete the inactive versions of a schema and measure the reclaimed bytes.
+
+    The reclaimed bytes are the size of the JSON-encoded definitions of the deleted
+    versions, measured from the versions older than the cutoff before deleting.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    sizes = {}
+    offset = 0
+    while True:
+        versions = db.schema_version.get_schema_versions(schema.schema_keyname,
+                                                         limit=VERSIONS_PAGE_SIZE,
+                                                         offset=offset)
+        old_versions = [version for version in versions if version.created_at < cutoff]
+        for version in old_versions:
+            sizes[version.schema_version_id] = _definition_size(version.schema_definition)
+        if len(versions) < VERSIONS_PAGE_SIZE or len(old_versions) < len(versions):
+            break
+        offset += VERSIONS_PAGE_SIZE
+
+    deleted = db.schema_version.delete_inactive_schema_versions(
+        schema_keyname=schema.schema_keyname,
+        current_version=schema.current_version,
+        days=days
+    )
+    return {"deleted": deleted, "bytes_reclaimed": sum(sizes.get(uid, 0) for uid in deleted)}
+
+
+def _definition_size(definition: dict) -> int:
+    """Size in bytes of a schema definition encoded as JSON."""
+    return len(json.dumps(definition, separators=(",", ":"), default=str).encode())
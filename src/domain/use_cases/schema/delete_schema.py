@@ -7,9 +7,12 @@ It handles the deletion process and logs the operation's success or failure.
 from bisslog import BasicUseCase, bisslog_db as db
 from bisslog.exceptions.domain_exception import NotFound
 
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
 
 
-class DeleteSchema(BasicUseCase):
+
+class DeleteSchema(ProfiledUseCase, BasicUseCase):
     """Use case for deleting a schema from the database."""
 
     def use(self, schema_keyname: str, *args, **kwargs):
@@ -30,6 +33,7 @@ class DeleteSchema(BasicUseCase):
             True if the schema was deleted successfully, False otherwise.
         """
         uid_schema = db.schema.delete_schema(schema_keyname)
+        VALIDATOR_CACHE.invalidate(schema_keyname)
         if uid_schema:
             self.log.info(f"Schema with keyname '{schema_keyname}' was successfully deleted.",
                           checkpoint_id="schema-deleted")
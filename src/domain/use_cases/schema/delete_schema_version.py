@@ -3,8 +3,10 @@ from typing import Hashable
 from bisslog import BasicUseCase, bisslog_db as db
 from bisslog.exceptions.domain_exception import NotFound
 
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
 
-class DeleteSchemaVersion(BasicUseCase):
+
+class DeleteSchemaVersion(ProfiledUseCase, BasicUseCase):
     """
     Use case for updating the definition of a schema.
     """
@@ -27,7 +29,7 @@ class DeleteSchemaVersion(BasicUseCase):
         bool
             True if the schema was updated successfully, False otherwise.
         """
-        uid_res = db.schema.delete_schema_version(uid_schema_def_version)
+        uid_res = db.schema_version.delete_schema_version(uid_schema_def_version)
         if uid_res is None:
             raise NotFound("schema-version-not-found", "Schema definition version not found")
         return {"deleted": uid_res}
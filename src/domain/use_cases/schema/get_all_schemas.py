@@ -1,7 +1,9 @@
 from bisslog import BasicUseCase, bisslog_db as db
 
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
 
-class GetAllSchemas(BasicUseCase):
+
+class GetAllSchemas(ProfiledUseCase, BasicUseCase):
 
 
     def use(self, *args, **kwargs):
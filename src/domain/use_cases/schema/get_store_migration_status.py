@@ -0,0 +1,40 @@
+from bisslog import BasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.use_cases.schema.migrate_store_of_schema import migration_job_name
+
+
+class GetStoreMigrationStatus(ProfiledUseCase, BasicUseCase):
+    """
+    Use case for following the migration of a store to the current definition of its schema.
+    """
+
+    def use(self, schema_keyname: str, *args, **kwargs) -> dict:
+        """
+        Get the progress of the last migration of a store.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema whose store is migrated.
+        *args
+            Positional arguments for the use case.
+        **kwargs
+            Keyword arguments for the use case.
+
+        Returns
+        -------
+        dict
+            The definition version migrated to, the state of the migration among
+            ``pending``, ``running``, ``completed`` and ``failed``, the scanned,
+            migrated and invalid records and a sample of the invalid ones.
+        """
+        progress = db.job_checkpoint.get_checkpoint(migration_job_name(schema_keyname))
+        if progress is None:
+            raise NotFound("store-migration-not-found",
+                           f"No migration of the store of schema '{schema_keyname}'.")
+        return progress
+
+
+GET_STORE_MIGRATION_STATUS = GetStoreMigrationStatus()
@@ -0,0 +1,218 @@
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from threading import Event
+from typing import Callable, Dict, List, Optional
+
+from bisslog import BasicUseCase, bisslog_db as db
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.messages import validation_error_messages
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+
+JOB_PREFIX = "migrate_store_of_schema:"
+DEFAULT_BATCH_SIZE = 500
+INVALID_SAMPLE_SIZE = 20
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+Transform = Callable[[dict], Optional[dict]]
+STORE_TRANSFORMS: Dict[str, Transform] = {}
+
+
+def register_store_transform(schema_keyname: str, transform: Optional[Transform]) -> None:
+    """Register the transform applied to the records of a store when it is migrated.
+
+    Parameters
+    ----------
+    schema_keyname : str
+        The keyname of the schema whose records are transformed.
+    transform : callable, optional
+        Function of a record, without its ``uid``, returning the fields to be set on
+        it, or None to leave it as it is. None unregisters the current transform.
+    """
+    if transform is None:
+        STORE_TRANSFORMS.pop(schema_keyname, None)
+    else:
+        STORE_TRANSFORMS[schema_keyname] = transform
+
+
+def migration_job_name(schema_keyname: str) -> str:
+    """Name of the job checkpoint holding the migration progress of a store."""
+    return JOB_PREFIX + schema_keyname
+
+
+def new_migration_progress(schema: Schema, state: str = PENDING) -> dict:
+    """Progress of a migration of a store to the current definition of its schema."""
+    return {"schema_keyname": schema.schema_keyname, "version": str(schema.current_version),
+            "state": state, "after": None, "scanned": 0, "migrated": 0, "invalid": 0,
+            "invalid_sample": [], "error": None, "started_at": _now(), "updated_at": _now(),
+            "finished_at": None}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _fill_defaults(definition: dict) -> Optional[Transform]:
+    defaults = {name: subschema["default"]
+                for name, subschema in (definition.get("properties") or {}).items()
+                if isinstance(subschema, dict) and "default" in subschema}
+    if not defaults:
+        return None
+    return lambda record: {name: value for name, value in defaults.items()
+                           if name not in record} or None
+
+
+def _compose(transforms: List[Transform]) -> Optional[Transform]:
+    if not transforms:
+        return None
+
+    def transform(record: dict) -> Optional[dict]:
+        patch = {}
+        for each in transforms:
+            patch.update(each({**record, **patch}) or {})
+        return patch or None
+    return transform
+
+
+class MigrateStoreOfSchema(ProfiledUseCase, BasicUseCase):
+    """
+    Use case for migrating the records of a store to the current definition of its schema.
+    """
+
+    def use(self, schema_keyname: str, *_, batch_size: int = DEFAULT_BATCH_SIZE,
+            time_budget: Optional[float] = None, duty_cycle: float = 1.0,
+            fill_defaults: bool = False, stop: Optional[Event] = None, **kwargs) -> dict:
+        """Re-validate, and optionally transform, the records of a store in batches.
+
+        Records are read ``batch_size`` at a time in the stable order of the store and
+        validated against the current definition. A transform, made of the
+        ``default`` of the properties missing from a record and of the one registered
+        with `register_store_transform`, gives the fields to be set on a record; it is
+        only written if the transformed record is valid. Invalid records are counted,
+        a sample of them kept along with their errors, and left untouched.
+
+        The store is altered for the new definition, its indexes for instance, before
+        the first batch. The progress is saved after every batch, so a run that fails,
+        is stopped or runs out of time is resumed from there by the next one. A change
+        of the current definition restarts the migration from the beginning.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema whose store is migrated.
+        batch_size : int
+            The number of records read, and the most written, between two saves of
+            the progress.
+        time_budget : float, optional
+            Seconds after which no new batch is started. At least one batch is always
+            processed. If None, the run goes on until every record is processed.
+        duty_cycle : float
+            Fraction of the time spent migrating, between 0 and 1. After every batch
+            the run sleeps long enough to leave the rest to the live traffic.
+        fill_defaults : bool
+            Whether the properties missing from a record are set to their ``default``.
+        stop : Event, optional
+            Event stopping the run after the current batch once set.
+        **kwargs
+            Keyword arguments for the use case.
+
+        Returns
+        -------
+        dict
+            The progress of the migration: its state, the scanned, migrated and
+            invalid records, a sample of the invalid ones and the position to
+            resume after.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+        if not 0.0 < duty_cycle <= 1.0:
+            raise ValueError("duty_cycle must be greater than 0 and at most 1")
+
+        job = migration_job_name(schema_keyname)
+        started = time.monotonic()
+        progress = db.job_checkpoint.get_checkpoint(job)
+        try:
+            while True:
+                batch_started = time.monotonic()
+                schema = db.schema.get_schema(schema_keyname)
+                if not schema:
+                    raise NotFound("schema-not-found", f"Schema '{schema_keyname}' not found.")
+                if not progress or progress["version"] != str(schema.current_version):
+                    progress = new_migration_progress(schema)
+                if progress["state"] == COMPLETED:
+                    return progress
+                if progress["after"] is None and progress["scanned"] == 0:
+                    db.stores.alter_store_of_schema(schema)
+                progress["state"] = RUNNING
+                self._migrate_batch(schema, progress, batch_size, fill_defaults)
+                progress["updated_at"] = _now()
+                if progress["state"] == COMPLETED:
+                    progress["finished_at"] = progress["updated_at"]
+                db.job_checkpoint.save_checkpoint(job, progress)
+                if progress["state"] == COMPLETED or (stop is not None and stop.is_set()):
+                    return progress
+                if time_budget is not None and time.monotonic() - started >= time_budget:
+                    return progress
+                pause = (time.monotonic() - batch_started) * (1 - duty_cycle) / duty_cycle
+                if pause > 0:
+                    if stop is not None:
+                        stop.wait(pause)
+                    else:
+                        time.sleep(pause)
+        except Exception as err:
+            if progress is not None:
+                progress.update(state=FAILED, error=str(err), updated_at=_now())
+                db.job_checkpoint.save_checkpoint(job, progress)
+            raise
+
+    @staticmethod
+    def _migrate_batch(schema: Schema, progress: dict, batch_size: int,
+                       fill_defaults: bool) -> None:
+        """Migrate the next batch of records, marking the progress completed at the end."""
+        keyname = schema.schema_keyname
+        validator = VALIDATOR_CACHE.get_validator(schema)
+        transforms = [STORE_TRANSFORMS[keyname]] if keyname in STORE_TRANSFORMS else []
+        defaults = _fill_defaults(schema.current_schema_definition) if fill_defaults else None
+        transform = _compose(([defaults] if defaults else []) + transforms)
+
+        records = list(islice(db.stores.iter_data_from_store(keyname, None,
+                                                             after=progress["after"]),
+                              batch_size))
+        # the saved progress may share the sample list, it is not appended to in place
+        progress["invalid_sample"] = list(progress["invalid_sample"])
+        for position, record in records:
+            progress["after"] = position
+            progress["scanned"] += 1
+            uid = record["uid"]
+            data = {key: value for key, value in record.items() if key != "uid"}
+            patch = transform(data) if transform is not None else None
+            if patch:
+                # the patch is computed again on the latest version of the record, so
+                # a write made since it was read is not overwritten
+                record = db.stores.get_one_data_from_store(keyname, uid)
+                if record is None:
+                    continue
+                data = {key: value for key, value in record.items() if key != "uid"}
+                patch = transform(data)
+                if patch:
+                    data.update(patch)
+            errors = validation_error_messages(validator, data)
+            if errors:
+                progress["invalid"] += 1
+                if len(progress["invalid_sample"]) < INVALID_SAMPLE_SIZE:
+                    progress["invalid_sample"].append({"uid": uid, "errors": errors})
+            elif patch:
+                db.stores.update_data_in_store(keyname, dict(patch), uid)
+                progress["migrated"] += 1
+        if len(records) < batch_size:
+            progress["state"] = COMPLETED
+
+
+MIGRATE_STORE_OF_SCHEMA = MigrateStoreOfSchema()
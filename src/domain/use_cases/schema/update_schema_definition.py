@@ -1,11 +1,14 @@
 from bisslog import BasicUseCase, bisslog_db as db
 from bisslog.exceptions.domain_exception import NotFound
 
+from src.domain.migration.store_migration_runner import STORE_MIGRATIONS
 from src.domain.model.schema import Schema
 from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
 
 
-class UpdateSchemaDefinition(BasicUseCase):
+class UpdateSchemaDefinition(ProfiledUseCase, BasicUseCase):
     """
     Use case for updating the definition of a schema.
     """
@@ -38,12 +41,14 @@ class UpdateSchemaDefinition(BasicUseCase):
             raise NotFound("schema-not-found", f"Schema with keyname '{schema_keyname}' not found.")
 
         schema_def_version = SchemaDefinitionVersion(schema_keyname, schema_definition)
-        uid_schema_version = db.schema.create_schema_version(schema_def_version)
+        uid_schema_version = db.schema_version.create_schema_version(schema_def_version)
 
         uid_schema = db.schema.update_schema_definition(
             schema_keyname, new_version=uid_schema_version, definition=schema_definition)
+        VALIDATOR_CACHE.invalidate(schema_keyname)
 
         if not uid_schema:
             raise NotFound("schema-not-found", f"Schema with keyname '{schema_keyname}' not found.")
+        STORE_MIGRATIONS.schedule(schema_keyname)
 
         return {"updated": uid_schema}
@@ -1,9 +1,10 @@
 from bisslog import BasicUseCase, bisslog_db as db
 
 from src.domain.model.schema_base import SchemaBase
+from src.domain.profiling.use_case_profiler import ProfiledUseCase
 
 
-class UpdateSchemaMetadata(BasicUseCase):
+class UpdateSchemaMetadata(ProfiledUseCase, BasicUseCase):
 
     def use(self, schema_keyname: str, schema_new_info: dict, *args, **kwargs):
         """Updates the metadata of an existing schema in the database.
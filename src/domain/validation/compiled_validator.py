@@ -0,0 +1,308 @@
+"""
+Module for the compiled validation engine.
+
+`Draft7Validator.iter_errors` dispatches on every keyword of the schema for every
+record it validates. The company schemas mostly use a small subset of JSON schema,
+so `compile_validator` turns a definition, once, into the source of a Python
+function specialized for it, where each keyword becomes a couple of plain checks.
+
+The keywords compiled are ``type``, ``required``, ``properties``,
+``additionalProperties``, ``enum`` of scalar values, ``minimum``, ``maximum``,
+``exclusiveMinimum``, ``exclusiveMaximum``, ``minLength``, ``maxLength`` and
+``pattern``, with the draft 7 semantics. A subschema using any other validation
+keyword, ``$ref`` included, is validated by jsonschema instead, so every schema is
+supported. The errors, and their messages, are the ones jsonschema reports.
+"""
+import re
+from numbers import Number
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import Draft7Validator
+
+_EMITTERS = {"type": "_emit_type", "required": "_emit_required",
+             "properties": "_emit_properties",
+             "additionalProperties": "_emit_additional_properties", "enum": "_emit_enum",
+             "minimum": "_emit_bound", "maximum": "_emit_bound",
+             "exclusiveMinimum": "_emit_bound", "exclusiveMaximum": "_emit_bound",
+             "minLength": "_emit_length", "maxLength": "_emit_length",
+             "pattern": "_emit_pattern"}
+COMPILED_KEYWORDS = frozenset(_EMITTERS)
+# keywords that validate nothing without a format checker, as the draft 7 validator has
+_IGNORED_KEYWORDS = frozenset(("format",))
+_FALLBACK_KEYWORDS = frozenset(Draft7Validator.VALIDATORS) - COMPILED_KEYWORDS - _IGNORED_KEYWORDS
+
+_TYPE_CHECKS = {
+    "object": "isinstance({0}, dict)",
+    "array": "isinstance({0}, list)",
+    "string": "isinstance({0}, str)",
+    "boolean": "isinstance({0}, bool)",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, _Number) and not isinstance({0}, bool))",
+    "integer": "((isinstance({0}, int) and not isinstance({0}, bool))"
+               " or (isinstance({0}, float) and {0}.is_integer()))",
+}
+_BOUNDS = {"minimum": ("<", "is less than the minimum of"),
+           "maximum": (">", "is greater than the maximum of"),
+           "exclusiveMinimum": ("<=", "is less than or equal to the minimum of"),
+           "exclusiveMaximum": (">=", "is greater than or equal to the maximum of")}
+
+Schema = Union[dict, bool]
+
+
+class CompiledValidator:
+    """
+    Validator of one schema definition, compiled into a Python function.
+
+    Attributes
+    ----------
+    schema : dict or bool
+        The schema definition.
+    source : str
+        The source of the generated function.
+    fallbacks : int
+        Number of subschemas validated by jsonschema.
+    """
+
+    def __init__(self, schema: Schema, root: Optional[Schema] = None):
+        """
+        Compile a schema definition.
+
+        Parameters
+        ----------
+        schema : dict or bool
+            The schema definition to validate against.
+        root : dict or bool, optional
+            The definition references are resolved against, the schema itself if not
+            given. Used to compile a subschema of a bigger definition.
+        """
+        self.schema = schema
+        compiler = _Compiler(Draft7Validator(schema if root is None else root))
+        self.source = compiler.compile(schema)
+        self.fallbacks = compiler.fallbacks
+        exec(compile(self.source, "<compiled validator>", "exec"),  # pylint: disable=W0122
+             compiler.namespace)
+        self._validate = compiler.namespace["validate"]
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        """Validate an instance and iterate over its errors, in jsonschema order."""
+        errors: List[ValidationError] = []
+        self._validate(instance, errors)
+        return iter(errors)
+
+    def is_valid(self, instance: Any) -> bool:
+        """Check whether an instance is valid."""
+        errors: List[ValidationError] = []
+        self._validate(instance, errors)
+        return not errors
+
+
+def compile_validator(schema: Schema, root: Optional[Schema] = None) -> CompiledValidator:
+    """
+    Compile a schema definition into a validator.
+
+    Parameters
+    ----------
+    schema : dict or bool
+        The schema definition to validate against.
+    root : dict or bool, optional
+        The definition references are resolved against, the schema itself if not given.
+
+    Returns
+    -------
+    CompiledValidator
+        A validator with the `iter_errors` and `is_valid` methods of jsonschema ones.
+    """
+    return CompiledValidator(schema, root)
+
+
+def _error(message: str, instance: Any) -> ValidationError:
+    return ValidationError(message, instance=instance)
+
+
+def _extras_message(extras: list) -> str:
+    extras = sorted(extras, key=str)
+    verb = "was" if len(extras) == 1 else "were"
+    return (f"Additional properties are not allowed "
+            f"({', '.join(repr(extra) for extra in extras)} {verb} unexpected)")
+
+
+def _in_enum(value: Any, values: frozenset, booleans: frozenset) -> bool:
+    # booleans only equal booleans, as in jsonschema, not the 0 and 1 they subclass
+    if isinstance(value, bool):
+        return value in booleans
+    try:
+        return value in values
+    except TypeError:
+        return False
+
+
+class _Compiler:
+    """Generator of the source of a validation function."""
+
+    def __init__(self, root_validator: Draft7Validator):
+        self.root_validator = root_validator
+        self.namespace: Dict[str, Any] = {"_Number": Number, "_error": _error,
+                                          "_extras_message": _extras_message,
+                                          "_in_enum": _in_enum}
+        self.lines: List[str] = []
+        self.fallbacks = 0
+        self._names = 0
+
+    def compile(self, schema: Schema) -> str:
+        self.lines = ["def validate(v0, errors):"]
+        self._emit(schema, "v0", 1)
+        self.lines.append("    return errors")
+        return "\n".join(self.lines) + "\n"
+
+    def _name(self, prefix: str) -> str:
+        self._names += 1
+        return f"{prefix}{self._names}"
+
+    def _constant(self, value: Any) -> str:
+        name = self._name("c")
+        self.namespace[name] = value
+        return name
+
+    def _line(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def _fail(self, indent: int, var: str, message: str) -> None:
+        """Report an error whose message is the instance repr followed by ``message``."""
+        self._line(indent, f"errors.append(_error(repr({var}) + {self._constant(message)}, "
+                           f"{var}))")
+
+    def _emit(self, schema: Schema, var: str, indent: int) -> None:
+        if schema is True:
+            return
+        if schema is False:
+            self._line(indent, f"errors.append(_error('False schema does not allow ' + "
+                               f"repr({var}), {var}))")
+            return
+        if not _is_compilable(schema):
+            self.fallbacks += 1
+            validator = self._constant(self.root_validator.evolve(schema=schema))
+            self._line(indent, f"errors.extend({validator}.iter_errors({var}))")
+            return
+        for keyword, value in schema.items():
+            if keyword in _EMITTERS:
+                getattr(self, _EMITTERS[keyword])(keyword, value, schema, var, indent)
+
+    def _emit_type(self, _, types, __, var: str, indent: int) -> None:
+        types = [types] if isinstance(types, str) else types
+        check = " or ".join(_TYPE_CHECKS[kind].format(var) for kind in types) or "False"
+        self._line(indent, f"if not ({check}):")
+        self._fail(indent + 1, var, f" is not of type {', '.join(repr(kind) for kind in types)}")
+
+    def _emit_required(self, _, required, __, var: str, indent: int) -> None:
+        if not required:
+            return
+        self._line(indent, f"if isinstance({var}, dict):")
+        for name in required:
+            self._line(indent + 1, f"if {self._constant(name)} not in {var}:")
+            self._line(indent + 2, f"errors.append(_error("
+                                   f"{self._constant(f'{name!r} is a required property')}, "
+                                   f"{var}))")
+
+    def _emit_properties(self, _, properties, __, var: str, indent: int) -> None:
+        checked = [(name, subschema) for name, subschema in properties.items()
+                   if subschema is not True]
+        if not checked:
+            return
+        self._line(indent, f"if isinstance({var}, dict):")
+        for name, subschema in checked:
+            value = self._name("v")
+            self._line(indent + 1, f"{value} = {var}.get({self._constant(name)}, _missing)")
+            self._line(indent + 1, f"if {value} is not _missing:")
+            self._emit(subschema, value, indent + 2)
+        self.namespace["_missing"] = _MISSING
+
+    def _emit_additional_properties(self, _, additional, schema, var: str,
+                                    indent: int) -> None:
+        if additional is True:
+            return
+        known = self._constant(frozenset(schema.get("properties", {})))
+        self._line(indent, f"if isinstance({var}, dict):")
+        if additional is False:
+            extras = self._name("x")
+            self._line(indent + 1, f"{extras} = [k for k in {var} if k not in {known}]")
+            self._line(indent + 1, f"if {extras}:")
+            self._line(indent + 2, f"errors.append(_error(_extras_message({extras}), {var}))")
+            return
+        key, value = self._name("k"), self._name("v")
+        self._line(indent + 1, f"for {key}, {value} in {var}.items():")
+        self._line(indent + 2, f"if {key} not in {known}:")
+        self._emit(additional, value, indent + 3)
+
+    def _emit_enum(self, _, values, __, var: str, indent: int) -> None:
+        booleans = frozenset(value for value in values if isinstance(value, bool))
+        others = frozenset(value for value in values if not isinstance(value, bool))
+        self._line(indent, f"if not _in_enum({var}, {self._constant(others)}, "
+                           f"{self._constant(booleans)}):")
+        self._fail(indent + 1, var, f" is not one of {values!r}")
+
+    def _emit_bound(self, keyword: str, bound, _, var: str, indent: int) -> None:
+        operator, message = _BOUNDS[keyword]
+        self._line(indent, f"if {_TYPE_CHECKS['number'].format(var)} and "
+                           f"{var} {operator} {self._constant(bound)}:")
+        self._fail(indent + 1, var, f" {message} {bound!r}")
+
+    def _emit_length(self, keyword: str, length, _, var: str, indent: int) -> None:
+        if keyword == "minLength":
+            operator, message = "<", " should be non-empty" if length == 1 else " is too short"
+        else:
+            operator, message = ">", " is expected to be empty" if length == 0 else " is too long"
+        self._line(indent, f"if isinstance({var}, str) and "
+                           f"len({var}) {operator} {self._constant(length)}:")
+        self._fail(indent + 1, var, message)
+
+    def _emit_pattern(self, _, pattern, __, var: str, indent: int) -> None:
+        search = self._constant(re.compile(pattern).search)
+        self._line(indent, f"if isinstance({var}, str) and not {search}({var}):")
+        self._fail(indent + 1, var, f" does not match {pattern!r}")
+
+
+_MISSING = object()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_length(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _is_compilable(schema: Any) -> bool:
+    """Check whether every validation keyword of a subschema can be compiled.
+
+    Subschemas of ``properties`` and ``additionalProperties`` are compiled, or not,
+    on their own.
+    """
+    if not isinstance(schema, dict) or "$ref" in schema or _FALLBACK_KEYWORDS & schema.keys():
+        return False
+    types = schema.get("type", "object")
+    types = [types] if isinstance(types, str) else types
+    if not isinstance(types, list) or not all(kind in _TYPE_CHECKS for kind in types):
+        return False
+    if not isinstance(schema.get("properties", {}), dict) or not isinstance(
+            schema.get("additionalProperties", True), (bool, dict)):
+        return False
+    required = schema.get("required", [])
+    if not isinstance(required, list) or not all(isinstance(name, str) for name in required):
+        return False
+    enum = schema.get("enum", [])
+    if not isinstance(enum, list) or not all(
+            value is None or isinstance(value, (str, int, float)) for value in enum):
+        return False
+    if not all(_is_number(schema[keyword]) for keyword in _BOUNDS if keyword in schema):
+        return False
+    if not all(_is_length(schema[keyword]) for keyword in ("minLength", "maxLength")
+               if keyword in schema):
+        return False
+    if "pattern" in schema:
+        try:
+            re.compile(schema["pattern"])
+        except (TypeError, re.error):
+            return False
+    return True
@@ -0,0 +1,50 @@
+from typing import List, Union
+
+from jsonschema.protocols import Validator
+
+from src.domain.validation.compiled_validator import CompiledValidator
+from src.domain.validation.patch_validator import PatchValidator
+
+
+def validation_error_messages(validator: Union[CompiledValidator, Validator],
+                              data: dict) -> List[str]:
+    """Validate data and return the error messages reported to the clients.
+
+    Parameters
+    ----------
+    validator : CompiledValidator or Validator
+        The compiled validator of the schema definition.
+    data : dict
+        The data to be validated.
+
+    Returns
+    -------
+    list of str
+        One message per validation error, empty if the data is valid.
+    """
+    return [_message(error) for error in validator.iter_errors(data)]
+
+
+def patch_validation_error_messages(validator: PatchValidator, record: dict,
+                                    patch: dict) -> List[str]:
+    """Validate a patch of a stored record and return the error messages reported to the clients.
+
+    Parameters
+    ----------
+    validator : PatchValidator
+        The compiled patch validator of the schema definition.
+    record : dict
+        The stored record.
+    patch : dict
+        The fields set by the update.
+
+    Returns
+    -------
+    list of str
+        One message per validation error, empty if the patched record is valid.
+    """
+    return [_message(error) for error in validator.iter_errors(record, patch)]
+
+
+def _message(error) -> str:
+    return f"Error in '{error.instance}': {error.message}"
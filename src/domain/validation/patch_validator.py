@@ -0,0 +1,91 @@
+"""
+Module for the validation of partial updates.
+
+An update only carries the fields it changes, so validating the whole merged record
+costs as much as the record is large. A `PatchValidator` splits the schema
+definition once per version into:
+
+- one validator per top-level property, compiled when the property is first
+  patched, which checks the new value of that property alone, and
+- one record validator with every property schema replaced by ``true``, which
+  keeps ``required``, ``additionalProperties``, ``dependencies`` and the other
+  keywords relating several fields, and is run on the merged record.
+
+The errors are the ones the whole merged record would raise, minus the ones of
+properties the patch leaves untouched.
+"""
+from typing import Iterator, Optional
+
+from jsonschema.exceptions import ValidationError
+
+from src.domain.validation.compiled_validator import CompiledValidator, compile_validator
+
+# keywords not constraining the record itself, nor the fields relative to each other
+_ANNOTATIONS = frozenset(("$schema", "$id", "$comment", "title", "description", "default",
+                          "examples", "definitions", "properties"))
+
+
+class PatchValidator:
+    """Validator of the patches applied to the records of one schema definition."""
+
+    def __init__(self, definition: dict):
+        """
+        Compile the record validator of a schema definition.
+
+        Parameters
+        ----------
+        definition : dict
+            The JSON schema definition of the records.
+        """
+        self.definition = definition
+        self._properties: dict = definition.get("properties") or {}
+        self._property_validators: dict = {}
+        self._record_validator = self._compile_record_validator(definition)
+
+    def _compile_record_validator(self, definition: dict) -> Optional[CompiledValidator]:
+        keywords = set(definition) - _ANNOTATIONS
+        if not keywords or (keywords == {"type"} and definition["type"] == "object"):
+            return None
+        record_definition = dict(definition)
+        if "properties" in definition:
+            # the names are kept, additionalProperties depends on them
+            record_definition["properties"] = {name: True for name in self._properties}
+        return compile_validator(record_definition)
+
+    def _property_validator(self, name: str) -> Optional[CompiledValidator]:
+        if name not in self._properties:
+            return None
+        validator = self._property_validators.get(name)
+        if validator is None:
+            # references of the property still resolve against the whole definition
+            validator = self._property_validators[name] = compile_validator(
+                self._properties[name], root=self.definition)
+        return validator
+
+    def iter_errors(self, record: dict, patch: dict) -> Iterator[ValidationError]:
+        """
+        Validate a patch applied to a record.
+
+        The ``uid`` field set by the stores is left out of both.
+
+        Parameters
+        ----------
+        record : dict
+            The stored record.
+        patch : dict
+            The fields set by the update.
+
+        Yields
+        ------
+        ValidationError
+            The errors of the patched properties, then the ones of the merged record.
+        """
+        patch = {name: value for name, value in patch.items() if name != "uid"}
+        for name, value in patch.items():
+            validator = self._property_validator(name)
+            if validator is not None:
+                yield from validator.iter_errors(value)
+        if self._record_validator is not None:
+            merged = {name: value for name, value in record.items() if name != "uid"}
+            merged.update(patch)
+            yield from self._record_validator.iter_errors(merged)
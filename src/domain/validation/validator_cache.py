@@ -0,0 +1,135 @@
+"""
+Module for the compiled validator cache.
+
+This module keeps compiled JSON schema validators keyed by schema keyname and
+schema definition version, so the definition is only walked once per version
+instead of once per validated record. The validators are compiled by
+`compile_validator` into Python functions specialized for each definition.
+"""
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from typing import Any, Callable, Dict, Tuple
+
+from src.domain.model.schema import Schema
+from src.domain.validation.compiled_validator import CompiledValidator, compile_validator
+from src.domain.validation.patch_validator import PatchValidator
+
+
+class ValidatorCache:
+    """Bounded LRU cache of compiled validators.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of validators kept before the least recently used is evicted.
+    hits : int
+        Number of lookups served from the cache.
+    misses : int
+        Number of lookups that required compiling a validator.
+    evictions : int
+        Number of validators dropped because the cache was full.
+    """
+
+    def __init__(self, max_size: int = 256):
+        if max_size < 1:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self._validators: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_validator(self, schema: Schema) -> CompiledValidator:
+        """Return the compiled validator for the current definition of a schema.
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema whose current definition is to be validated against.
+
+        Returns
+        -------
+        CompiledValidator
+            The compiled validator for ``(schema_keyname, current_version)``.
+        """
+        return self._get_or_compile((schema.schema_keyname, schema.current_version),
+                                    lambda: compile_validator(schema.current_schema_definition))
+
+    def get_patch_validator(self, schema: Schema) -> PatchValidator:
+        """Return the compiled patch validator for the current definition of a schema.
+
+        Parameters
+        ----------
+        schema : Schema
+            The schema whose current definition the updates are validated against.
+
+        Returns
+        -------
+        PatchValidator
+            The compiled patch validator for ``(schema_keyname, current_version)``.
+        """
+        return self._get_or_compile((schema.schema_keyname, schema.current_version, "patch"),
+                                    lambda: PatchValidator(schema.current_schema_definition))
+
+    def _get_or_compile(self, key: Tuple[Hashable, ...], compile_: Callable[[], Any]) -> Any:
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                self.hits += 1
+                return validator
+            self.misses += 1
+
+        validator = compile_()
+
+        with self._lock:
+            self._validators[key] = validator
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.max_size:
+                self._validators.popitem(last=False)
+                self.evictions += 1
+        return validator
+
+    def invalidate(self, schema_keyname: str) -> int:
+        """Drop every cached validator of a schema.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema whose validators are to be dropped.
+
+        Returns
+        -------
+        int
+            The number of validators dropped.
+        """
+        with self._lock:
+            keys = [key for key in self._validators if key[0] == schema_keyname]
+            for key in keys:
+                del self._validators[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached validator and reset the counters."""
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters.
+
+        Returns
+        -------
+        dict
+            Current size, maximum size, hits, misses and evictions of the cache.
+        """
+        with self._lock:
+            return {"size": len(self._validators), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+VALIDATOR_CACHE = ValidatorCache()
@@ -0,0 +1,102 @@
+from abc import ABCMeta, abstractmethod
+from collections.abc import Hashable
+from typing import Optional, List
+
+from bisslog import Division
+
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+
+
+class AsyncSchemaDefVersionDivision(Division, metaclass=ABCMeta):
+    """Asyncio counterpart of the SchemaDefVersionDivision interface."""
+
+    @abstractmethod
+    async def create_schema_version(self, schema_version: SchemaDefinitionVersion) -> Hashable:
+        """Create a new version of a schema in the database.
+
+        Parameters
+        ----------
+        schema_version : SchemaDefinitionVersion
+            A dictionary defining the new version of the schema.
+
+        Returns
+        -------
+        Hashable
+            Unique identifier for the created schema version.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_schema_version(self, uid: Hashable) -> Optional[SchemaDefinitionVersion]:
+        """Retrieve the version of a specific schema.
+
+        Parameters
+        ----------
+        uid: Hashable
+            Unique identifier of schema definition version
+
+        Returns
+        -------
+        dict
+            A dictionary containing the version information for the specified schema.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_schema_versions(self, schema_keyname: str, limit: Optional[int] = None,
+                                  offset: int = 0) -> List[SchemaDefinitionVersion]:
+        """List versions of a specific schema in the database, oldest first.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose versions are to be listed.
+        limit : int, optional
+            Maximum number of versions to be listed. If None, all of them are listed.
+        offset : int
+            Number of versions to be skipped.
+
+        Returns
+        -------
+        list[SchemaDefinitionVersion]
+            The versions of the specified schema.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_schema_version(self, uid: Hashable) -> Optional[Hashable]:
+        """Delete a specific version of a schema from the database.
+
+        Parameters
+        ----------
+        uid: Hashable
+            Unique identifier of schema version
+
+        Returns
+        -------
+        bool
+            True if the schema version was deleted successfully, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_inactive_schema_versions(self, schema_keyname: str,
+                                              current_version: Hashable,
+                                              days: int) -> List[Hashable]:
+        """Delete all inactive versions of a specific schema.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose inactive versions are to be deleted.
+        current_version : Hashable
+            The unique identifier of the current active schema version.
+        days : int
+            The number of days after which a schema version is considered inactive.
+
+        Returns
+        -------
+        list[Hashable]
+            A list of unique identifiers for the deleted schema versions.
+        """
+        raise NotImplementedError
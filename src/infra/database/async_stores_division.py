@@ -0,0 +1,217 @@
+from abc import ABCMeta, abstractmethod
+from typing import Hashable, Optional, List, AsyncIterator, Tuple
+
+from bisslog import Division
+
+from src.domain.model.schema import Schema
+
+
+class AsyncStoresDivision(Division, metaclass=ABCMeta):
+    """
+    Asyncio counterpart of the StoresDivision interface.
+
+    Every operation is a coroutine, so implementations doing I/O release the event
+    loop while they wait.
+    """
+
+    @abstractmethod
+    async def create_store_of_schema(self, schema: Schema) -> bool:
+        """Create a new store for the schema in the database.
+
+        Parameters
+        ----------
+        schema : Schema
+            An instance of the Schema class defining the new store.
+
+        Returns
+        -------
+        bool
+            True if the store was created successfully, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def alter_store_of_schema(self, schema: Schema) -> bool:
+        """Alter the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema : Schema
+            An instance of the Schema class defining the new store.
+
+        Returns
+        -------
+        bool
+            True if the store was altered successfully, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_one_data_from_store(self, schema_keyname: str,
+                                      uid_data: Hashable) -> Optional[dict]:
+        """Get one data from the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        uid_data : Hashable
+            The unique identifier of the data to be retrieved.
+
+        Returns
+        -------
+        dict
+            A dictionary containing information about a record in the store.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_data_from_store(self, schema_keyname: str, params: dict,
+                                  fields: Optional[List[str]] = None) -> List[dict]:
+        """Get all data from the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        params : dict
+            Parameters to filter the data to be retrieved.
+        fields : list of str, optional
+            Fields to be returned for each record, ``uid`` is always included.
+            If None, whole records are returned.
+
+        Returns
+        -------
+        list
+            A list of dictionaries, each containing information about a record in the store.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_data_from_store(self, schema_keyname: str, params: dict,
+                             after: Optional[Hashable] = None,
+                             fields: Optional[List[str]] = None
+                             ) -> AsyncIterator[Tuple[Hashable, dict]]:
+        """Stream data from the store of the schema in the database.
+
+        Same ordering and resuming semantics as `StoresDivision.iter_data_from_store`,
+        consumed with ``async for``.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        params : dict
+            Parameters to filter the data.
+        after : Hashable, optional
+            The position of the last record already read. If None, starts from the beginning.
+        fields : list of str, optional
+            Fields of the records to be returned, besides ``uid``. If None, whole records
+            are returned.
+
+        Yields
+        ------
+        tuple of (Hashable, dict)
+            The JSON-serializable position of the record and the record itself.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_data_into_store(self, schema_keyname: str,
+                                     data: dict) -> Optional[Hashable]:
+        """Insert data into the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        data : dict
+            The data to be inserted into the store.
+
+        Returns
+        -------
+        Hashable
+            The unique identifier of the inserted data.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_many_into_store(self, schema_keyname: str,
+                                     data: List[dict]) -> List[Hashable]:
+        """Insert several records into the store of the schema in a single operation.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        data : list of dict
+            The records to be inserted into the store.
+
+        Returns
+        -------
+        list of Hashable
+            The unique identifiers of the inserted records, in the same order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_data_in_store(self, schema_keyname: str, data: dict,
+                                   uid_data: Hashable) -> Optional[Hashable]:
+        """Update data in the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        data : dict
+            The data to be updated in the store.
+        uid_data: Hashable
+            The unique identifier of the data to be updated.
+
+        Returns
+        -------
+        Hashable
+            The unique identifier of the updated data, None if it was not found.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_data_from_store(self, schema_keyname: str,
+                                     uid_data: Hashable) -> Optional[Hashable]:
+        """Delete data from the store of the schema in the database.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        uid_data: Hashable
+            The unique identifier of the data to be deleted.
+
+        Returns
+        -------
+        Hashable
+            The unique identifier of the deleted data, None if it was not found.
+        """
+        raise NotImplementedError
+
+    async def delete_many_from_store(self, schema_keyname: str,
+                                     uids_data: List[Hashable]) -> int:
+        """Delete several records from the store of the schema in a single operation.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        uids_data : list of Hashable
+            The unique identifiers of the records to be deleted.
+
+        Returns
+        -------
+        int
+            The number of deleted records.
+        """
+        deleted = 0
+        for uid_data in uids_data:
+            if await self.delete_data_from_store(schema_keyname, uid_data) is not None:
+                deleted += 1
+        return deleted
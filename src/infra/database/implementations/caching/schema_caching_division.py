@@ -0,0 +1,179 @@
+"""
+Module for a read-through cache decorator of the SchemaDivision interface.
+
+Schemas change a few times a week while they are read on every insert, so this
+decorator keeps them in memory in front of any other SchemaDivision implementation.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, List, Hashable, Dict, Tuple, Callable
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_base import SchemaBase
+from src.infra.database.schema_division import SchemaDivision
+
+
+class SchemaCachingDivision(SchemaDivision):
+    """
+    Read-through cache of schemas by keyname around another SchemaDivision.
+
+    Entries are evicted by LRU once ``max_size`` is reached and expire after ``ttl``
+    seconds. Unknown keynames are cached too, for ``negative_ttl`` seconds, so repeated
+    lookups of missing schemas do not reach the wrapped division. Every write made
+    through this division invalidates the entry of the affected schema.
+
+    Every invalidation bumps the generation of the keyname, and a schema read on a
+    miss is only cached if the generation of its keyname has not changed since, so
+    an invalidation racing the read is not undone by the schema it read.
+    """
+
+    def __init__(self, division: SchemaDivision, max_size: int = 1024, ttl: float = 300.0,
+                 negative_ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache around the wrapped division.
+
+        Parameters
+        ----------
+        division : SchemaDivision
+            The division whose schemas are cached.
+        max_size : int
+            Maximum number of cached keynames, found or not.
+        ttl : float
+            Seconds a found schema is kept.
+        negative_ttl : float
+            Seconds an unknown keyname is remembered as missing.
+        clock : callable
+            Monotonic clock in seconds, replaceable for testing.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be greater than 0")
+        self.division = division
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Schema]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._clears = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name: str):
+        """Delegate anything outside the SchemaDivision interface to the wrapped division."""
+        if name == "division":
+            raise AttributeError(name)
+        return getattr(self.division, name)
+
+    def get_schema(self, schema_keyname: str) -> Optional[Schema]:
+        """
+        Retrieve a schema by its keyname, from the cache when possible.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema to retrieve.
+
+        Returns
+        -------
+        Optional[Schema]
+            The schema instance if found, otherwise None.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(schema_keyname)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(schema_keyname)
+                if entry[1] is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation(schema_keyname)
+
+        schema = self.division.get_schema(schema_keyname)
+
+        expires_at = now + (self.ttl if schema is not None else self.negative_ttl)
+        with self._lock:
+            if self._generation(schema_keyname) != generation:
+                # invalidated while reading, the schema read may already be stale
+                return schema
+            self._entries[schema_keyname] = (expires_at, schema)
+            self._entries.move_to_end(schema_keyname)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return schema
+
+    def get_schemas(self, params: dict) -> List[Schema]:
+        return self.division.get_schemas(params)
+
+    def get_schemas_page(self, after: Optional[str] = None, limit: int = 100) -> List[Schema]:
+        return self.division.get_schemas_page(after, limit)
+
+    def create_schema(self, schema: Schema) -> Hashable:
+        try:
+            return self.division.create_schema(schema)
+        finally:
+            self.invalidate(schema.schema_keyname)
+
+    def delete_schema(self, schema_keyname: str) -> Optional[Hashable]:
+        try:
+            return self.division.delete_schema(schema_keyname)
+        finally:
+            self.invalidate(schema_keyname)
+
+    def update_schema(self, schema: SchemaBase) -> Optional[Hashable]:
+        try:
+            return self.division.update_schema(schema)
+        finally:
+            self.invalidate(schema.schema_keyname)
+
+    def update_schema_definition(self, schema_keyname: str, new_version: Hashable,
+                                 definition: dict) -> Optional[Hashable]:
+        try:
+            return self.division.update_schema_definition(schema_keyname, new_version, definition)
+        finally:
+            self.invalidate(schema_keyname)
+
+    def invalidate(self, schema_keyname: str) -> None:
+        """
+        Forget the cached entry of a schema.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The keyname of the schema to forget.
+        """
+        with self._lock:
+            self._entries.pop(schema_keyname, None)
+            self._generations[schema_keyname] = self._generations.get(schema_keyname, 0) + 1
+
+    def clear(self) -> None:
+        """Forget every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._clears += 1
+
+    def _generation(self, schema_keyname: str) -> Tuple[int, int]:
+        """Generation of the entry of a keyname, read while holding the lock."""
+        return self._clears, self._generations.get(schema_keyname, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns
+        -------
+        dict
+            Current size, hits, negative hits, misses and evictions of the cache.
+        """
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits,
+                    "negative_hits": self.negative_hits, "misses": self.misses,
+                    "evictions": self.evictions}
@@ -0,0 +1,90 @@
+"""
+Module for a metrics decorator of any division.
+
+It sits between the use cases and a registered division, so the time spent in the
+backend can be told apart from the time spent in the use case itself.
+"""
+import inspect
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from src.domain.metrics.registry import METRICS, MetricsRegistry
+
+CALLS_METRIC = "division_calls_total"
+ERRORS_METRIC = "division_errors_total"
+DURATION_METRIC = "division_call_duration_seconds"
+
+
+class InstrumentedDivision:
+    """
+    Proxy recording call counts, error counts and latencies of a division's methods.
+
+    Every public method of the wrapped division is wrapped on first access and the
+    wrapper is kept, so later calls only pay for two clock reads and the metric
+    updates. Coroutine methods are timed until they complete. Methods returning
+    iterators are timed until the iterator is returned, not while it is consumed.
+    Any other attribute is read from the wrapped division as is.
+    """
+
+    def __init__(self, division: Any, name: str, registry: MetricsRegistry = METRICS):
+        """
+        Initialize the proxy around the wrapped division.
+
+        Parameters
+        ----------
+        division : Any
+            The division whose methods are measured.
+        name : str
+            Name the division is registered with, used as the ``division`` label.
+        registry : MetricsRegistry
+            Registry receiving the metrics.
+        """
+        self.division = division
+        self.name = name
+        self._registry = registry
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in ("division", "name", "_registry"):
+            raise AttributeError(attr)
+        value = getattr(self.division, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        wrapper = self._instrument(attr, value)
+        self.__dict__[attr] = wrapper
+        return wrapper
+
+    def _instrument(self, method_name: str, method: Callable) -> Callable:
+        labels = {"division": self.name, "method": method_name}
+        calls = self._registry.counter(CALLS_METRIC, "Calls of division methods.", **labels)
+        errors = self._registry.counter(ERRORS_METRIC, "Division method calls that raised.",
+                                        **labels)
+        duration = self._registry.histogram(DURATION_METRIC,
+                                            "Seconds spent in division methods.", **labels)
+
+        if inspect.iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                except BaseException:
+                    errors.inc()
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - started)
+                    calls.inc()
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started)
+                calls.inc()
+        return wrapper
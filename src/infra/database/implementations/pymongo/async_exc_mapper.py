@@ -0,0 +1,24 @@
+from functools import wraps
+
+from bisslog_pymongo import bisslog_exc_mapper_pymongo
+from bson.errors import BSONError
+from pymongo.errors import PyMongoError
+
+
+@bisslog_exc_mapper_pymongo
+def _raise_mapped(error: Exception):
+    """Re-raise a pymongo error so the sync mapper turns it into a bisslog one."""
+    raise error
+
+
+def bisslog_exc_mapper_pymongo_async(func):
+    """Coroutine counterpart of `bisslog_exc_mapper_pymongo`, with the same mapping."""
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except (PyMongoError, BSONError) as error:
+            _raise_mapped(error)
+
+    return wrapper
@@ -0,0 +1,55 @@
+from typing import Hashable, Optional, List
+
+from bisslog_pymongo import BasicPymongoHelper
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_base import SchemaBase
+from src.infra.database.async_schema_division import AsyncSchemaDivision
+from src.infra.database.implementations.pymongo.async_exc_mapper import \
+    bisslog_exc_mapper_pymongo_async
+from src.infra.database.implementations.pymongo.schema_pymongo_division import \
+    SchemaDocumentsMixin
+
+
+class AsyncSchemaMongoDivision(SchemaDocumentsMixin, AsyncSchemaDivision, BasicPymongoHelper):
+    """
+    Asyncio Mongo implementation of the AsyncSchemaDivision interface.
+
+    Built over an `AsyncMongoClient`, on the same collection and documents as
+    `SchemaMongoDivision`.
+    """
+
+    @bisslog_exc_mapper_pymongo_async
+    async def get_schema(self, schema_keyname: str) -> Optional[Schema]:
+        document = await self.get_collection(self.col).find_one(
+            self._keyname_filter(schema_keyname))
+        return self._to_schema(document)
+
+    @bisslog_exc_mapper_pymongo_async
+    async def get_schemas(self, params: dict) -> List[Schema]:
+        cursor = self.get_collection(self.col).find(params or {})
+        return [self._to_schema(document) async for document in cursor]
+
+    @bisslog_exc_mapper_pymongo_async
+    async def create_schema(self, schema: Schema) -> Hashable:
+        res = await self.get_collection(self.col).insert_one(self._schema_document(schema))
+        schema.schema_id = str(res.inserted_id)
+        return schema.schema_id
+
+    @bisslog_exc_mapper_pymongo_async
+    async def delete_schema(self, schema_keyname: str) -> Optional[Hashable]:
+        return self._to_id(await self.get_collection(self.col).find_one_and_delete(
+            self._keyname_filter(schema_keyname), projection=self.id_projection))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def update_schema(self, schema: SchemaBase) -> Optional[Hashable]:
+        return self._to_id(await self.get_collection(self.col).find_one_and_update(
+            self._keyname_filter(schema.schema_keyname), self._metadata_update(schema),
+            projection=self.id_projection))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def update_schema_definition(self, schema_keyname: str, new_version: Hashable,
+                                       definition: dict) -> Optional[Hashable]:
+        return self._to_id(await self.get_collection(self.col).find_one_and_update(
+            self._keyname_filter(schema_keyname),
+            self._definition_update(new_version, definition), projection=self.id_projection))
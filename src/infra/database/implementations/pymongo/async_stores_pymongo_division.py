@@ -0,0 +1,110 @@
+from typing import Any, Hashable, Optional, List, AsyncIterator, Tuple
+
+from bson import ObjectId
+from bisslog_pymongo import BasicPymongoHelper
+
+from src.domain.model.schema import Schema
+from src.infra.database.async_stores_division import AsyncStoresDivision
+from src.infra.database.implementations.pymongo.async_exc_mapper import \
+    bisslog_exc_mapper_pymongo_async
+from src.infra.database.implementations.pymongo.stores_pymongo_division import (
+    StoreDocumentsMixin, Steps)
+
+
+class AsyncStoresMongoDivision(StoreDocumentsMixin, AsyncStoresDivision, BasicPymongoHelper):
+    """
+    Asyncio Mongo implementation of the AsyncStoresDivision interface.
+
+    Built over an `AsyncMongoClient`, with the same collections, indexes and
+    records as `StoresMongoDivision`, so both can serve the same database.
+    """
+
+    @bisslog_exc_mapper_pymongo_async
+    async def create_store_of_schema(self, schema: Schema) -> bool:
+        return await self._run(self._create_store(schema))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def alter_store_of_schema(self, schema: Schema) -> bool:
+        return await self._run(self._alter_store(schema))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def get_one_data_from_store(self, schema_keyname: str,
+                                      uid_data: Hashable) -> Optional[dict]:
+        return await self._run(self._find_one(schema_keyname, uid_data))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def get_data_from_store(self, schema_keyname: str, params: dict,
+                                  fields: Optional[List[str]] = None) -> List[dict]:
+        return await self._run(self._find(schema_keyname, params, fields))
+
+    async def iter_data_from_store(self, schema_keyname: str, params: dict,
+                                   after: Optional[str] = None,
+                                   fields: Optional[List[str]] = None
+                                   ) -> AsyncIterator[Tuple[str, dict]]:
+        iteration = self._iteration(params, after)
+        if iteration is None:
+            return
+        query, uid_filter, last_id = iteration
+        while True:
+            page = await self._find_page(schema_keyname, query, uid_filter, last_id, fields)
+            for record in page:
+                yield record["uid"], record
+            if len(page) < self.batch_size:
+                return
+            last_id = ObjectId(page[-1]["uid"])
+
+    @bisslog_exc_mapper_pymongo_async
+    async def _find_page(self, schema_keyname: str, query: dict, uid_filter: Any,
+                         last_id: Optional[ObjectId], fields: Optional[List[str]]) -> List[dict]:
+        return await self._run(self._page(schema_keyname, query, uid_filter, last_id, fields))
+
+    async def _run(self, steps: Steps) -> Any:
+        """Make the collection calls of the steps, returning their result."""
+        result = None
+        while True:
+            try:
+                collection, method, args, kwargs = steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result = getattr(collection, method)(*args, **kwargs)
+            if method == "find":
+                result = [document async for document in result]
+            else:
+                result = await result
+
+    @bisslog_exc_mapper_pymongo_async
+    async def insert_data_into_store(self, schema_keyname: str, data: dict) -> Hashable:
+        return (await self._run(self._insert(schema_keyname, [data])))[0]
+
+    @bisslog_exc_mapper_pymongo_async
+    async def insert_many_into_store(self, schema_keyname: str,
+                                     data: List[dict]) -> List[Hashable]:
+        if not data:
+            return []
+        return await self._run(self._insert(schema_keyname, data))
+
+    @bisslog_exc_mapper_pymongo_async
+    async def update_data_in_store(self, schema_keyname: str, data: dict,
+                                   uid_data: Hashable) -> Optional[Hashable]:
+        object_id = self._object_id(uid_data)
+        if object_id is None:
+            return None
+        found = await self._run(self._update(schema_keyname, object_id, data))
+        return uid_data if found else None
+
+    @bisslog_exc_mapper_pymongo_async
+    async def delete_data_from_store(self, schema_keyname: str,
+                                     uid_data: Hashable) -> Optional[Hashable]:
+        object_id = self._object_id(uid_data)
+        if object_id is None:
+            return None
+        return uid_data if await self._run(self._delete(schema_keyname, [object_id])) else None
+
+    @bisslog_exc_mapper_pymongo_async
+    async def delete_many_from_store(self, schema_keyname: str,
+                                     uids_data: List[Hashable]) -> int:
+        object_ids = [object_id for object_id in map(self._object_id, uids_data)
+                      if object_id is not None]
+        if not object_ids:
+            return 0
+        return await self._run(self._delete(schema_keyname, object_ids))
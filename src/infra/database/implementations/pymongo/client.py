@@ -0,0 +1,56 @@
+import os
+from typing import Optional
+
+from pymongo import AsyncMongoClient, MongoClient
+
+
+def build_mongo_client(uri: Optional[str] = None, max_pool_size: Optional[int] = None,
+                       min_pool_size: Optional[int] = None, **options) -> MongoClient:
+    """Build the Mongo client shared by the pymongo divisions.
+
+    Parameters
+    ----------
+    uri : str, optional
+        Connection string, ``MONGO_URI`` environment variable by default.
+    max_pool_size : int, optional
+        Maximum number of connections per server, ``MONGO_MAX_POOL_SIZE`` environment
+        variable by default, otherwise 100.
+    min_pool_size : int, optional
+        Minimum number of idle connections kept per server, ``MONGO_MIN_POOL_SIZE``
+        environment variable by default, otherwise 0.
+    **options
+        Other keyword arguments for `MongoClient`.
+
+    Returns
+    -------
+    MongoClient
+        The configured client.
+    """
+    return MongoClient(**_client_options(uri, max_pool_size, min_pool_size), **options)
+
+
+def build_async_mongo_client(uri: Optional[str] = None, max_pool_size: Optional[int] = None,
+                             min_pool_size: Optional[int] = None,
+                             **options) -> AsyncMongoClient:
+    """Build the asyncio Mongo client shared by the async pymongo divisions.
+
+    Takes the same parameters and environment variables as `build_mongo_client`.
+
+    Returns
+    -------
+    AsyncMongoClient
+        The configured client.
+    """
+    return AsyncMongoClient(**_client_options(uri, max_pool_size, min_pool_size), **options)
+
+
+def _client_options(uri: Optional[str], max_pool_size: Optional[int],
+                    min_pool_size: Optional[int]) -> dict:
+    """Resolve the connection options, falling back to the environment variables."""
+    if uri is None:
+        uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+    if max_pool_size is None:
+        max_pool_size = int(os.environ.get("MONGO_MAX_POOL_SIZE", "100"))
+    if min_pool_size is None:
+        min_pool_size = int(os.environ.get("MONGO_MIN_POOL_SIZE", "0"))
+    return {"host": uri, "maxPoolSize": max_pool_size, "minPoolSize": min_pool_size}
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from bisslog_pymongo import BasicPymongoHelper, bisslog_exc_mapper_pymongo
+
+from src.infra.database.job_checkpoint_division import JobCheckpointDivision
+
+
+class JobCheckpointMongoDivision(JobCheckpointDivision, BasicPymongoHelper):
+    """
+    Mongo implementation of the JobCheckpointDivision interface.
+
+    Each job has one document whose ``_id`` is the job name.
+    """
+
+    col = "job_checkpoints"
+
+    @bisslog_exc_mapper_pymongo
+    def get_checkpoint(self, job_name: str) -> Optional[dict]:
+        document = self.get_collection(self.col).find_one({"_id": job_name})
+        return document["progress"] if document is not None else None
+
+    @bisslog_exc_mapper_pymongo
+    def save_checkpoint(self, job_name: str, progress: dict) -> None:
+        self.get_collection(self.col).replace_one({"_id": job_name}, {"progress": progress},
+                                                  upsert=True)
+
+    @bisslog_exc_mapper_pymongo
+    def delete_checkpoint(self, job_name: str) -> bool:
+        return self.get_collection(self.col).delete_one({"_id": job_name}).deleted_count == 1
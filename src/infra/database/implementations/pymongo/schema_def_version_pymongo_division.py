@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import Hashable, Optional, List
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from bisslog_pymongo import BasicPymongoHelper, bisslog_exc_mapper_pymongo
+from pymongo import ASCENDING, MongoClient
+
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.schema_def_version_division import SchemaDefVersionDivision
+
+
+class SchemaDefVersionMongoDivision(SchemaDefVersionDivision, BasicPymongoHelper):
+    """
+    Mongo implementation of the SchemaDefVersionDivision interface.
+
+    Versions are indexed by ``(schema_keyname, created_at)``, which serves both the
+    sorted listing of the versions of a schema and the pruning of the old ones.
+    """
+
+    col = "schema_versions"
+    index_name = "schema_keyname_created_at"
+    projection = {"schema_keyname": 1, "schema_definition": 1, "created_at": 1}
+
+    def __init__(self, mongo_client: MongoClient, database_name: str = None,
+                 create_indexes: bool = True) -> None:
+        BasicPymongoHelper.__init__(self, mongo_client, database_name)
+        if create_indexes:
+            self.ensure_indexes()
+
+    @bisslog_exc_mapper_pymongo
+    def ensure_indexes(self) -> None:
+        """Create the compound index used to list and prune versions."""
+        self.get_collection(self.col).create_index(
+            [("schema_keyname", ASCENDING), ("created_at", ASCENDING)], name=self.index_name)
+
+    @staticmethod
+    def _object_id(uid: Hashable) -> Optional[ObjectId]:
+        try:
+            return ObjectId(uid)
+        except (InvalidId, TypeError):
+            return None
+
+    @staticmethod
+    def _to_version(document: Optional[dict]) -> Optional[SchemaDefinitionVersion]:
+        if document is None:
+            return None
+        return SchemaDefinitionVersion(schema_keyname=document["schema_keyname"],
+                                       schema_definition=document["schema_definition"],
+                                       created_at=document["created_at"],
+                                       schema_version_id=str(document["_id"]))
+
+    @bisslog_exc_mapper_pymongo
+    def create_schema_version(self, schema_version: SchemaDefinitionVersion) -> Hashable:
+        res = self.get_collection(self.col).insert_one({
+            "schema_keyname": schema_version.schema_keyname,
+            "schema_definition": schema_version.schema_definition,
+            "created_at": schema_version.created_at,
+        })
+        schema_version.schema_version_id = str(res.inserted_id)
+        return schema_version.schema_version_id
+
+    @bisslog_exc_mapper_pymongo
+    def get_schema_version(self, uid: Hashable) -> Optional[SchemaDefinitionVersion]:
+        object_id = self._object_id(uid)
+        if object_id is None:
+            return None
+        return self._to_version(
+            self.get_collection(self.col).find_one({"_id": object_id}, self.projection))
+
+    @bisslog_exc_mapper_pymongo
+    def get_schema_versions(self, schema_keyname: str, limit: Optional[int] = None,
+                            offset: int = 0) -> List[SchemaDefinitionVersion]:
+        cursor = (self.get_collection(self.col)
+                  .find({"schema_keyname": schema_keyname}, self.projection)
+                  .sort([("schema_keyname", ASCENDING), ("created_at", ASCENDING)])
+                  .skip(offset))
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [self._to_version(document) for document in cursor]
+
+    @bisslog_exc_mapper_pymongo
+    def delete_schema_version(self, uid: Hashable) -> Optional[Hashable]:
+        object_id = self._object_id(uid)
+        if object_id is None:
+            return None
+        res = self.get_collection(self.col).delete_one({"_id": object_id})
+        if res.deleted_count == 1:
+            return uid
+        return None
+
+    @bisslog_exc_mapper_pymongo
+    def delete_inactive_schema_versions(self, schema_keyname: str,
+                                        current_version: Hashable, days: int) -> List[Hashable]:
+        query = {"schema_keyname": schema_keyname,
+                 "created_at": {"$lt": datetime.now() - timedelta(days=days)}}
+        current_id = self._object_id(current_version)
+        if current_id is not None:
+            query["_id"] = {"$ne": current_id}
+        collection = self.get_collection(self.col)
+        ids = [document["_id"] for document in collection.find(query, {"_id": 1})]
+        if not ids:
+            return []
+        collection.delete_many({"_id": {"$in": ids}})
+        return [str(object_id) for object_id in ids]
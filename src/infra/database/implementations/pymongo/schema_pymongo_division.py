@@ -1,61 +1,107 @@
-from dataclasses import asdict
+from dataclasses import asdict, fields
 from typing import Hashable, Optional, List
 
 from bisslog_pymongo import BasicPymongoHelper, bisslog_exc_mapper_pymongo
+from pymongo import ASCENDING
 
 from src.domain.model.schema import Schema
 from src.domain.model.schema_base import SchemaBase
 from src.infra.database.schema_division import SchemaDivision
 
+_SCHEMA_FIELDS = tuple(field.name for field in fields(Schema))
 
-class SchemaMongoDivision(SchemaDivision, BasicPymongoHelper):
+
+class SchemaDocumentsMixin:
+    """Mapping between the schemas and their Mongo documents.
+
+    Shared by the sync and async Mongo schema divisions, which must also inherit
+    from `BasicPymongoHelper`. Documents are returned as `Schema` instances whose
+    ``schema_id`` is the string ``_id`` of the document.
+    """
 
     col = "schemas"
+    id_projection = {"_id": 1}
+
+    @staticmethod
+    def _to_schema(document: Optional[dict]) -> Optional[Schema]:
+        if document is None:
+            return None
+        document["schema_id"] = str(document.pop("_id"))
+        return Schema(**{k: v for k, v in document.items() if k in _SCHEMA_FIELDS})
+
+    @staticmethod
+    def _to_id(document: Optional[dict]) -> Optional[str]:
+        return None if document is None else str(document["_id"])
+
+    @staticmethod
+    def _keyname_filter(schema_keyname: str) -> dict:
+        return {"schema_keyname": schema_keyname}
+
+    @staticmethod
+    def _page_query(after: Optional[str]) -> dict:
+        return {} if after is None else {"schema_keyname": {"$gt": after}}
+
+    @staticmethod
+    def _schema_document(schema: Schema) -> dict:
+        document = asdict(schema)
+        document.pop("schema_id", None)
+        return document
+
+    @staticmethod
+    def _metadata_update(schema: SchemaBase) -> dict:
+        return {"$set": {"schema_name": schema.schema_name,
+                         "schema_description": schema.schema_description}}
+
+    @staticmethod
+    def _definition_update(new_version: Hashable, definition: dict) -> dict:
+        return {"$set": {"current_version": new_version,
+                         "current_schema_definition": definition}}
+
+
+class SchemaMongoDivision(SchemaDocumentsMixin, SchemaDivision, BasicPymongoHelper):
+    """
+    Mongo implementation of the SchemaDivision interface.
+
+    Documents are returned as `Schema` instances whose ``schema_id`` is the string
+    ``_id`` of the document.
+    """
 
     @bisslog_exc_mapper_pymongo
     def get_schema(self, schema_keyname: str) -> Optional[Schema]:
-        res = self.get_collection(self.col).find_one({"schema_keyname": schema_keyname})
-        return self.stringify_identifier(res)
+        document = self.get_collection(self.col).find_one(self._keyname_filter(schema_keyname))
+        return self._to_schema(document)
 
     @bisslog_exc_mapper_pymongo
     def get_schemas(self, params: dict) -> List[Schema]:
-        res = self.get_collection(self.col).find(params)
-        return self.stringify_list_identifier(res)
+        cursor = self.get_collection(self.col).find(params or {})
+        return [self._to_schema(document) for document in cursor]
+
+    @bisslog_exc_mapper_pymongo
+    def get_schemas_page(self, after: Optional[str] = None, limit: int = 100) -> List[Schema]:
+        cursor = (self.get_collection(self.col).find(self._page_query(after))
+                  .sort("schema_keyname", ASCENDING).limit(limit))
+        return [self._to_schema(document) for document in cursor]
 
     @bisslog_exc_mapper_pymongo
     def create_schema(self, schema: Schema) -> Hashable:
-        res = self.get_collection(self.col).insert_one(asdict(schema))
-        return res.inserted_id
+        res = self.get_collection(self.col).insert_one(self._schema_document(schema))
+        schema.schema_id = str(res.inserted_id)
+        return schema.schema_id
 
     @bisslog_exc_mapper_pymongo
     def delete_schema(self, schema_keyname: str) -> Optional[Hashable]:
-        res = self.get_schema(schema_keyname)
-        if not res:
-            return None
-        res = (self.get_collection(self.col)
-               .delete_one({"schema_keyname": schema_keyname}))
-        if res.deleted_count == 1:
-            return res["_id"]
-        return None
+        return self._to_id(self.get_collection(self.col).find_one_and_delete(
+            self._keyname_filter(schema_keyname), projection=self.id_projection))
 
     @bisslog_exc_mapper_pymongo
     def update_schema(self, schema: SchemaBase) -> Optional[Hashable]:
-        res = self.get_collection(self.col).update_one(
-            {"schema_keyname": schema.schema_keyname},
-            {"$set": asdict(schema)}
-        )
-        if res.modified_count == 1:
-            return res.upserted_id
-        return None
+        return self._to_id(self.get_collection(self.col).find_one_and_update(
+            self._keyname_filter(schema.schema_keyname), self._metadata_update(schema),
+            projection=self.id_projection))
 
     @bisslog_exc_mapper_pymongo
     def update_schema_definition(self, schema_keyname: str, new_version: Hashable,
                                  definition: dict) -> Optional[Hashable]:
-        res = self.get_collection(self.col).update_one(
-            {"schema_keyname": schema_keyname},
-            {"$set": {"current_version": new_version,
-                      "current_schema_definition": definition}}
-        )
-        if res.modified_count == 1:
-            return res.upserted_id
-        return None
+        return self._to_id(self.get_collection(self.col).find_one_and_update(
+            self._keyname_filter(schema_keyname),
+            self._definition_update(new_version, definition), projection=self.id_projection))
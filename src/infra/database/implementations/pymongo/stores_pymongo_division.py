@@ -0,0 +1,507 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Hashable, Optional, List, Iterator, Tuple, Generator
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from bisslog_pymongo import BasicPymongoHelper, bisslog_exc_mapper_pymongo
+from pymongo import ASCENDING, DeleteOne, ReturnDocument
+from pymongo.collection import Collection
+
+from src.domain.model.schema import Schema
+from src.domain.query.aggregation import COUNT, Aggregator, Metrics, sort_distinct
+from src.domain.query.filters import is_operator_expression, validate_params
+from src.infra.database.stores_division import (DELETE_CHANGE, INSERT_CHANGE, UPDATE_CHANGE,
+                                                StoresDivision)
+
+# a change numbered with its sequence number, logged without op for a skipped number
+Change = Tuple[int, Optional[str], str, Optional[dict]]
+# a call of a method of a collection or database, made by the sync or async division
+Call = Tuple[Any, str, tuple, dict]
+Steps = Generator[Call, Any, Any]
+
+_SEQ_FIELD = "_seq"
+
+
+def _call(target: Any, method: str, *args: Any, **kwargs: Any) -> Call:
+    return target, method, args, kwargs
+
+
+class StoreDocumentsMixin:
+    """Mapping between the records of the stores and their Mongo documents.
+
+    Shared by the sync and async Mongo store divisions, which must also inherit
+    from `BasicPymongoHelper`. The operations are built here as generators of the
+    collection calls to make, which each division makes with its own client, and
+    send back their results.
+
+    Every write reserves its sequence numbers before writing the documents, and
+    stores them in their ``_seq`` field: a document is only written by a change
+    numbered after the last one that wrote it, so the change log is in the order
+    of the writes. A write overtaken by a later numbered one is numbered again, its
+    first number being logged without op, so the readers skip it without waiting.
+
+    The generation of a store is not taken from the reserved numbers, which are
+    given before the documents are written, but from the ``written`` count of its
+    counter, raised once the changes are written and logged.
+    """
+
+    col_prefix = "store_"
+    index_prefix = "x_index_"
+    batch_size = 1000
+    changes_col_prefix = "changes_"
+    change_counters_col = "store_change_counters"
+    change_log_retention = 10_000
+    # seconds after which a missing sequence number is taken as a failed write
+    change_gap_timeout = 30.0
+
+    def _store(self, schema_keyname: str) -> Collection:
+        return self.get_collection(self.col_prefix + schema_keyname)
+
+    def _changes(self, schema_keyname: str) -> Collection:
+        return self.get_collection(self.changes_col_prefix + schema_keyname)
+
+    def _change_counters(self) -> Collection:
+        return self.get_collection(self.change_counters_col)
+
+    def _create_store(self, schema: Schema) -> Steps:
+        """Create the collection of a store, its indexes and its change counter."""
+        name = self.col_prefix + schema.schema_keyname
+        if name not in (yield _call(self.database, "list_collection_names")):
+            yield _call(self.database, "create_collection", name)
+        # the epoch of the sequence numbers of the store is drawn along with it
+        yield _call(self._change_counters(), "update_one", {"_id": schema.schema_keyname},
+                    {"$setOnInsert": {"seq": 0, "written": 0, "epoch": str(ObjectId())}},
+                    upsert=True)
+        yield from self._sync_indexes(schema)
+        return True
+
+    def _alter_store(self, schema: Schema) -> Steps:
+        """Sync the indexes of a store, returning whether it exists."""
+        name = self.col_prefix + schema.schema_keyname
+        if name not in (yield _call(self.database, "list_collection_names")):
+            return False
+        yield from self._sync_indexes(schema)
+        return True
+
+    def _sync_indexes(self, schema: Schema) -> Steps:
+        collection = self._store(schema.schema_keyname)
+        declared = {self.index_prefix + field: field for field in schema.get_indexed_fields()}
+        existing = yield _call(collection, "index_information")
+        for name in existing:
+            if name.startswith(self.index_prefix) and name not in declared:
+                yield _call(collection, "drop_index", name)
+        for name, field in declared.items():
+            if name not in existing:
+                yield _call(collection, "create_index", [(field, ASCENDING)], name=name)
+
+    def _reserve(self, schema_keyname: str, count: int) -> Steps:
+        """Reserve the next ``count`` sequence numbers of a store, returning the last one."""
+        counter = yield _call(self._change_counters(), "find_one_and_update",
+                              {"_id": schema_keyname},
+                              {"$inc": {"seq": count},
+                               "$setOnInsert": {"epoch": str(ObjectId())}},
+                              upsert=True, return_document=ReturnDocument.AFTER)
+        return counter["seq"]
+
+    def _log(self, schema_keyname: str, changes: List[Change]) -> Steps:
+        """Log the changes numbered by the last reservation, dropping the oldest ones."""
+        at = datetime.now(timezone.utc)
+        collection = self._changes(schema_keyname)
+        yield _call(collection, "insert_many",
+                    [{"_id": seq, "op": op, "uid": uid, "data": data, "at": at}
+                     for seq, op, uid, data in changes], ordered=False)
+        # counted rather than raised to the last number, so a write finishing after a
+        # later numbered one still changes the generation
+        yield _call(self._change_counters(), "update_one", {"_id": schema_keyname},
+                    {"$inc": {"written": len(changes)}})
+        last_seq = max(change[0] for change in changes)
+        expired = self._expired_seq(last_seq, len(changes))
+        if expired is not None:
+            yield _call(collection, "delete_many", {"_id": {"$lte": expired}})
+
+    @staticmethod
+    def _generation(counter: Optional[dict]) -> str:
+        """Generation of a store from the changes written, none before its first change."""
+        if not counter:
+            return "0"
+        return f"{counter.get('epoch', '0')}-{counter.get('written', 0)}"
+
+    def _expired_seq(self, last_seq: int, count: int) -> Optional[int]:
+        """Sequence number up to which changes are dropped after logging ``count`` changes.
+
+        The oldest changes are dropped by chunks, None when no chunk is due.
+        """
+        every = max(self.change_log_retention // 4, 1)
+        if (last_seq <= self.change_log_retention
+                or last_seq // every == (last_seq - count) // every):
+            return None
+        return last_seq - self.change_log_retention
+
+    @staticmethod
+    def _unwritten(object_id: ObjectId, seq: int) -> dict:
+        """Filter of a document not written by a change numbered after ``seq``."""
+        return {"_id": object_id, _SEQ_FIELD: {"$not": {"$gte": seq}}}
+
+    def _find_one(self, schema_keyname: str, uid_data: Hashable) -> Steps:
+        """Get a record by its uid."""
+        object_id = self._object_id(uid_data)
+        if object_id is None:
+            return None
+        document = yield _call(self._store(schema_keyname), "find_one", {"_id": object_id})
+        return self._to_record(document)
+
+    def _find(self, schema_keyname: str, params: Optional[dict],
+              fields: Optional[List[str]]) -> Steps:
+        """Get the records matching the params."""
+        query = self._query(params)
+        if query is None:
+            return []
+        documents = yield _call(self._store(schema_keyname), "find", query,
+                                self._projection(fields), batch_size=self.batch_size)
+        return [self._to_record(document) for document in documents]
+
+    def _iteration(self, params: Optional[dict],
+                   after: Optional[str]) -> Optional[Tuple[dict, Any, Optional[ObjectId]]]:
+        """Query, condition on ``_id`` and last id of an iteration, None if nothing matches."""
+        query = self._query(params)
+        if query is None:
+            return None
+        last_id = None
+        if after is not None:
+            last_id = self._object_id(after)
+            if last_id is None:
+                raise ValueError("position is not valid")
+        return query, query.pop("_id", None), last_id
+
+    def _page(self, schema_keyname: str, query: dict, uid_filter: Any,
+              last_id: Optional[ObjectId], fields: Optional[List[str]]) -> Steps:
+        """Get the page of the records of an iteration following ``last_id``."""
+        documents = yield _call(self._store(schema_keyname), "find",
+                                self._resume_query(query, uid_filter, last_id),
+                                self._projection(fields), sort=[("_id", ASCENDING)],
+                                limit=self.batch_size)
+        return [self._to_record(document) for document in documents]
+
+    def _insert(self, schema_keyname: str, data: List[dict]) -> Steps:
+        """Insert the records, returning their uids."""
+        documents = [{k: v for k, v in item.items() if k != "uid"} for item in data]
+        last_seq = yield from self._reserve(schema_keyname, len(documents))
+        seqs = range(last_seq - len(documents) + 1, last_seq + 1)
+        for seq, document in zip(seqs, documents):
+            document[_SEQ_FIELD] = seq
+        res = yield _call(self._store(schema_keyname), "insert_many", documents,
+                          ordered=False)
+        uids = [str(inserted_id) for inserted_id in res.inserted_ids]
+        yield from self._log(schema_keyname,
+                             [(seq, INSERT_CHANGE, uid, self._to_record(document))
+                              for seq, uid, document in zip(seqs, uids, documents)])
+        return uids
+
+    def _update(self, schema_keyname: str, object_id: ObjectId, data: dict) -> Steps:
+        """Update a record, returning whether it exists."""
+        collection = self._store(schema_keyname)
+        changes = {k: v for k, v in data.items() if k not in ("uid", "_id", _SEQ_FIELD)}
+        if not changes:
+            found = yield _call(collection, "count_documents", {"_id": object_id}, limit=1)
+            return bool(found)
+        while True:
+            seq = yield from self._reserve(schema_keyname, 1)
+            document = yield _call(collection, "find_one_and_update",
+                                   self._unwritten(object_id, seq),
+                                   {"$set": dict(changes, **{_SEQ_FIELD: seq})},
+                                   return_document=ReturnDocument.AFTER)
+            if document is not None:
+                yield from self._log(schema_keyname, [(seq, UPDATE_CHANGE, str(object_id),
+                                                       self._to_record(document))])
+                return True
+            yield from self._log(schema_keyname, [(seq, None, str(object_id), None)])
+            found = yield _call(collection, "count_documents", {"_id": object_id}, limit=1)
+            if not found:
+                return False
+
+    def _delete(self, schema_keyname: str, object_ids: List[ObjectId]) -> Steps:
+        """Delete the records, returning the number of deleted ones."""
+        collection = self._store(schema_keyname)
+        # the deleted ids are looked up first, so only their deletions are logged
+        pending = [document["_id"] for document in (yield _call(
+            collection, "find", {"_id": {"$in": object_ids}}, {"_id": 1}))]
+        deleted = 0
+        while pending:
+            last_seq = yield from self._reserve(schema_keyname, len(pending))
+            seqs = dict(zip(pending, range(last_seq - len(pending) + 1, last_seq + 1)))
+            res = yield _call(collection, "bulk_write",
+                              [DeleteOne(self._unwritten(object_id, seq))
+                               for object_id, seq in seqs.items()], ordered=False)
+            deleted += res.deleted_count
+            left = set()
+            if res.deleted_count < len(pending):
+                left = {document["_id"] for document in (yield _call(
+                    collection, "find", {"_id": {"$in": pending}}, {"_id": 1}))}
+            yield from self._log(schema_keyname,
+                                 [(seq, None if object_id in left else DELETE_CHANGE,
+                                   str(object_id), None) for object_id, seq in seqs.items()])
+            pending = [object_id for object_id in pending if object_id in left]
+        return deleted
+
+    def _read_changes(self, schema_keyname: str, after: Optional[int], limit: int) -> Steps:
+        """Result of `get_changes_from_store`.
+
+        Sequence numbers are reserved before the changes are written, so a missing one
+        may still be written: the changes stop before it until it is older than
+        `change_gap_timeout`.
+        """
+        counter = yield _call(self._change_counters(), "find_one", {"_id": schema_keyname})
+        last_seq = counter["seq"] if counter else 0
+        res = {"changes": [], "last_seq": last_seq,
+               "epoch": counter.get("epoch", "0") if counter else "0",
+               "position": last_seq, "expired": False}
+        if after is None:
+            return res
+        documents = yield _call(self._changes(schema_keyname), "find", {"_id": {"$gt": after}},
+                                sort=[("_id", ASCENDING)], limit=limit)
+        kept = bool(documents) and documents[0]["_id"] == after + 1
+        if after > last_seq or (after < last_seq - self.change_log_retention and not kept):
+            return dict(res, expired=True)
+        oldest_allowed = datetime.now(timezone.utc) - timedelta(seconds=self.change_gap_timeout)
+        position = after
+        for document in documents:
+            if document["_id"] != position + 1 and _utc(document["at"]) > oldest_allowed:
+                break
+            position = document["_id"]
+            if document["op"] is not None:
+                res["changes"].append({"seq": document["_id"], "op": document["op"],
+                                       "uid": document["uid"], "data": document["data"]})
+        return dict(res, position=position)
+
+    @staticmethod
+    def _to_record(document: Optional[dict]) -> Optional[dict]:
+        if document is None:
+            return None
+        document.pop(_SEQ_FIELD, None)
+        document["uid"] = str(document.pop("_id"))
+        return document
+
+    @staticmethod
+    def _object_id(uid_data: Hashable) -> Optional[ObjectId]:
+        try:
+            return ObjectId(uid_data)
+        except (InvalidId, TypeError):
+            return None
+
+    def _query(self, params: Optional[dict]) -> Optional[dict]:
+        """Mongo filter of the params, None if no document can match it.
+
+        The params share the Mongo operator syntax, so they are only validated, which
+        keeps any other operator out, and their ``uid`` condition moved to ``_id``.
+        """
+        if not params:
+            return {}
+        validate_params(params)
+        query = dict(params)
+        if "uid" in query:
+            uid_filter = self._uid_filter(query.pop("uid"))
+            if uid_filter is None:
+                return None
+            query["_id"] = uid_filter
+        return query
+
+    def _uid_filter(self, value: Any) -> Any:
+        """Condition on ``_id`` of the filter of ``uid``, None if no document can match it."""
+        if not is_operator_expression(value):
+            return self._object_id(value)
+        condition = {}
+        for name, argument in value.items():
+            if name == "$in":
+                condition[name] = [uid for uid in map(self._object_id, argument)
+                                   if uid is not None]
+                continue
+            uid_data = self._object_id(argument)
+            if uid_data is not None:
+                condition[name] = uid_data
+            elif name != "$ne":
+                return None
+        return condition or {"$exists": True}
+
+    @staticmethod
+    def _resume_query(query: dict, uid_filter: Any, last_id: Optional[ObjectId]) -> dict:
+        """Query of the documents after ``last_id`` keeping the condition on ``_id``."""
+        if last_id is None:
+            return query if uid_filter is None else dict(query, _id=uid_filter)
+        after = {"$gt": last_id}
+        if uid_filter is None:
+            return dict(query, _id=after)
+        if isinstance(uid_filter, dict):
+            return dict(query, **{"$and": [{"_id": uid_filter}, {"_id": after}]})
+        return dict(query, _id={"$eq": uid_filter, **after})
+
+    @staticmethod
+    def _projection(fields: Optional[List[str]]) -> Optional[dict]:
+        if fields is None:
+            return None
+        return {field: 1 for field in fields if field != "uid"} or {"_id": 1}
+
+    @staticmethod
+    def _aggregation_pipeline(query: dict, group_by: List[str], metrics: Metrics) -> List[dict]:
+        """Pipeline computing the groups of `aggregate_data_in_store` in Mongo."""
+        group = {"_id": {f"g{i}": _field_path(field) for i, field in enumerate(group_by)},
+                 COUNT: {"$sum": 1}}
+        for name, (aggregation, field) in metrics.items():
+            path = _field_path(field)
+            if aggregation == "sum":
+                group[name] = {"$sum": path}
+            elif aggregation == "distinct":
+                group[name] = {"$addToSet": path}
+            else:
+                # only numbers and strings are compared, as the other backends do
+                ordered = {"$cond": [{"$in": [{"$type": path}, _ORDERED_TYPES]}, path, None]}
+                group[name] = {"$" + aggregation: ordered}
+        return ([{"$match": query}] if query else []) + [{"$group": group}]
+
+    @staticmethod
+    def _aggregation_result(groups: List[dict], group_by: List[str],
+                            metrics: Metrics) -> List[dict]:
+        """Rows of `aggregate_data_in_store` from the groups output by the pipeline."""
+        res = []
+        for group in groups:
+            row = {field: _from_mongo(group["_id"].get(f"g{i}"))
+                   for i, field in enumerate(group_by)}
+            row[COUNT] = group[COUNT]
+            for name, (aggregation, _) in metrics.items():
+                value = group.get(name)
+                row[name] = (sort_distinct(_from_mongo(v) for v in value or [])
+                             if aggregation == "distinct" else _from_mongo(value))
+            res.append(row)
+        if not res and not group_by:
+            res = Aggregator([], metrics).result()
+        return res
+
+
+class StoresMongoDivision(StoreDocumentsMixin, StoresDivision, BasicPymongoHelper):
+    """
+    Mongo implementation of the StoresDivision interface.
+
+    Each schema gets its own collection, whose indexes are derived from the
+    properties declared with ``x-index`` in the schema definition. Records are
+    returned with their ``_id`` as the string ``uid``.
+    """
+
+    @bisslog_exc_mapper_pymongo
+    def create_store_of_schema(self, schema: Schema) -> bool:
+        return self._run(self._create_store(schema))
+
+    @bisslog_exc_mapper_pymongo
+    def alter_store_of_schema(self, schema: Schema) -> bool:
+        return self._run(self._alter_store(schema))
+
+    @bisslog_exc_mapper_pymongo
+    def get_one_data_from_store(self, schema_keyname: str, uid_data: Hashable) -> Optional[dict]:
+        return self._run(self._find_one(schema_keyname, uid_data))
+
+    @bisslog_exc_mapper_pymongo
+    def get_data_from_store(self, schema_keyname: str, params: dict,
+                            fields: Optional[List[str]] = None) -> List[dict]:
+        return self._run(self._find(schema_keyname, params, fields))
+
+    def iter_data_from_store(self, schema_keyname: str, params: dict,
+                             after: Optional[str] = None,
+                             fields: Optional[List[str]] = None) -> Iterator[Tuple[str, dict]]:
+        iteration = self._iteration(params, after)
+        if iteration is None:
+            return
+        query, uid_filter, last_id = iteration
+        while True:
+            page = self._find_page(schema_keyname, query, uid_filter, last_id, fields)
+            for record in page:
+                yield record["uid"], record
+            if len(page) < self.batch_size:
+                return
+            last_id = ObjectId(page[-1]["uid"])
+
+    @bisslog_exc_mapper_pymongo
+    def _find_page(self, schema_keyname: str, query: dict, uid_filter: Any,
+                   last_id: Optional[ObjectId], fields: Optional[List[str]]) -> List[dict]:
+        return self._run(self._page(schema_keyname, query, uid_filter, last_id, fields))
+
+    @bisslog_exc_mapper_pymongo
+    def aggregate_data_in_store(self, schema_keyname: str, params: Optional[dict],
+                                group_by: Optional[List[str]] = None,
+                                metrics: Optional[Metrics] = None) -> List[dict]:
+        group_by, metrics = group_by or [], metrics or {}
+        query = self._query(params)
+        if query is None:
+            return Aggregator(group_by, metrics).result()
+        collection = self._store(schema_keyname)
+        if not query and not group_by and not metrics:
+            return [{COUNT: collection.estimated_document_count()}]
+        groups = collection.aggregate(self._aggregation_pipeline(query, group_by, metrics))
+        return self._aggregation_result(list(groups), group_by, metrics)
+
+    def _run(self, steps: Steps) -> Any:
+        """Make the collection calls of the steps, returning their result."""
+        result = None
+        while True:
+            try:
+                collection, method, args, kwargs = steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result = getattr(collection, method)(*args, **kwargs)
+            if method == "find":
+                result = list(result)
+
+    @bisslog_exc_mapper_pymongo
+    def get_changes_from_store(self, schema_keyname: str, after: Optional[int],
+                               limit: int) -> dict:
+        return self._run(self._read_changes(schema_keyname, after, limit))
+
+    @bisslog_exc_mapper_pymongo
+    def get_store_generation(self, schema_keyname: str) -> Optional[str]:
+        return self._generation(self._change_counters().find_one({"_id": schema_keyname}))
+
+    @bisslog_exc_mapper_pymongo
+    def insert_data_into_store(self, schema_keyname: str, data: dict) -> Hashable:
+        return self._run(self._insert(schema_keyname, [data]))[0]
+
+    @bisslog_exc_mapper_pymongo
+    def insert_many_into_store(self, schema_keyname: str, data: List[dict]) -> List[Hashable]:
+        if not data:
+            return []
+        return self._run(self._insert(schema_keyname, data))
+
+    @bisslog_exc_mapper_pymongo
+    def update_data_in_store(self, schema_keyname: str, data: dict,
+                             uid_data: Hashable) -> Optional[Hashable]:
+        object_id = self._object_id(uid_data)
+        if object_id is None:
+            return None
+        return uid_data if self._run(self._update(schema_keyname, object_id, data)) else None
+
+    @bisslog_exc_mapper_pymongo
+    def delete_data_from_store(self, schema_keyname: str, uid_data: Hashable) -> Optional[Hashable]:
+        object_id = self._object_id(uid_data)
+        if object_id is None:
+            return None
+        return uid_data if self._run(self._delete(schema_keyname, [object_id])) else None
+
+    @bisslog_exc_mapper_pymongo
+    def delete_many_from_store(self, schema_keyname: str, uids_data: List[Hashable]) -> int:
+        object_ids = [object_id for object_id in map(self._object_id, uids_data)
+                      if object_id is not None]
+        if not object_ids:
+            return 0
+        return self._run(self._delete(schema_keyname, object_ids))
+
+
+_ORDERED_TYPES = ["double", "int", "long", "decimal", "string"]
+
+
+def _field_path(field: str) -> str:
+    return "$_id" if field == "uid" else "$" + field
+
+
+def _from_mongo(value: Any) -> Any:
+    return str(value) if isinstance(value, ObjectId) else value
+
+
+def _utc(value: datetime) -> datetime:
+    # the drivers return naive datetimes in UTC unless configured to be tz aware
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
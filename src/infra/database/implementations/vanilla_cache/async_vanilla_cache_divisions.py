@@ -0,0 +1,164 @@
+"""
+Module for the asyncio adapters of the vanilla in-memory divisions.
+
+The vanilla divisions never wait on I/O, so their operations are run inline on the
+event loop instead of being offloaded to a thread pool, which would cost more than
+the operations themselves. Each adapter wraps a synchronous division, so the sync and
+async use cases can share the same data.
+"""
+import asyncio
+from typing import Hashable, Optional, List, AsyncIterator, Tuple
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_base import SchemaBase
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.async_schema_def_version_division import AsyncSchemaDefVersionDivision
+from src.infra.database.async_schema_division import AsyncSchemaDivision
+from src.infra.database.async_stores_division import AsyncStoresDivision
+from src.infra.database.implementations.vanilla_cache.schema_def_version_vanilla_cache_div import \
+    SchemaDefVersionVanillaCacheDiv
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+from src.infra.database.schema_def_version_division import SchemaDefVersionDivision
+from src.infra.database.schema_division import SchemaDivision
+
+
+class AsyncStoresVanillaCacheDivision(AsyncStoresDivision):
+    """
+    Asyncio adapter of a StoresVanillaCacheDivision.
+
+    Iterations give the event loop a chance to run other tasks after every
+    ``yield_every`` records.
+    """
+
+    yield_every = 1000
+
+    def __init__(self, division: Optional[StoresVanillaCacheDivision] = None):
+        """
+        Initialize the adapter.
+
+        Parameters
+        ----------
+        division : StoresVanillaCacheDivision, optional
+            The wrapped division. If None, a new one is created.
+        """
+        self.division = division if division is not None else StoresVanillaCacheDivision()
+
+    async def create_store_of_schema(self, schema: Schema) -> bool:
+        return self.division.create_store_of_schema(schema)
+
+    async def alter_store_of_schema(self, schema: Schema) -> bool:
+        return self.division.alter_store_of_schema(schema)
+
+    async def get_one_data_from_store(self, schema_keyname: str,
+                                      uid_data: Hashable) -> Optional[dict]:
+        return self.division.get_one_data_from_store(schema_keyname, uid_data)
+
+    async def get_data_from_store(self, schema_keyname: str, params: dict,
+                                  fields: Optional[List[str]] = None) -> List[dict]:
+        return self.division.get_data_from_store(schema_keyname, params, fields)
+
+    def iter_data_from_store(self, schema_keyname: str, params: dict,
+                             after: Optional[int] = None,
+                             fields: Optional[List[str]] = None
+                             ) -> AsyncIterator[Tuple[int, dict]]:
+        records = self.division.iter_data_from_store(schema_keyname, params, after, fields)
+        return self._iter_data_from_store(records)
+
+    async def _iter_data_from_store(self, records) -> AsyncIterator[Tuple[int, dict]]:
+        """Async generator behind `iter_data_from_store`."""
+        for i, record in enumerate(records, 1):
+            yield record
+            if not i % self.yield_every:
+                await asyncio.sleep(0)
+
+    async def insert_data_into_store(self, schema_keyname: str, data: dict) -> Hashable:
+        return self.division.insert_data_into_store(schema_keyname, data)
+
+    async def insert_many_into_store(self, schema_keyname: str,
+                                     data: List[dict]) -> List[Hashable]:
+        return self.division.insert_many_into_store(schema_keyname, data)
+
+    async def update_data_in_store(self, schema_keyname: str, data: dict,
+                                   uid_data: Hashable) -> Optional[Hashable]:
+        return self.division.update_data_in_store(schema_keyname, data, uid_data)
+
+    async def delete_data_from_store(self, schema_keyname: str,
+                                     uid_data: Hashable) -> Optional[Hashable]:
+        return self.division.delete_data_from_store(schema_keyname, uid_data)
+
+    async def delete_many_from_store(self, schema_keyname: str,
+                                     uids_data: List[Hashable]) -> int:
+        return self.division.delete_many_from_store(schema_keyname, uids_data)
+
+
+class AsyncSchemaVanillaCacheDivision(AsyncSchemaDivision):
+    """Asyncio adapter of a SchemaVanillaCacheDivision, or of any decorator around it."""
+
+    def __init__(self, division: Optional[SchemaDivision] = None):
+        """
+        Initialize the adapter.
+
+        Parameters
+        ----------
+        division : SchemaDivision, optional
+            The wrapped in-memory division. If None, a new SchemaVanillaCacheDivision
+            is created.
+        """
+        self.division = division if division is not None else SchemaVanillaCacheDivision()
+
+    async def get_schema(self, schema_keyname: str) -> Optional[Schema]:
+        return self.division.get_schema(schema_keyname)
+
+    async def get_schemas(self, params: dict) -> List[Schema]:
+        return self.division.get_schemas(params)
+
+    async def create_schema(self, schema: Schema) -> Hashable:
+        return self.division.create_schema(schema)
+
+    async def delete_schema(self, schema_keyname: str) -> Optional[Hashable]:
+        return self.division.delete_schema(schema_keyname)
+
+    async def update_schema(self, schema: SchemaBase) -> Optional[Hashable]:
+        return self.division.update_schema(schema)
+
+    async def update_schema_definition(self, schema_keyname: str, new_version: Hashable,
+                                       definition: dict) -> Optional[Hashable]:
+        return self.division.update_schema_definition(schema_keyname, new_version, definition)
+
+
+class AsyncSchemaDefVersionVanillaCacheDiv(AsyncSchemaDefVersionDivision):
+    """Asyncio adapter of a SchemaDefVersionVanillaCacheDiv."""
+
+    def __init__(self, division: Optional[SchemaDefVersionDivision] = None):
+        """
+        Initialize the adapter.
+
+        Parameters
+        ----------
+        division : SchemaDefVersionDivision, optional
+            The wrapped in-memory division. If None, a new SchemaDefVersionVanillaCacheDiv
+            is created.
+        """
+        self.division = division if division is not None else SchemaDefVersionVanillaCacheDiv()
+
+    async def create_schema_version(self, schema_version: SchemaDefinitionVersion) -> Hashable:
+        return self.division.create_schema_version(schema_version)
+
+    async def get_schema_version(self, uid: Hashable) -> Optional[SchemaDefinitionVersion]:
+        return self.division.get_schema_version(uid)
+
+    async def get_schema_versions(self, schema_keyname: str, limit: Optional[int] = None,
+                                  offset: int = 0) -> List[SchemaDefinitionVersion]:
+        return self.division.get_schema_versions(schema_keyname, limit, offset)
+
+    async def delete_schema_version(self, uid: Hashable) -> Optional[Hashable]:
+        return self.division.delete_schema_version(uid)
+
+    async def delete_inactive_schema_versions(self, schema_keyname: str,
+                                              current_version: Hashable,
+                                              days: int) -> List[Hashable]:
+        return self.division.delete_inactive_schema_versions(schema_keyname, current_version,
+                                                             days)
@@ -0,0 +1,92 @@
+"""
+Module for the change logs of the vanilla stores.
+
+Every insert, update and delete of a store is numbered with the next sequence
+number of the store and kept, with the record as it is after the change, so
+consumers can follow a store from a sequence number instead of reading it whole.
+Only the last ``retention`` changes are guaranteed to be kept.
+"""
+from typing import Hashable, List, Optional, Tuple
+
+
+class ChangeLog:
+    """Changes of one store numbered from 1, the oldest dropped beyond the retention."""
+
+    # logs restored from older snapshots have no epoch of their own
+    epoch = "0"
+
+    def __init__(self, retention: int, epoch: str = "0"):
+        """
+        Initialize an empty change log.
+
+        Parameters
+        ----------
+        retention : int
+            Number of most recent changes kept, 0 to keep none.
+        epoch : str
+            Identifier of the store the changes are numbered for, telling apart the
+            numbers of a store from the ones of a store created again.
+        """
+        if retention < 0:
+            raise ValueError("retention must not be negative")
+        self.retention = retention
+        self.epoch = epoch
+        self.last_seq = 0
+        self._changes: List[dict] = []
+
+    @property
+    def generation(self) -> str:
+        """Identifier of the current state of the store, changed by every change."""
+        return f"{self.epoch}-{self.last_seq}"
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest change kept, the next one if none is kept."""
+        return self.last_seq - len(self._changes) + 1
+
+    def append(self, op: str, uid: Hashable, data: Optional[dict]) -> int:
+        """
+        Number and keep a change.
+
+        Parameters
+        ----------
+        op : str
+            The operation, ``insert``, ``update`` or ``delete``.
+        uid : Hashable
+            The unique identifier of the changed record.
+        data : dict, optional
+            The record after the change, None for deletions. It is kept as given.
+
+        Returns
+        -------
+        int
+            The sequence number of the change.
+        """
+        self.last_seq += 1
+        self._changes.append({"seq": self.last_seq, "op": op, "uid": uid, "data": data})
+        # trimmed by chunks, so the list is not shifted on every append
+        if len(self._changes) > self.retention + max(self.retention // 4, 1):
+            del self._changes[:len(self._changes) - self.retention]
+        return self.last_seq
+
+    def read(self, after: int, limit: int) -> Tuple[List[dict], bool]:
+        """
+        Get the changes following a sequence number.
+
+        Parameters
+        ----------
+        after : int
+            The sequence number of the last change already seen.
+        limit : int
+            Maximum number of changes returned.
+
+        Returns
+        -------
+        tuple of (list of dict, bool)
+            The changes in order, and whether some changes following ``after`` are
+            no longer kept, or ``after`` is unknown, in which case none is returned.
+        """
+        if after > self.last_seq or after < self.first_seq - 1:
+            return [], True
+        start = after - self.first_seq + 1
+        return [dict(change) for change in self._changes[start:start + limit]], False
@@ -0,0 +1,335 @@
+"""
+Module for the columnar record layout of the vanilla stores.
+
+Keeping every record as its own dict costs a hash table and a set of key references
+per record. For millions of small records of the same schema, this layout keeps one
+typed column per top-level property instead, derived from the ``type`` declared in
+the schema's ``properties``:
+
+- ``number`` and ``integer`` values go in `array` columns of doubles and 64-bit ints.
+- ``boolean`` values take one byte per record.
+- ``string`` values and string ``enum`` values are dictionary-encoded, each distinct
+  value being kept once. A string column whose number of distinct values outgrows
+  ``dictionary_limit`` is turned into a plain column of references.
+
+Values not fitting their column, properties with any other type and fields absent
+from the schema spill into a per-record side dict, so every record is kept as given.
+"""
+from array import array
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+LAYOUT_KEYWORD = "x-layout"
+DICT_LAYOUT = "dict"
+COLUMNAR_LAYOUT = "columnar"
+LAYOUTS = (DICT_LAYOUT, COLUMNAR_LAYOUT)
+
+_MISSING = object()
+_INT_RANGE = (-2 ** 63, 2 ** 63 - 1)
+_EXACT_FLOAT_INT = 2 ** 53
+
+
+def column_kinds(definition: dict) -> Dict[str, str]:
+    """
+    Derive the column kind of every top-level property of a schema definition.
+
+    Parameters
+    ----------
+    definition : dict
+        The JSON schema definition of the records.
+
+    Returns
+    -------
+    dict of str to str
+        The kind of each property with a typed column: ``number``, ``integer``,
+        ``boolean`` or ``string``. Other properties are left out and spill.
+    """
+    kinds = {}
+    for name, subschema in (definition.get("properties") or {}).items():
+        if not isinstance(subschema, dict) or name == "uid":
+            continue
+        enum = subschema.get("enum")
+        if isinstance(enum, list) and enum and all(isinstance(v, str) for v in enum):
+            kinds[name] = "string"
+        elif subschema.get("type") in ("number", "integer", "boolean", "string"):
+            kinds[name] = subschema["type"]
+    return kinds
+
+
+def _is_int(value: Any) -> bool:
+    """Check whether a value is an int, booleans excluded."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class _NumberColumn:
+    """Doubles with a tag per record: 0 absent, 1 float, 2 int stored exactly."""
+
+    __slots__ = ("values", "tags")
+
+    def __init__(self):
+        self.values = array("d")
+        self.tags = bytearray()
+
+    def append_empty(self) -> None:
+        self.values.append(0.0)
+        self.tags.append(0)
+
+    def set(self, row: int, value: Any) -> bool:
+        if isinstance(value, float):
+            self.values[row] = value
+            self.tags[row] = 1
+            return True
+        if _is_int(value) and -_EXACT_FLOAT_INT <= value <= _EXACT_FLOAT_INT:
+            self.values[row] = value
+            self.tags[row] = 2
+            return True
+        self.tags[row] = 0
+        return False
+
+    def get(self, row: int) -> Any:
+        tag = self.tags[row]
+        if tag == 1:
+            return self.values[row]
+        if tag == 2:
+            return int(self.values[row])
+        return _MISSING
+
+    def clear(self, row: int) -> None:
+        self.tags[row] = 0
+
+
+class _IntegerColumn:
+    """64-bit integers with a presence byte per record."""
+
+    __slots__ = ("values", "tags")
+
+    def __init__(self):
+        self.values = array("q")
+        self.tags = bytearray()
+
+    def append_empty(self) -> None:
+        self.values.append(0)
+        self.tags.append(0)
+
+    def set(self, row: int, value: Any) -> bool:
+        if _is_int(value) and _INT_RANGE[0] <= value <= _INT_RANGE[1]:
+            self.values[row] = value
+            self.tags[row] = 1
+            return True
+        self.tags[row] = 0
+        return False
+
+    def get(self, row: int) -> Any:
+        return self.values[row] if self.tags[row] else _MISSING
+
+    def clear(self, row: int) -> None:
+        self.tags[row] = 0
+
+
+class _BooleanColumn:
+    """One byte per record: 0 absent, 1 False, 2 True."""
+
+    __slots__ = ("tags",)
+
+    def __init__(self):
+        self.tags = bytearray()
+
+    def append_empty(self) -> None:
+        self.tags.append(0)
+
+    def set(self, row: int, value: Any) -> bool:
+        if isinstance(value, bool):
+            self.tags[row] = 2 if value else 1
+            return True
+        self.tags[row] = 0
+        return False
+
+    def get(self, row: int) -> Any:
+        tag = self.tags[row]
+        return _MISSING if tag == 0 else tag == 2
+
+    def clear(self, row: int) -> None:
+        self.tags[row] = 0
+
+
+class _StringColumn:
+    """Dictionary-encoded strings, code 0 being absent.
+
+    Once more than ``dictionary_limit`` distinct values are seen, the codes are
+    replaced by a plain list of references, None being absent.
+    """
+
+    __slots__ = ("codes", "dictionary", "code_of", "plain", "dictionary_limit")
+
+    def __init__(self, dictionary_limit: int):
+        self.codes: Optional[array] = array("I")
+        self.dictionary: List[Optional[str]] = [None]
+        self.code_of: Dict[str, int] = {}
+        self.plain: Optional[List[Optional[str]]] = None
+        self.dictionary_limit = dictionary_limit
+
+    def append_empty(self) -> None:
+        if self.plain is not None:
+            self.plain.append(None)
+        else:
+            self.codes.append(0)
+
+    def set(self, row: int, value: Any) -> bool:
+        if not isinstance(value, str):
+            self.clear(row)
+            return False
+        if self.plain is not None:
+            self.plain[row] = value
+            return True
+        code = self.code_of.get(value)
+        if code is None:
+            if len(self.dictionary) > self.dictionary_limit:
+                self._to_plain()
+                self.plain[row] = value
+                return True
+            code = self.code_of[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.codes[row] = code
+        return True
+
+    def get(self, row: int) -> Any:
+        if self.plain is not None:
+            value = self.plain[row]
+            return _MISSING if value is None else value
+        code = self.codes[row]
+        return self.dictionary[code] if code else _MISSING
+
+    def clear(self, row: int) -> None:
+        if self.plain is not None:
+            self.plain[row] = None
+        else:
+            self.codes[row] = 0
+
+    def _to_plain(self) -> None:
+        dictionary = self.dictionary
+        self.plain = [dictionary[code] for code in self.codes]
+        self.codes = None
+        self.dictionary = [None]
+        self.code_of = {}
+
+
+_COLUMN_TYPES = {"number": _NumberColumn, "integer": _IntegerColumn, "boolean": _BooleanColumn}
+
+
+class ColumnarTable:
+    """
+    Records of one store kept column by column, read and written as dicts.
+
+    It behaves as the ``uid`` to record mapping used by the dict layout, so the
+    division code is shared by both layouts. Records are rebuilt on every read,
+    hence mutating a returned record does not change the stored one.
+    Rows of deleted records are reused by later inserts.
+    """
+
+    def __init__(self, kinds: Dict[str, str], dictionary_limit: int = 4096):
+        """
+        Initialize an empty table.
+
+        Parameters
+        ----------
+        kinds : dict of str to str
+            The kind of the column of each property, as given by `column_kinds`.
+        dictionary_limit : int
+            Number of distinct values after which a string column stops being
+            dictionary-encoded.
+        """
+        self.kinds = dict(kinds)
+        self._columns: List[Tuple[str, Any]] = [
+            (name, _StringColumn(dictionary_limit) if kind == "string"
+             else _COLUMN_TYPES[kind]()) for name, kind in self.kinds.items()]
+        self._column_names = frozenset(self.kinds)
+        self._uids: List[Optional[Hashable]] = []
+        self._row_of: Dict[Hashable, int] = {}
+        self._spill: Dict[int, dict] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, uid: Hashable) -> bool:
+        return uid in self._row_of
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._row_of))
+
+    def __getitem__(self, uid: Hashable) -> dict:
+        return self._read(self._row_of[uid])
+
+    def get(self, uid: Hashable, default: Any = None) -> Any:
+        """Get the record of a uid, ``default`` if it is not stored."""
+        row = self._row_of.get(uid)
+        return default if row is None else self._read(row)
+
+    def __setitem__(self, uid: Hashable, record: dict) -> None:
+        row = self._row_of.get(uid)
+        if row is None:
+            row = self._allocate()
+            self._row_of[uid] = row
+            self._uids[row] = uid
+        self._write(row, record)
+
+    def pop(self, uid: Hashable, *default: Any) -> Any:
+        """Remove the record of a uid and return it."""
+        row = self._row_of.pop(uid, None)
+        if row is None:
+            if default:
+                return default[0]
+            raise KeyError(uid)
+        record = self._read_row(row, uid)
+        for _, column in self._columns:
+            column.clear(row)
+        self._spill.pop(row, None)
+        self._uids[row] = None
+        self._free.append(row)
+        return record
+
+    def values(self) -> Iterator[dict]:
+        """Rebuild every stored record."""
+        return (self._read(row) for row in list(self._row_of.values()))
+
+    def items(self) -> Iterator[Tuple[Hashable, dict]]:
+        """Rebuild every stored record along with its uid."""
+        return ((uid, self._read_row(row, uid)) for uid, row in list(self._row_of.items()))
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        for _, column in self._columns:
+            column.append_empty()
+        self._uids.append(None)
+        return len(self._uids) - 1
+
+    def _write(self, row: int, record: dict) -> None:
+        spill = {}
+        for name, column in self._columns:
+            value = record.get(name, _MISSING)
+            if value is _MISSING:
+                column.clear(row)
+            elif not column.set(row, value):
+                spill[name] = value
+        names = self._column_names
+        for name, value in record.items():
+            if name not in names and name != "uid":
+                spill[name] = value
+        if spill:
+            self._spill[row] = spill
+        else:
+            self._spill.pop(row, None)
+
+    def _read(self, row: int) -> dict:
+        return self._read_row(row, self._uids[row])
+
+    def _read_row(self, row: int, uid: Hashable) -> dict:
+        record = {"uid": uid}
+        for name, column in self._columns:
+            value = column.get(row)
+            if value is not _MISSING:
+                record[name] = value
+        spill = self._spill.get(row)
+        if spill:
+            record.update(spill)
+        return record
@@ -0,0 +1,120 @@
+"""
+Module for the insertion order tracking of the vanilla stores.
+
+Every record of a store gets a monotonically increasing sequence number when it is
+inserted, so reads can be resumed after a given position without being affected by
+records inserted in the meantime.
+"""
+from bisect import bisect_right
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class InsertionOrder:
+    """Sequence numbers of the records of one store, in insertion order.
+
+    Removed records leave a hole that is skipped while iterating; the holes are
+    compacted away once they are the majority of the tracked positions.
+    """
+
+    compact_threshold = 1024
+
+    def __init__(self):
+        self._seqs: List[int] = []
+        self._uids: List[Hashable] = []
+        self._seq_of: Dict[Hashable, int] = {}
+        self._next_seq = 1
+        self._removed = 0
+
+    def add(self, uid: Hashable) -> int:
+        """Assign the next sequence number to a record.
+
+        Parameters
+        ----------
+        uid : Hashable
+            The unique identifier of the inserted record.
+
+        Returns
+        -------
+        int
+            The sequence number of the record.
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs.append(seq)
+        self._uids.append(uid)
+        self._seq_of[uid] = seq
+        return seq
+
+    def remove(self, uid: Hashable) -> None:
+        """Forget the sequence number of a removed record.
+
+        Parameters
+        ----------
+        uid : Hashable
+            The unique identifier of the removed record.
+        """
+        if self._seq_of.pop(uid, None) is None:
+            return
+        self._removed += 1
+        if self._removed > self.compact_threshold and self._removed * 2 > len(self._seqs):
+            self._compact()
+
+    def seq_of(self, uid: Hashable) -> Optional[int]:
+        """Get the sequence number of a record, None if it is not tracked."""
+        return self._seq_of.get(uid)
+
+    def iter_after(self, after: Optional[int] = None) -> Iterator[Tuple[int, Hashable]]:
+        """Iterate over the live records inserted after a sequence number.
+
+        Records inserted while iterating are also visited.
+
+        Parameters
+        ----------
+        after : int, optional
+            The sequence number to start after. If None, starts from the beginning.
+
+        Yields
+        ------
+        tuple of (int, Hashable)
+            The sequence number and the unique identifier of each record.
+        """
+        seqs, uids, seq_of = self._seqs, self._uids, self._seq_of
+        i = 0 if after is None else bisect_right(seqs, after)
+        while i < len(seqs):
+            uid = uids[i]
+            if seq_of.get(uid) == seqs[i]:
+                yield seqs[i], uid
+            i += 1
+
+    def sort_after(self, uids: Iterable[Hashable],
+                   after: Optional[int] = None) -> List[Tuple[int, Hashable]]:
+        """Order a subset of records by sequence number, keeping those after a position.
+
+        Parameters
+        ----------
+        uids : iterable of Hashable
+            The unique identifiers of the records to be ordered.
+        after : int, optional
+            The sequence number to start after. If None, every record is kept.
+
+        Returns
+        -------
+        list of tuple of (int, Hashable)
+            The sequence number and the unique identifier of each kept record.
+        """
+        seq_of = self._seq_of
+        lower = 0 if after is None else after
+        res = [(seq_of[uid], uid) for uid in uids if seq_of.get(uid, 0) > lower]
+        res.sort()
+        return res
+
+    def _compact(self) -> None:
+        """Rebuild the positions without the removed records.
+
+        New lists are created so iterators over the previous ones are not disturbed.
+        """
+        seq_of = self._seq_of
+        kept = [(seq, uid) for seq, uid in zip(self._seqs, self._uids) if seq_of.get(uid) == seq]
+        self._seqs = [seq for seq, _ in kept]
+        self._uids = [uid for _, uid in kept]
+        self._removed = 0
@@ -0,0 +1,68 @@
+from contextlib import AbstractContextManager
+from typing import Optional, Dict
+
+from src.infra.database.implementations.vanilla_cache.locking import NULL_LOCK, ReadWriteLock
+from src.infra.database.implementations.vanilla_cache.persistence import (
+    PersistentDivisionMixin, VanillaPersistence)
+from src.infra.database.job_checkpoint_division import JobCheckpointDivision
+
+
+class JobCheckpointVanillaCacheDivision(PersistentDivisionMixin, JobCheckpointDivision):
+    """
+    In-memory implementation of the JobCheckpointDivision interface.
+
+    Checkpoints only survive a restart when a `VanillaPersistence` is given.
+    """
+
+    def __init__(self, persistence: Optional[VanillaPersistence] = None,
+                 thread_safe: bool = False):
+        """
+        Initialize the in-memory store for job checkpoints.
+
+        Parameters
+        ----------
+        persistence : VanillaPersistence, optional
+            Snapshot and log files to restore from and write to. If None, the
+            checkpoints are not durable.
+        thread_safe : bool
+            Whether the checkpoints are protected by a read-write lock, to be used
+            from several threads.
+        """
+        self._checkpoints: Dict[str, dict] = {}
+        self._lock = ReadWriteLock() if thread_safe else NULL_LOCK
+        self._restore(persistence)
+
+    def _dump_state(self) -> Dict[str, dict]:
+        return self._checkpoints
+
+    def _load_state(self, state: Dict[str, dict]) -> None:
+        self._checkpoints = state
+
+    def _locked_for_snapshot(self) -> AbstractContextManager:
+        return self._lock.write()
+
+    def get_checkpoint(self, job_name: str) -> Optional[dict]:
+        with self._lock.read():
+            progress = self._checkpoints.get(job_name)
+            return dict(progress) if progress is not None else None
+
+    def save_checkpoint(self, job_name: str, progress: dict) -> None:
+        with self._lock.write():
+            self._apply_save(job_name, dict(progress))
+            self._log("save", job_name, dict(progress))
+        self._checkpoint_if_due()
+
+    def _apply_save(self, job_name: str, progress: dict) -> None:
+        self._checkpoints[job_name] = progress
+
+    def delete_checkpoint(self, job_name: str) -> bool:
+        with self._lock.write():
+            if job_name not in self._checkpoints:
+                return False
+            self._apply_delete(job_name)
+            self._log("delete", job_name)
+        self._checkpoint_if_due()
+        return True
+
+    def _apply_delete(self, job_name: str) -> None:
+        self._checkpoints.pop(job_name, None)
@@ -0,0 +1,153 @@
+"""
+Module for the locks of the thread-safe mode of the vanilla cache divisions.
+
+Reads take a shared lock and writes an exclusive one, striped by key so operations
+on different stores never wait for each other. When the thread-safe mode is off, the
+no-op `NullReadWriteLock` keeps the same code paths at almost no cost.
+"""
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Dict, Hashable, Iterator, List
+
+
+class ReadWriteLock:
+    """Lock shared by readers and exclusive for writers, preferring waiting writers.
+
+    Not reentrant: a thread holding the lock must not acquire it again.
+    """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """Wait until no writer holds or waits for the lock and take a shared hold."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """Release a shared hold."""
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Wait until nobody holds the lock and take the exclusive hold."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        """Release the exclusive hold."""
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Context manager holding the lock in shared mode."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Context manager holding the lock in exclusive mode."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class NullReadWriteLock:
+    """Read-write lock interface that does not lock, for the single-threaded mode."""
+
+    class _NullContext:
+        def __enter__(self):
+            return None
+
+        def __exit__(self, *exc_info):
+            return False
+
+    _context = _NullContext()
+
+    def read(self):
+        """No-op shared hold."""
+        return self._context
+
+    def write(self):
+        """No-op exclusive hold."""
+        return self._context
+
+
+NULL_LOCK = NullReadWriteLock()
+
+
+class StripedLocks:
+    """One read-write lock per key, created on first use."""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, ReadWriteLock] = {}
+        self._mutex = Lock()
+
+    def for_key(self, key: Hashable) -> ReadWriteLock:
+        """Get the lock of a key.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key whose lock is requested, e.g. a schema keyname.
+
+        Returns
+        -------
+        ReadWriteLock
+            The lock of the key.
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._mutex:
+                lock = self._locks.setdefault(key, ReadWriteLock())
+        return lock
+
+    @contextmanager
+    def write_all(self) -> Iterator[None]:
+        """Context manager holding every lock in exclusive mode.
+
+        No new key lock can be created while it is held.
+        """
+        with self._mutex:
+            locks: List[ReadWriteLock] = list(self._locks.values())
+            acquired = []
+            try:
+                for lock in locks:
+                    lock.acquire_write()
+                    acquired.append(lock)
+                yield
+            finally:
+                for lock in reversed(acquired):
+                    lock.release_write()
+
+
+class NullStripedLocks:
+    """Striped locks interface that does not lock, for the single-threaded mode."""
+
+    @staticmethod
+    def for_key(key: Hashable) -> NullReadWriteLock:  # pylint: disable=unused-argument
+        """Get the no-op lock of any key."""
+        return NULL_LOCK
+
+    @staticmethod
+    def write_all():
+        """No-op exclusive hold of every key."""
+        return NULL_LOCK.write()
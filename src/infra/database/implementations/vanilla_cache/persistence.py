@@ -0,0 +1,203 @@
+"""
+Module for the optional durability of the vanilla cache divisions.
+
+Every mutation of a division is appended to a write-ahead log (WAL) and, from time
+to time, the whole state of the division is written as a compacted snapshot and the
+log is truncated. On startup the snapshot is read through a memory map and only the
+log entries written after it are replayed.
+"""
+import mmap
+import os
+import pickle
+from contextlib import AbstractContextManager
+from threading import Lock
+from typing import Any, Iterator, Optional, Tuple
+
+from src.infra.database.implementations.vanilla_cache.locking import NULL_LOCK
+
+SNAPSHOT_FORMAT = 1
+
+
+class VanillaPersistence:
+    """Snapshot plus write-ahead log files of one division.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the files are kept, created if missing.
+    name : str
+        Name of the division, used as the prefix of its files.
+    snapshot_every : int
+        Number of logged mutations after which a snapshot is due. If 0, snapshots
+        are only taken explicitly.
+    fsync : bool
+        Whether every logged mutation is flushed to disk with ``os.fsync``. If False,
+        mutations survive a process crash but not an operating system crash.
+    """
+
+    def __init__(self, directory: str, name: str, snapshot_every: int = 100_000,
+                 fsync: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        self.wal_path = os.path.join(directory, f"{name}.wal")
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lsn = 0
+        self._pending = 0
+        self._wal = None
+        self._lock = Lock()
+
+    def load(self) -> Tuple[Optional[Any], Iterator[Tuple[str, tuple]]]:
+        """Read the last snapshot and the log entries written after it.
+
+        Must be called once, before anything is logged.
+
+        Returns
+        -------
+        tuple
+            The state stored in the snapshot (None if there is none) and an iterator
+            over the ``(operation, arguments)`` entries to be replayed on top of it.
+        """
+        state = None
+        snapshot_lsn = 0
+        if os.path.exists(self.snapshot_path) and os.path.getsize(self.snapshot_path) > 0:
+            with open(self.snapshot_path, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                snapshot = pickle.loads(mapped)
+            if snapshot.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"unsupported snapshot format in {self.snapshot_path}")
+            state = snapshot["state"]
+            snapshot_lsn = snapshot["lsn"]
+        self._lsn = snapshot_lsn
+        return state, self._replay(snapshot_lsn)
+
+    def _replay(self, snapshot_lsn: int) -> Iterator[Tuple[str, tuple]]:
+        """Yield the log entries after the snapshot, dropping a torn last entry."""
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, "r+b") as file:
+                valid_until = 0
+                while True:
+                    try:
+                        lsn, operation, args = pickle.load(file)
+                    except EOFError:
+                        break
+                    except (pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+                        break
+                    valid_until = file.tell()
+                    self._lsn = max(self._lsn, lsn)
+                    if lsn > snapshot_lsn:
+                        self._pending += 1
+                        yield operation, args
+                file.truncate(valid_until)
+        self._wal = open(self.wal_path, "ab")
+
+    @property
+    def snapshot_due(self) -> bool:
+        """Whether ``snapshot_every`` mutations were logged since the last snapshot."""
+        return bool(self.snapshot_every) and self._pending >= self.snapshot_every
+
+    def append(self, operation: str, *args) -> None:
+        """Log a mutation. Safe to be called from several threads.
+
+        Parameters
+        ----------
+        operation : str
+            Name of the mutation, replayed by the division.
+        *args
+            Picklable arguments of the mutation.
+        """
+        with self._lock:
+            if self._wal is None:
+                self._wal = open(self.wal_path, "ab")
+            self._lsn += 1
+            pickle.dump((self._lsn, operation, args), self._wal,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+            self._pending += 1
+
+    def snapshot(self, state: Any) -> None:
+        """Write a compacted snapshot of the state and truncate the log.
+
+        The snapshot is written to a temporary file and atomically renamed, and it
+        records the last logged mutation, so a crash before the log is truncated
+        does not replay the mutations twice. The caller must keep the state from
+        being mutated meanwhile.
+
+        Parameters
+        ----------
+        state : Any
+            Picklable state of the division.
+        """
+        with self._lock:
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as file:
+                pickle.dump({"format": SNAPSHOT_FORMAT, "lsn": self._lsn, "state": state},
+                            file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self._wal is not None:
+                self._wal.close()
+            self._wal = open(self.wal_path, "wb")
+            self._pending = 0
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+
+class PersistentDivisionMixin:
+    """Durability support for the vanilla divisions.
+
+    Divisions using it implement ``_dump_state``/``_load_state`` and one
+    ``_apply_<operation>`` method per logged mutation, call `_restore` at the end of
+    their initialization, `_log` after each successful mutation and
+    `_checkpoint_if_due` once the locks of the mutation are released. Thread-safe
+    divisions override `_locked_for_snapshot` to stop every mutation while the
+    snapshot is written.
+    """
+
+    _persistence: Optional[VanillaPersistence] = None
+
+    def _restore(self, persistence: Optional[VanillaPersistence]) -> None:
+        """Load the snapshot and replay the log tail of the given persistence."""
+        self._persistence = persistence
+        if persistence is None:
+            return
+        state, entries = persistence.load()
+        if state is not None:
+            self._load_state(state)
+        for operation, args in entries:
+            getattr(self, "_apply_" + operation)(*args)
+
+    def _log(self, operation: str, *args) -> None:
+        """Append a mutation to the log, if durability is enabled."""
+        if self._persistence is not None:
+            self._persistence.append(operation, *args)
+
+    def _checkpoint_if_due(self) -> None:
+        """Write a snapshot if enough mutations were logged since the last one."""
+        if self._persistence is not None and self._persistence.snapshot_due:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write a snapshot of the division now, if durability is enabled."""
+        if self._persistence is None:
+            return
+        with self._locked_for_snapshot():
+            self._persistence.snapshot(self._dump_state())
+
+    def _locked_for_snapshot(self) -> AbstractContextManager:
+        """Context manager stopping every mutation of the division."""
+        return NULL_LOCK.write()
+
+    def _dump_state(self) -> Any:
+        raise NotImplementedError
+
+    def _load_state(self, state: Any) -> None:
+        raise NotImplementedError
@@ -1,23 +1,52 @@
+from bisect import bisect_left, insort
 from collections.abc import Hashable
+from contextlib import AbstractContextManager
 from datetime import timedelta, datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import uuid
 
 from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.implementations.vanilla_cache.locking import NULL_LOCK, ReadWriteLock
+from src.infra.database.implementations.vanilla_cache.persistence import (
+    PersistentDivisionMixin, VanillaPersistence)
 from src.infra.database.schema_def_version_division import SchemaDefVersionDivision
 
 
-class SchemaDefVersionVanillaCacheDiv(SchemaDefVersionDivision):
+class SchemaDefVersionVanillaCacheDiv(PersistentDivisionMixin, SchemaDefVersionDivision):
 
     """
     In-memory implementation of the SchemaDefVersionDivision interface.
 
     This class manages schema definition versions using Python dictionaries,
     providing a simple cache mechanism for testing or non-persistent use cases.
+
+    The versions of each schema are also kept as ``(created_at, uid)`` entries
+    sorted by creation date, so listing them only visits the requested ones and
+    pruning the old ones is a bisect plus a slice.
     """
 
-    def __init__(self):
+    def __init__(self, persistence: Optional[VanillaPersistence] = None,
+                 thread_safe: bool = False):
         self._schema_versions : Dict[Hashable, SchemaDefinitionVersion] = {}
+        self._by_keyname: Dict[str, List[Tuple[datetime, Hashable]]] = {}
+        self._lock = ReadWriteLock() if thread_safe else NULL_LOCK
+        self._restore(persistence)
+
+    def _dump_state(self) -> Dict[Hashable, SchemaDefinitionVersion]:
+        return self._schema_versions
+
+    def _load_state(self, state: Dict[Hashable, SchemaDefinitionVersion]) -> None:
+        self._schema_versions = state
+        self._by_keyname = {}
+        for uid, version in state.items():
+            version.schema_version_id = uid
+            self._by_keyname.setdefault(version.schema_keyname, []).append(
+                (version.created_at, uid))
+        for entries in self._by_keyname.values():
+            entries.sort()
+
+    def _locked_for_snapshot(self) -> AbstractContextManager:
+        return self._lock.write()
 
 
 
@@ -36,10 +65,22 @@ class SchemaDefVersionVanillaCacheDiv(SchemaDefVersionDivision):
             The unique identifier of the created schema version.
         """
         uid = str(uuid.uuid4())
-        schema_version.schema_id = uid
-        self._schema_versions[uid] = schema_version
+        schema_version.schema_version_id = uid
+        with self._lock.write():
+            self._apply_create(uid, schema_version)
+            self._log("create", uid, schema_version)
+        self._checkpoint_if_due()
         return uid
 
+    def _apply_create(self, uid: Hashable, schema_version: SchemaDefinitionVersion) -> None:
+        self._schema_versions[uid] = schema_version
+        entries = self._by_keyname.setdefault(schema_version.schema_keyname, [])
+        entry = (schema_version.created_at, uid)
+        if not entries or entries[-1] < entry:
+            entries.append(entry)
+        else:
+            insort(entries, entry)
+
     def get_schema_version(self, uid: Hashable) -> Optional[SchemaDefinitionVersion]:
         """
         Retrieve a schema version by its unique identifier.
@@ -54,25 +95,34 @@ class SchemaDefVersionVanillaCacheDiv(SchemaDefVersionDivision):
         Optional[SchemaDefinitionVersion]
             The schema version instance if found, otherwise None.
         """
-        return self._schema_versions.get(uid)
+        with self._lock.read():
+            return self._schema_versions.get(uid)
 
-    def get_schema_versions(self, schema_keyname: str) -> List[SchemaDefinitionVersion]:
+    def get_schema_versions(self, schema_keyname: str, limit: Optional[int] = None,
+                            offset: int = 0) -> List[SchemaDefinitionVersion]:
         """
-        List all versions of a specific schema.
+        List all versions of a specific schema, oldest first.
 
         Parameters
         ----------
         schema_keyname : str
             The keyname of the schema whose versions are to be listed.
+        limit : int, optional
+            Maximum number of versions to be listed. If None, all of them are listed.
+        offset : int
+            Number of versions to be skipped.
 
         Returns
         -------
         List[SchemaDefinitionVersion]
             List of schema version instances for the specified schema.
         """
-        return [v for v in self._schema_versions.values() if v.schema_keyname == schema_keyname]
+        with self._lock.read():
+            entries = self._by_keyname.get(schema_keyname, [])
+            entries = entries[offset:] if limit is None else entries[offset:offset + limit]
+            return [self._schema_versions[uid] for _, uid in entries]
 
-    def delete_schema_version(self, uid: Hashable) -> Hashable:
+    def delete_schema_version(self, uid: Hashable) -> Optional[Hashable]:
         """
         Delete a specific schema version from the cache.
 
@@ -83,10 +133,28 @@ class SchemaDefVersionVanillaCacheDiv(SchemaDefVersionDivision):
 
         Returns
         -------
-        Hashable
-            The unique identifier of the deleted schema version.
+        Optional[Hashable]
+            The unique identifier of the deleted schema version, or None if not found.
         """
-        return self._schema_versions.pop(uid)
+        with self._lock.write():
+            if uid not in self._schema_versions:
+                return None
+            self._apply_delete([uid])
+            self._log("delete", [uid])
+        self._checkpoint_if_due()
+        return uid
+
+    def _apply_delete(self, uids: List[Hashable]) -> None:
+        for uid in uids:
+            version = self._schema_versions.pop(uid, None)
+            if version is None:
+                continue
+            entries = self._by_keyname[version.schema_keyname]
+            i = bisect_left(entries, (version.created_at, uid))
+            if i < len(entries) and entries[i][1] == uid:
+                del entries[i]
+            if not entries:
+                del self._by_keyname[version.schema_keyname]
 
     def delete_inactive_schema_versions(self, schema_keyname: str,
                                         current_version: Hashable, days: int) -> List[Hashable]:
@@ -106,10 +174,30 @@ class SchemaDefVersionVanillaCacheDiv(SchemaDefVersionDivision):
         List[Hashable]
             List of unique identifiers of the deleted schema versions.
         """
-        deleted_uids = []
-        for uid, version in list(self._schema_versions.items()):
-            if (version.schema_keyname == schema_keyname and uid != current_version and
-                    version.created_at < (datetime.now() - timedelta(days=days))):
-                deleted_uids.append(uid)
-                del self._schema_versions[uid]
+        with self._lock.write():
+            deleted_uids = self._prune_older_than(schema_keyname, current_version,
+                                                  datetime.now() - timedelta(days=days))
+            if deleted_uids:
+                self._log("delete", deleted_uids)
+        self._checkpoint_if_due()
+        return deleted_uids
+
+    def _prune_older_than(self, schema_keyname: str, current_version: Hashable,
+                     older_than: datetime) -> List[Hashable]:
+        """Remove the versions of a schema created before a date, except the current one.
+
+        Logged by the caller as a ``delete`` of the removed uids, since the date
+        depends on when the pruning was made.
+        """
+        entries = self._by_keyname.get(schema_keyname)
+        if not entries:
+            return []
+        end = bisect_left(entries, (older_than,))
+        deleted_uids = [uid for _, uid in entries[:end] if uid != current_version]
+        kept = [entry for entry in entries[:end] if entry[1] == current_version]
+        entries[:end] = kept
+        for uid in deleted_uids:
+            del self._schema_versions[uid]
+        if not entries:
+            del self._by_keyname[schema_keyname]
         return deleted_uids
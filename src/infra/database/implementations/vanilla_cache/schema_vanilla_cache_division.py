@@ -6,27 +6,56 @@ management using Python dictionaries as in-memory stores.
 """
 
 import uuid
+from bisect import bisect_right, insort
+from contextlib import AbstractContextManager
 from typing import Optional, List, Dict, Hashable
 
 from src.domain.model.schema import Schema
 from src.domain.model.schema_base import SchemaBase
+from src.infra.database.implementations.vanilla_cache.locking import NULL_LOCK, ReadWriteLock
+from src.infra.database.implementations.vanilla_cache.persistence import (
+    PersistentDivisionMixin, VanillaPersistence)
 from src.infra.database.schema_division import SchemaDivision
 
 
-class SchemaVanillaCacheDivision(SchemaDivision):
+class SchemaVanillaCacheDivision(PersistentDivisionMixin, SchemaDivision):
     """
     In-memory implementation of the SchemaDivision interface.
 
     This class manages schemas and schema versions using Python dictionaries,
     providing a simple cache mechanism for testing or non-persistent use cases.
+    The keynames are also kept sorted, so a page of schemas is a bisect plus a slice.
     """
 
 
-    def __init__(self):
+    def __init__(self, persistence: Optional[VanillaPersistence] = None,
+                 thread_safe: bool = False):
         """
         Initialize the in-memory stores for schemas and schema versions.
+
+        Parameters
+        ----------
+        persistence : VanillaPersistence, optional
+            Snapshot and log files to restore from and write to. If None, the schemas
+            are not durable.
+        thread_safe : bool
+            Whether the schemas are protected by a read-write lock, to be used from
+            several threads.
         """
         self._schemas : Dict[str, Schema] = {}
+        self._keynames: List[str] = []
+        self._lock = ReadWriteLock() if thread_safe else NULL_LOCK
+        self._restore(persistence)
+
+    def _dump_state(self) -> Dict[str, Schema]:
+        return self._schemas
+
+    def _load_state(self, state: Dict[str, Schema]) -> None:
+        self._schemas = state
+        self._keynames = sorted(state)
+
+    def _locked_for_snapshot(self) -> AbstractContextManager:
+        return self._lock.write()
 
     def get_schema(self, schema_keyname: str) -> Optional[Schema]:
         """
@@ -42,7 +71,8 @@ class SchemaVanillaCacheDivision(SchemaDivision):
         Optional[Schema]
             The schema instance if found, otherwise None.
         """
-        return self._schemas.get(schema_keyname)
+        with self._lock.read():
+            return self._schemas.get(schema_keyname)
 
     def get_schemas(self, params: dict) -> List[Schema]:
         """
@@ -58,7 +88,30 @@ class SchemaVanillaCacheDivision(SchemaDivision):
         List[Schema]
             List of all schema instances in the cache.
         """
-        return list(self._schemas.values())
+        with self._lock.read():
+            return list(self._schemas.values())
+
+    def get_schemas_page(self, after: Optional[str] = None, limit: int = 100) -> List[Schema]:
+        """
+        List schemas ordered by keyname, one page at a time.
+
+        Parameters
+        ----------
+        after : str, optional
+            The keyname of the last schema of the previous page. If None, starts
+            from the first schema.
+        limit : int
+            Maximum number of schemas of the page.
+
+        Returns
+        -------
+        List[Schema]
+            The schemas of the page, ordered by keyname.
+        """
+        with self._lock.read():
+            start = 0 if after is None else bisect_right(self._keynames, after)
+            return [self._schemas[keyname]
+                    for keyname in self._keynames[start:start + limit]]
 
     def create_schema(self, schema: Schema) -> str:
         """
@@ -75,9 +128,17 @@ class SchemaVanillaCacheDivision(SchemaDivision):
             The unique identifier of the created schema.
         """
         schema.schema_id = str(uuid.uuid4())
-        self._schemas[schema.schema_keyname] = schema
+        with self._lock.write():
+            self._apply_create(schema)
+            self._log("create", schema)
+        self._checkpoint_if_due()
         return schema.schema_id
 
+    def _apply_create(self, schema: Schema) -> None:
+        if schema.schema_keyname not in self._schemas:
+            insort(self._keynames, schema.schema_keyname)
+        self._schemas[schema.schema_keyname] = schema
+
     def delete_schema(self, schema_keyname: str) -> Optional[Hashable]:
         """
         Delete a schema from the cache.
@@ -92,11 +153,19 @@ class SchemaVanillaCacheDivision(SchemaDivision):
         Optional[Hashable]
             The unique identifier of the deleted schema, or None if not found.
         """
-        res = self._schemas.pop(schema_keyname, None)
-        if res is None:
-            return None
+        with self._lock.write():
+            res = self._schemas.get(schema_keyname)
+            if res is None:
+                return None
+            self._apply_delete(schema_keyname)
+            self._log("delete", schema_keyname)
+        self._checkpoint_if_due()
         return res.schema_id
 
+    def _apply_delete(self, schema_keyname: str) -> None:
+        if self._schemas.pop(schema_keyname, None) is not None:
+            del self._keynames[bisect_right(self._keynames, schema_keyname) - 1]
+
     def update_schema(self, schema: SchemaBase) -> Optional[Hashable]:
         """
         Update the metadata of an existing schema in the cache.
@@ -111,11 +180,21 @@ class SchemaVanillaCacheDivision(SchemaDivision):
         Optional[Hashable]
             The unique identifier of the updated schema, or None if not found.
         """
-        if schema.schema_keyname not in self._schemas:
-            return None
-        self._schemas[schema.schema_keyname].schema_name = schema.schema_name
-        self._schemas[schema.schema_keyname].schema_description = schema.schema_description
-        return self._schemas[schema.schema_keyname].schema_id
+        with self._lock.write():
+            if schema.schema_keyname not in self._schemas:
+                return None
+            self._apply_update(schema.schema_keyname, schema.schema_name,
+                               schema.schema_description)
+            self._log("update", schema.schema_keyname, schema.schema_name,
+                      schema.schema_description)
+            res = self._schemas[schema.schema_keyname].schema_id
+        self._checkpoint_if_due()
+        return res
+
+    def _apply_update(self, schema_keyname: str, schema_name: str,
+                      schema_description: str) -> None:
+        self._schemas[schema_keyname].schema_name = schema_name
+        self._schemas[schema_keyname].schema_description = schema_description
 
 
 
@@ -132,7 +211,16 @@ class SchemaVanillaCacheDivision(SchemaDivision):
         definition : dict
             The new schema definition to set.
         """
-        if schema_keyname not in self._schemas:
-            return None
+        with self._lock.write():
+            if schema_keyname not in self._schemas:
+                return None
+            self._apply_update_definition(schema_keyname, new_version, definition)
+            self._log("update_definition", schema_keyname, new_version, definition)
+            res = self._schemas[schema_keyname].schema_id
+        self._checkpoint_if_due()
+        return res
+
+    def _apply_update_definition(self, schema_keyname: str, new_version: Hashable,
+                                 definition: dict) -> None:
         self._schemas[schema_keyname].current_schema_definition = definition
-        return self._schemas[schema_keyname].schema_id
+        self._schemas[schema_keyname].current_version = new_version
@@ -0,0 +1,176 @@
+"""
+Module for the sorted indexes of the vanilla stores.
+
+A sorted index keeps the distinct values of a field in order, so the records whose
+value falls in a range are found by bisecting instead of scanning the store. The
+values are kept in buckets of bounded size, so adding or removing a value only
+shifts one bucket instead of the whole list.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, FrozenSet, Hashable, Iterator, List, Optional, Set
+
+from src.domain.query.filters import kind_of
+
+_INDEXED_KINDS = (float, str)
+_EMPTY: FrozenSet[Hashable] = frozenset()
+
+
+class SortedKeys:
+    """Sorted collection of distinct keys split in buckets of about ``load`` keys."""
+
+    load = 512
+
+    def __init__(self):
+        self._buckets: List[list] = []
+        self._maxes: list = []
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets)
+
+    def add(self, key: Any) -> None:
+        """Insert a key that is not in the collection yet."""
+        maxes = self._maxes
+        if not maxes:
+            self._buckets.append([key])
+            maxes.append(key)
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            bucket = self._buckets[i]
+            bucket.append(key)
+            maxes[i] = key
+        else:
+            bucket = self._buckets[i]
+            insort(bucket, key)
+        if len(bucket) > 2 * self.load:
+            self._buckets[i:i + 1] = [bucket[:self.load], bucket[self.load:]]
+            maxes[i:i + 1] = [bucket[self.load - 1], bucket[-1]]
+
+    def remove(self, key: Any) -> None:
+        """Remove a key of the collection."""
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def irange(self, low: Any = None, low_inclusive: bool = True, high: Any = None,
+               high_inclusive: bool = True) -> Iterator[Any]:
+        """Iterate in order over the keys between two bounds, None being unbounded."""
+        buckets, maxes = self._buckets, self._maxes
+        if low is None:
+            i, j = 0, 0
+        else:
+            i = (bisect_left if low_inclusive else bisect_right)(maxes, low)
+            if i == len(maxes):
+                return
+            j = (bisect_left if low_inclusive else bisect_right)(buckets[i], low)
+        while i < len(buckets):
+            bucket = buckets[i]
+            for key in bucket[j:]:
+                if high is not None and (key > high or (key == high and not high_inclusive)):
+                    return
+                yield key
+            i, j = i + 1, 0
+
+
+class SortedIndex:
+    """
+    Uids of the records by value of one field, with the values kept in order.
+
+    Only numbers, booleans excluded, and strings are indexed, each kind in its own
+    order. Ranges over other kinds, or records holding them, are left to scans.
+    """
+
+    def __init__(self):
+        self._uids: Dict[type, Dict[Any, Set[Hashable]]] = {kind: {} for kind in _INDEXED_KINDS}
+        self._keys: Dict[type, SortedKeys] = {kind: SortedKeys() for kind in _INDEXED_KINDS}
+
+    @staticmethod
+    def supports(value: Any) -> bool:
+        """Check whether a value, or a bound, is of an indexed kind."""
+        # NaN is left out, it is neither equal to nor ordered with any value
+        return kind_of(value) in _INDEXED_KINDS and value == value  # pylint: disable=R0124
+
+    def add(self, value: Any, uid: Hashable) -> None:
+        """Index a record by its value, ignored if the value cannot be indexed."""
+        if not self.supports(value):
+            return
+        kind = kind_of(value)
+        uids = self._uids[kind].get(value)
+        if uids is None:
+            uids = self._uids[kind][value] = set()
+            self._keys[kind].add(value)
+        uids.add(uid)
+
+    def remove(self, value: Any, uid: Hashable) -> None:
+        """Remove a record indexed by its value."""
+        if not self.supports(value):
+            return
+        kind = kind_of(value)
+        uids = self._uids[kind].get(value)
+        if uids is None:
+            return
+        uids.discard(uid)
+        if not uids:
+            del self._uids[kind][value]
+            self._keys[kind].remove(value)
+
+    def get(self, value: Any) -> Optional[Set[Hashable]]:
+        """
+        Get the uids of the records whose value equals a given one.
+
+        Parameters
+        ----------
+        value : Any
+            The value looked up.
+
+        Returns
+        -------
+        set, optional
+            The uids of the matching records, None if the value is of a kind not
+            indexed, or equals values of such a kind, whose records cannot be told
+            from the index.
+        """
+        if not self.supports(value):
+            return None
+        kind = kind_of(value)
+        if kind is float and value in (0, 1):
+            # the booleans, left out of the index, equal 0 and 1
+            return None
+        return self._uids[kind].get(value, _EMPTY)
+
+    def range(self, low: Any = None, low_inclusive: bool = True, high: Any = None,
+              high_inclusive: bool = True) -> Optional[Set[Hashable]]:
+        """
+        Get the uids of the records whose value is between two bounds.
+
+        Parameters
+        ----------
+        low : Any, optional
+            The lower bound, None for unbounded.
+        low_inclusive : bool
+            Whether a value equal to the lower bound is included.
+        high : Any, optional
+            The upper bound, None for unbounded.
+        high_inclusive : bool
+            Whether a value equal to the upper bound is included.
+
+        Returns
+        -------
+        set, optional
+            The uids in the range, None if the bounds cannot be answered by the index.
+        """
+        bound = low if low is not None else high
+        if bound is None or not self.supports(bound):
+            return None
+        kind = kind_of(bound)
+        uids_of = self._uids[kind]
+        res: Set[Hashable] = set()
+        for key in self._keys[kind].irange(low, low_inclusive, high, high_inclusive):
+            res |= uids_of[key]
+        return res
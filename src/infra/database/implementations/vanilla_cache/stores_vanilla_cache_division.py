@@ -1,27 +1,114 @@
 import uuid
-from typing import List, Hashable, Optional
+from contextlib import AbstractContextManager
+from typing import List, Hashable, Optional, Dict, Set, Any, FrozenSet, Iterator, Tuple
 
 from bisslog.exceptions.domain_exception import NotFound
 
 from src.domain.model.schema import Schema
-from src.infra.database.stores_division import StoresDivision
+from src.domain.query.aggregation import COUNT, Aggregator
+from src.domain.query.filters import (compile_params, is_operator_expression, range_bounds,
+                                      validate_params)
+from src.infra.database.implementations.vanilla_cache.change_log import ChangeLog
+from src.infra.database.implementations.vanilla_cache.columnar import (
+    COLUMNAR_LAYOUT, DICT_LAYOUT, LAYOUT_KEYWORD, LAYOUTS, ColumnarTable, column_kinds)
+from src.infra.database.implementations.vanilla_cache.insertion_order import InsertionOrder
+from src.infra.database.implementations.vanilla_cache.locking import (
+    NullStripedLocks, StripedLocks)
+from src.infra.database.implementations.vanilla_cache.persistence import (
+    PersistentDivisionMixin, VanillaPersistence)
+from src.infra.database.implementations.vanilla_cache.sorted_index import SortedIndex
+from src.infra.database.stores_division import (DELETE_CHANGE, INSERT_CHANGE, UPDATE_CHANGE,
+                                                StoresDivision)
 
+HASH_INDEX = "hash"
+SORTED_INDEX = "sorted"
+INDEX_KINDS = (HASH_INDEX, SORTED_INDEX)
 
-class StoresVanillaCacheDivision(StoresDivision):
+
+class StoresVanillaCacheDivision(PersistentDivisionMixin, StoresDivision):
     """
     In-memory implementation of the StoresDivision interface.
 
     This class manages stores using Python dictionaries,
     providing a simple cache mechanism for testing or non-persistent use cases.
-    """
 
+    Fields can be indexed with hash indexes, either declared in the schema definition
+    with the ``x-index`` keyword or created with `create_index`. Filtered reads
+    whose params hit an indexed field only visit the records with a matching value.
+    Fields declared with ``"x-index": "sorted"`` get a sorted index instead, which
+    answers the range operators ``$gt``, ``$gte``, ``$lt`` and ``$lte`` by bisecting.
+
+    When a `VanillaPersistence` is given, every mutation is logged and the stores
+    are restored from its snapshot and log on initialization.
+
+    In thread-safe mode every store has its own read-write lock: reads of a store
+    share it, writes hold it exclusively, and operations on different stores never
+    wait for each other. Iterations hold the lock only while each chunk of
+    ``iter_chunk_size`` records is collected. Stored records are never changed in
+    place, updates replace them, so a record returned by a read is a snapshot that
+    later writes leave untouched.
+
+    Records are kept as dicts by default. With the columnar layout, chosen for every
+    store or per schema with the ``x-layout`` keyword of its definition, each store
+    keeps its records in typed columns derived from the schema's properties, see
+    `ColumnarTable`. It takes much less memory for many small records at the cost
+    of rebuilding them on every read.
+
+    Every store keeps a `ChangeLog` of its last ``change_log_retention`` changes,
+    each one with a copy of the record as it was left by the change. Its sequence
+    numbers, along with an epoch drawn when the store is created, give the store
+    generation.
+    """
 
+    iter_chunk_size = 1000
 
-    def __init__(self):
+    def __init__(self, persistence: Optional[VanillaPersistence] = None,
+                 thread_safe: bool = False, layout: str = DICT_LAYOUT,
+                 change_log_retention: int = 10_000):
         """
         Initialize the in-memory store for stores.
+
+        Parameters
+        ----------
+        persistence : VanillaPersistence, optional
+            Snapshot and log files to restore from and write to. If None, the stores
+            are not durable.
+        thread_safe : bool
+            Whether the stores are protected by per-store read-write locks, to be
+            used from several threads.
+        layout : str
+            Layout of the stores whose schema does not choose one, ``dict`` or
+            ``columnar``.
+        change_log_retention : int
+            Number of most recent changes of every store kept in its change log.
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {LAYOUTS}")
+        if change_log_retention < 0:
+            raise ValueError("change_log_retention must not be negative")
+        self.layout = layout
+        self.change_log_retention = change_log_retention
         self._stores = {}
+        self._indexes: Dict[str, Dict[str, Dict[Hashable, Set[Hashable]]]] = {}
+        self._sorted_indexes: Dict[str, Dict[str, SortedIndex]] = {}
+        self._orders: Dict[str, InsertionOrder] = {}
+        self._changes: Dict[str, ChangeLog] = {}
+        self._locks = StripedLocks() if thread_safe else NullStripedLocks()
+        self._restore(persistence)
+
+    def _dump_state(self) -> dict:
+        return {"stores": self._stores, "indexes": self._indexes, "orders": self._orders,
+                "sorted_indexes": self._sorted_indexes, "changes": self._changes}
+
+    def _load_state(self, state: dict) -> None:
+        self._stores = state["stores"]
+        self._indexes = state["indexes"]
+        self._orders = state["orders"]
+        self._sorted_indexes = state.get("sorted_indexes", {})
+        self._changes = state.get("changes", {})
+
+    def _locked_for_snapshot(self) -> AbstractContextManager:
+        return self._locks.write_all()
 
     def create_store_of_schema(self, schema: Schema) -> bool:
         """
@@ -37,9 +124,37 @@ class StoresVanillaCacheDivision(StoresDivision):
         bool
             Always True, as this is a no-op in the cache implementation.
         """
-        self._stores[schema.schema_keyname] = {}
+        sorted_fields = schema.get_sorted_indexed_fields()
+        indexed_fields = [field for field in schema.get_indexed_fields()
+                          if field not in sorted_fields]
+        definition = schema.current_schema_definition
+        layout = definition.get(LAYOUT_KEYWORD, self.layout)
+        if layout not in LAYOUTS:
+            raise ValueError(f"{LAYOUT_KEYWORD} must be one of {LAYOUTS}")
+        kinds = column_kinds(definition) if layout == COLUMNAR_LAYOUT else None
+        epoch = uuid.uuid4().hex
+        with self._locks.for_key(schema.schema_keyname).write():
+            self._apply_create_store(schema.schema_keyname, indexed_fields, kinds,
+                                     sorted_fields, epoch)
+            self._log("create_store", schema.schema_keyname, indexed_fields, kinds,
+                      sorted_fields, epoch)
+        self._checkpoint_if_due()
         return True
 
+    def _apply_create_store(self, schema_keyname: str, indexed_fields: List[str],
+                            kinds: Optional[Dict[str, str]] = None,
+                            sorted_fields: Optional[List[str]] = None,
+                            epoch: str = ChangeLog.epoch) -> None:
+        self._stores[schema_keyname] = {} if kinds is None else ColumnarTable(kinds)
+        self._indexes[schema_keyname] = {}
+        self._sorted_indexes[schema_keyname] = {}
+        self._orders[schema_keyname] = InsertionOrder()
+        self._changes[schema_keyname] = ChangeLog(self.change_log_retention, epoch)
+        for field in indexed_fields:
+            self._apply_create_index(schema_keyname, field)
+        for field in sorted_fields or ():
+            self._apply_create_index(schema_keyname, field, SORTED_INDEX)
+
     def alter_store_of_schema(self, schema: Schema) -> bool:
         """
         Alter the store of the schema in the cache.
@@ -52,10 +167,162 @@ class StoresVanillaCacheDivision(StoresDivision):
         Returns
         -------
         bool
-            Always True, as this is a no-op in the cache implementation.
+            True if the store exists, False otherwise.
         """
+        if schema.schema_keyname not in self._stores:
+            return False
+        sorted_fields = schema.get_sorted_indexed_fields()
+        for field in schema.get_indexed_fields():
+            self.create_index(schema.schema_keyname, field,
+                              SORTED_INDEX if field in sorted_fields else HASH_INDEX)
         return True
 
+    def create_index(self, schema_keyname: str, field: str, kind: str = HASH_INDEX) -> bool:
+        """
+        Create an index over a field of the store, built from the current records.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be indexed.
+        field : str
+            The top-level field to be indexed.
+        kind : str
+            ``hash`` for an index answering equality and ``$in``, ``sorted`` for one
+            answering the range operators.
+
+        Returns
+        -------
+        bool
+            True if the index was created, False if it already existed.
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"kind must be one of {INDEX_KINDS}")
+        with self._locks.for_key(schema_keyname).write():
+            if schema_keyname not in self._stores:
+                raise NotFound("not-found-table", f"Not found schema store '{schema_keyname}'")
+            if field in self._indexes_of_kind(kind).get(schema_keyname, {}):
+                return False
+            self._apply_create_index(schema_keyname, field, kind)
+            self._log("create_index", schema_keyname, field, kind)
+        self._checkpoint_if_due()
+        return True
+
+    def _apply_create_index(self, schema_keyname: str, field: str,
+                            kind: str = HASH_INDEX) -> None:
+        if kind == SORTED_INDEX:
+            sorted_index = SortedIndex()
+            for uid, item in self._stores[schema_keyname].items():
+                sorted_index.add(item.get(field), uid)
+            self._sorted_indexes.setdefault(schema_keyname, {})[field] = sorted_index
+            return
+        index: Dict[Hashable, Set[Hashable]] = {}
+        for uid, item in self._stores[schema_keyname].items():
+            value = item.get(field)
+            if _is_hashable(value):
+                index.setdefault(value, set()).add(uid)
+        self._indexes.setdefault(schema_keyname, {})[field] = index
+
+    def _indexes_of_kind(self, kind: str) -> Dict[str, dict]:
+        return self._sorted_indexes if kind == SORTED_INDEX else self._indexes
+
+    def drop_index(self, schema_keyname: str, field: str, kind: str = HASH_INDEX) -> bool:
+        """
+        Drop an index over a field of the store.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is indexed.
+        field : str
+            The indexed field.
+        kind : str
+            The kind of the index, ``hash`` or ``sorted``.
+
+        Returns
+        -------
+        bool
+            True if the index was dropped, False if it did not exist.
+        """
+        with self._locks.for_key(schema_keyname).write():
+            if field not in self._indexes_of_kind(kind).get(schema_keyname, {}):
+                return False
+            self._apply_drop_index(schema_keyname, field, kind)
+            self._log("drop_index", schema_keyname, field, kind)
+        self._checkpoint_if_due()
+        return True
+
+    def _apply_drop_index(self, schema_keyname: str, field: str, kind: str = HASH_INDEX) -> None:
+        del self._indexes_of_kind(kind)[schema_keyname][field]
+
+    def get_indexed_fields(self, schema_keyname: str) -> List[str]:
+        """
+        List the indexed fields of the store.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is indexed.
+
+        Returns
+        -------
+        list of str
+            The indexed fields.
+        """
+        with self._locks.for_key(schema_keyname).read():
+            fields = dict.fromkeys(self._indexes.get(schema_keyname, {}))
+            fields.update(dict.fromkeys(self._sorted_indexes.get(schema_keyname, {})))
+            return list(fields)
+
+    def _index_record(self, schema_keyname: str, uid: Hashable, item: dict,
+                      fields: Optional[Set[str]] = None) -> None:
+        """Add a record to the indexes of its store, optionally only for some fields."""
+        for field, index in self._indexes.get(schema_keyname, {}).items():
+            if fields is not None and field not in fields:
+                continue
+            value = item.get(field)
+            if _is_hashable(value):
+                index.setdefault(value, set()).add(uid)
+        for field, sorted_index in self._sorted_indexes.get(schema_keyname, {}).items():
+            if fields is None or field in fields:
+                sorted_index.add(item.get(field), uid)
+
+    def _unindex_record(self, schema_keyname: str, uid: Hashable, item: dict,
+                        fields: Optional[Set[str]] = None) -> None:
+        """Remove a record from the indexes of its store, optionally only for some fields."""
+        for field, index in self._indexes.get(schema_keyname, {}).items():
+            if fields is not None and field not in fields:
+                continue
+            value = item.get(field)
+            if not _is_hashable(value):
+                continue
+            uids = index.get(value)
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del index[value]
+        for field, sorted_index in self._sorted_indexes.get(schema_keyname, {}).items():
+            if fields is None or field in fields:
+                sorted_index.remove(item.get(field), uid)
+
+    def _candidate_uids(self, schema_keyname: str, params: dict) -> Optional[Set[Hashable]]:
+        """Get the smallest set of uids given by the indexes hit by the params.
+
+        Returns None when no param can be answered by an index.
+        """
+        indexes = self._indexes.get(schema_keyname) or {}
+        sorted_indexes = self._sorted_indexes.get(schema_keyname) or {}
+        if not indexes and not sorted_indexes:
+            return None
+        best = None
+        for field, value in params.items():
+            uids = _index_lookup(indexes.get(field), sorted_indexes.get(field), value)
+            if uids is not None and (best is None or len(uids) < len(best)):
+                best = uids
+                if not best:
+                    break
+        return best
+
     def get_one_data_from_store(self, schema_keyname: str, uid_data: Hashable) -> Optional[dict]:
         """
         Get one data from the store of the schema in the cache.
@@ -72,35 +339,252 @@ class StoresVanillaCacheDivision(StoresDivision):
         dict
             A dictionary containing information about a record in the store.
         """
-        return self._stores.get(schema_keyname, {}).get(uid_data)
+        with self._locks.for_key(schema_keyname).read():
+            return self._stores.get(schema_keyname, {}).get(uid_data)
+
+    def get_data_from_store(self, schema_keyname: str, params: dict,
+                            fields: Optional[List[str]] = None) -> List[dict]:
+        validate_params(params)
+        with self._locks.for_key(schema_keyname).read():
+            return self._get_data_from_store(schema_keyname, params, fields)
 
-    def get_data_from_store(self, schema_keyname: str, params: dict) -> List[dict]:
+    def _get_data_from_store(self, schema_keyname: str, params: dict,
+                             fields: Optional[List[str]]) -> List[dict]:
+        """Body of `get_data_from_store`, run while the store is read-locked."""
         if schema_keyname not in self._stores:
             raise NotFound("not-found-table", f"Not found schema store '{schema_keyname}'")
+        store = self._stores[schema_keyname]
+        keys = _projection_keys(fields)
         if not params:
-            return list(self._stores[schema_keyname].values())
-        res = []
-        for item in self._stores[schema_keyname].values():
-            if all(item.get(k) == v for k, v in params.items()):
-                res.append(item)
-        return res
+            if keys is None:
+                return list(store.values())
+            return [_project(item, keys) for item in store.values()]
+        candidates = self._candidate_uids(schema_keyname, params)
+        items = store.values() if candidates is None else (store[uid] for uid in candidates)
+        matches = compile_params(params)
+        return [item if keys is None else _project(item, keys)
+                for item in items if matches(item)]
+
+    def aggregate_data_in_store(self, schema_keyname: str, params: Optional[dict],
+                                group_by: Optional[List[str]] = None,
+                                metrics: Optional[Dict[str, Tuple[str, str]]] = None
+                                ) -> List[dict]:
+        """Aggregate in a single pass over the matching records, without copying them.
+
+        Counting a whole store without groups nor metrics takes constant time.
+        """
+        validate_params(params)
+        with self._locks.for_key(schema_keyname).read():
+            if schema_keyname not in self._stores:
+                raise NotFound("not-found-table", f"Not found schema store '{schema_keyname}'")
+            store = self._stores[schema_keyname]
+            if not params and not group_by and not metrics:
+                return [{COUNT: len(store)}]
+            aggregator = Aggregator(group_by or [], metrics or {})
+            candidates = self._candidate_uids(schema_keyname, params) if params else None
+            items = store.values() if candidates is None else (store[uid] for uid in candidates)
+            matches = compile_params(params)
+            for item in items:
+                if matches(item):
+                    aggregator.add(item)
+            return aggregator.result()
+
+    def iter_data_from_store(self, schema_keyname: str, params: dict,
+                             after: Optional[int] = None,
+                             fields: Optional[List[str]] = None) -> Iterator[Tuple[int, dict]]:
+        if schema_keyname not in self._stores:
+            raise NotFound("not-found-table", f"Not found schema store '{schema_keyname}'")
+        validate_params(params)
+        return self._iter_data_from_store(schema_keyname, params, after, _projection_keys(fields))
+
+    def _iter_data_from_store(self, schema_keyname: str, params: Optional[dict],
+                              after: Optional[int],
+                              keys: Optional[Tuple[str, ...]]) -> Iterator[Tuple[int, dict]]:
+        """Generator behind `iter_data_from_store`, the store is known to exist.
+
+        Records are collected in chunks while the store is read-locked and yielded
+        once the lock is released, so a paused consumer never blocks the writers.
+        """
+        lock = self._locks.for_key(schema_keyname)
+        with lock.read():
+            candidates = self._candidate_uids(schema_keyname, params) if params else None
+            if candidates is not None:
+                candidates = self._orders[schema_keyname].sort_after(candidates, after)
+        matches = compile_params(params)
+        chunk_size = self.iter_chunk_size
+        start = 0
+        while True:
+            chunk = []
+            with lock.read():
+                store = self._stores.get(schema_keyname)
+                if store is None:
+                    return
+                if candidates is None:
+                    positions = self._orders[schema_keyname].iter_after(after)
+                else:
+                    # indexed from the resume point, the list is neither copied nor skipped
+                    positions = (candidates[i] for i in range(start, len(candidates)))
+                visited = 0
+                for seq, uid in positions:
+                    visited += 1
+                    after = seq
+                    item = store.get(uid)
+                    if item is not None and matches(item):
+                        chunk.append((seq, item if keys is None else _project(item, keys)))
+                    if visited >= chunk_size:
+                        break
+                start += visited
+            yield from chunk
+            if visited < chunk_size:
+                return
 
     def insert_data_into_store(self, schema_keyname: str, data: dict) -> Hashable:
         uid = str(uuid.uuid4())
         data["uid"] = uid
-        self._stores[schema_keyname][uid] = data
+        with self._locks.for_key(schema_keyname).write():
+            self._apply_insert(schema_keyname, [data])
+            self._log("insert", schema_keyname, [data])
+        self._checkpoint_if_due()
         return uid
 
+    def insert_many_into_store(self, schema_keyname: str, data: List[dict]) -> List[Hashable]:
+        uids = []
+        for item in data:
+            uid = str(uuid.uuid4())
+            item["uid"] = uid
+            uids.append(uid)
+        with self._locks.for_key(schema_keyname).write():
+            self._apply_insert(schema_keyname, data)
+            self._log("insert", schema_keyname, data)
+        self._checkpoint_if_due()
+        return uids
+
+    def _apply_insert(self, schema_keyname: str, data: List[dict]) -> None:
+        store = self._stores[schema_keyname]
+        order = self._orders[schema_keyname]
+        changes = self._change_log(schema_keyname)
+        for item in data:
+            # copied, so the caller keeps no handle on the stored record
+            item = dict(item)
+            uid = item["uid"]
+            store[uid] = item
+            order.add(uid)
+            self._index_record(schema_keyname, uid, item)
+            changes.append(INSERT_CHANGE, uid, dict(item))
+
     def update_data_in_store(self, schema_keyname: str, data: dict,
                              uid_data: Hashable) -> Optional[Hashable]:
-        item = self._stores.get(schema_keyname, {}).get(uid_data)
         if "uid" in data:
             del data["uid"]
-        if not item:
-            return None
-        item.update(data)
+        with self._locks.for_key(schema_keyname).write():
+            if not self._stores.get(schema_keyname, {}).get(uid_data):
+                return None
+            self._apply_update(schema_keyname, data, uid_data)
+            self._log("update", schema_keyname, data, uid_data)
+        self._checkpoint_if_due()
         return uid_data
 
+    def _apply_update(self, schema_keyname: str, data: dict, uid_data: Hashable) -> None:
+        store = self._stores[schema_keyname]
+        previous = store[uid_data]
+        changed_fields = set(data)
+        self._unindex_record(schema_keyname, uid_data, previous, changed_fields)
+        # replaced instead of updated in place, the records already read stay as they were
+        item = {**previous, **data}
+        store[uid_data] = item
+        self._index_record(schema_keyname, uid_data, item, changed_fields)
+        self._change_log(schema_keyname).append(UPDATE_CHANGE, uid_data, dict(item))
+
     def delete_data_from_store(self, schema_keyname: str, uid_data: Hashable) -> Optional[Hashable]:
+        with self._locks.for_key(schema_keyname).write():
+            if uid_data not in self._stores[schema_keyname]:
+                return None
+            self._apply_delete(schema_keyname, uid_data)
+            self._log("delete", schema_keyname, uid_data)
+        self._checkpoint_if_due()
+        return uid_data
+
+    def _apply_delete(self, schema_keyname: str, uid_data: Hashable) -> None:
         res = self._stores[schema_keyname].pop(uid_data)
-        return uid_data if res else None
+        self._orders[schema_keyname].remove(uid_data)
+        self._unindex_record(schema_keyname, uid_data, res)
+        self._change_log(schema_keyname).append(DELETE_CHANGE, uid_data, None)
+
+    def _change_log(self, schema_keyname: str) -> ChangeLog:
+        """Change log of a store, created for stores restored from older snapshots."""
+        changes = self._changes.get(schema_keyname)
+        if changes is None:
+            changes = self._changes[schema_keyname] = ChangeLog(self.change_log_retention)
+        return changes
+
+    def get_changes_from_store(self, schema_keyname: str, after: Optional[int],
+                               limit: int) -> dict:
+        with self._locks.for_key(schema_keyname).read():
+            if schema_keyname not in self._stores:
+                raise NotFound("not-found-table", f"Not found schema store '{schema_keyname}'")
+            changes = self._changes.get(schema_keyname) or ChangeLog(0)
+            res, expired = changes.read(after, limit) if after is not None else ([], False)
+            if after is None or expired:
+                position = changes.last_seq
+            else:
+                position = res[-1]["seq"] if res else after
+            return {"changes": res, "last_seq": changes.last_seq, "epoch": changes.epoch,
+                    "position": position, "expired": expired}
+
+    def get_store_generation(self, schema_keyname: str) -> Optional[str]:
+        with self._locks.for_key(schema_keyname).read():
+            if schema_keyname not in self._stores:
+                return None
+            return (self._changes.get(schema_keyname) or ChangeLog(0)).generation
+
+
+_EMPTY: FrozenSet[Hashable] = frozenset()
+
+
+def _projection_keys(fields: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """Get the keys to be copied from each record, always including ``uid``."""
+    if fields is None:
+        return None
+    return ("uid",) + tuple(dict.fromkeys(field for field in fields if field != "uid"))
+
+
+def _project(item: dict, keys: Tuple[str, ...]) -> dict:
+    """Copy the given keys of a record, skipping the missing ones."""
+    return {k: item[k] for k in keys if k in item}
+
+
+def _index_lookup(index: Optional[Dict[Hashable, Set[Hashable]]],
+                  sorted_index: Optional[SortedIndex], value: Any) -> Optional[Set[Hashable]]:
+    """Get the uids matching the filter of a field given by its indexes.
+
+    Equality and ``$in`` are answered by the hash index, or else by the sorted one,
+    range operators by the sorted one. Returns None when neither index can answer
+    the filter.
+    """
+    if not is_operator_expression(value):
+        if index is not None and _is_hashable(value):
+            return index.get(value, _EMPTY)
+        return sorted_index.get(value) if sorted_index is not None else None
+    best = None
+    values = value.get("$in")
+    if index is not None and values is not None and all(_is_hashable(v) for v in values):
+        best = set().union(*(index.get(v, _EMPTY) for v in values))
+    elif sorted_index is not None and values is not None:
+        matches = [sorted_index.get(v) for v in values]
+        if all(uids is not None for uids in matches):
+            best = set().union(*matches)
+    bounds = range_bounds(value) if sorted_index is not None else None
+    if bounds is not None:
+        uids = sorted_index.range(*bounds)
+        if uids is not None and (best is None or len(uids) < len(best)):
+            best = uids
+    return best
+
+
+def _is_hashable(value: Any) -> bool:
+    """Check whether a value can be used as a key of a hash index."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
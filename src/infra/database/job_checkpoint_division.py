@@ -0,0 +1,53 @@
+from abc import ABCMeta, abstractmethod
+from typing import Optional
+
+from bisslog import Division
+
+
+class JobCheckpointDivision(Division, metaclass=ABCMeta):
+    """Class to persist the progress of long running jobs, so they can be resumed."""
+
+    @abstractmethod
+    def get_checkpoint(self, job_name: str) -> Optional[dict]:
+        """Retrieve the last saved progress of a job.
+
+        Parameters
+        ----------
+        job_name : str
+            The unique name of the job.
+
+        Returns
+        -------
+        dict
+            The progress saved by the job, None if there is none.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_checkpoint(self, job_name: str, progress: dict) -> None:
+        """Save the progress of a job, replacing the previous one.
+
+        Parameters
+        ----------
+        job_name : str
+            The unique name of the job.
+        progress : dict
+            JSON-serializable progress of the job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_checkpoint(self, job_name: str) -> bool:
+        """Forget the progress of a job, usually once it is completed.
+
+        Parameters
+        ----------
+        job_name : str
+            The unique name of the job.
+
+        Returns
+        -------
+        bool
+            True if there was a saved progress, False otherwise.
+        """
+        raise NotImplementedError
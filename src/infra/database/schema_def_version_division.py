@@ -44,13 +44,18 @@ class SchemaDefVersionDivision(Division, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def get_schema_versions(self, schema_keyname: str) -> List[SchemaDefinitionVersion]:
-        """List versions of a specific schema in the database.
+    def get_schema_versions(self, schema_keyname: str, limit: Optional[int] = None,
+                            offset: int = 0) -> List[SchemaDefinitionVersion]:
+        """List versions of a specific schema in the database, oldest first.
 
         Parameters
         ----------
         schema_keyname : str
             The name of the schema whose versions are to be listed.
+        limit : int, optional
+            Maximum number of versions to be listed. If None, all of them are listed.
+        offset : int
+            Number of versions to be skipped.
 
         Returns
         -------
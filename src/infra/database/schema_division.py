@@ -43,6 +43,30 @@ class SchemaDivision(Division, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def get_schemas_page(self, after: Optional[str] = None, limit: int = 100) -> List[Schema]:
+        """List schemas ordered by keyname, one page at a time.
+
+        The default implementation sorts every schema; implementations backed by a
+        database should override it with an indexed query.
+
+        Parameters
+        ----------
+        after : str, optional
+            The keyname of the last schema of the previous page. If None, starts
+            from the first schema.
+        limit : int
+            Maximum number of schemas of the page.
+
+        Returns
+        -------
+        list
+            The schemas of the page, ordered by keyname.
+        """
+        schemas = sorted(self.get_schemas({}), key=lambda schema: schema.schema_keyname)
+        if after is not None:
+            schemas = [schema for schema in schemas if schema.schema_keyname > after]
+        return schemas[:limit]
+
     @abstractmethod
     def create_schema(self, schema: Schema) -> Hashable:
         """Create a new schema in the database.
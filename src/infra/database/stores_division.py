@@ -1,9 +1,14 @@
 from abc import ABCMeta, abstractmethod
-from typing import Hashable, Optional, List
+from typing import Hashable, Optional, List, Iterator, Tuple, Dict
 
 from bisslog import Division
 
 from src.domain.model.schema import Schema
+from src.domain.query.aggregation import Aggregator
+
+INSERT_CHANGE = "insert"
+UPDATE_CHANGE = "update"
+DELETE_CHANGE = "delete"
 
 
 class StoresDivision(Division, metaclass=ABCMeta):
@@ -61,7 +66,8 @@ class StoresDivision(Division, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def get_data_from_store(self, schema_keyname: str, params: dict) -> List[dict]:
+    def get_data_from_store(self, schema_keyname: str, params: dict,
+                            fields: Optional[List[str]] = None) -> List[dict]:
         """Get data from the store of the schema in the database.
 
         Parameters
@@ -70,6 +76,9 @@ class StoresDivision(Division, metaclass=ABCMeta):
             The name of the schema whose store is to be accessed.
         params : dict
             Parameters to filter the data.
+        fields : list of str, optional
+            Fields of the records to be returned, besides ``uid``. If None, whole records
+            are returned.
 
         Returns
         -------
@@ -78,6 +87,36 @@ class StoresDivision(Division, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_data_from_store(self, schema_keyname: str, params: dict,
+                             after: Optional[Hashable] = None,
+                             fields: Optional[List[str]] = None) -> Iterator[Tuple[Hashable, dict]]:
+        """Stream data from the store of the schema in the database.
+
+        Records are yielded lazily in a stable order, each one together with its
+        position, so a read can be resumed later right after the last seen record.
+        Records inserted while streaming or after a position was handed out are
+        placed after every existing record.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        params : dict
+            Parameters to filter the data.
+        after : Hashable, optional
+            The position of the last record already read. If None, starts from the beginning.
+        fields : list of str, optional
+            Fields of the records to be returned, besides ``uid``. If None, whole records
+            are returned.
+
+        Yields
+        ------
+        tuple of (Hashable, dict)
+            The JSON-serializable position of the record and the record itself.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def insert_data_into_store(self, schema_keyname: str, data: dict) -> Optional[Hashable]:
         """Insert data into the store of the schema in the database.
@@ -96,6 +135,24 @@ class StoresDivision(Division, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def insert_many_into_store(self, schema_keyname: str, data: List[dict]) -> List[Hashable]:
+        """Insert several records into the store of the schema in a single operation.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        data : list of dict
+            The validated records to be inserted into the store.
+
+        Returns
+        -------
+        list of Hashable
+            The unique identifiers of the inserted records, in the same order as ``data``.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def update_data_in_store(self, schema_keyname: str, data: dict,
                              uid_data: Hashable) -> Optional[Hashable]:
@@ -134,3 +191,103 @@ class StoresDivision(Division, metaclass=ABCMeta):
             The unique identifier of the deleted data.
         """
         raise NotImplementedError
+
+    def delete_many_from_store(self, schema_keyname: str, uids_data: List[Hashable]) -> int:
+        """Delete several records from the store of the schema in a single operation.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        uids_data : list of Hashable
+            The unique identifiers of the records to be deleted.
+
+        Returns
+        -------
+        int
+            The number of deleted records.
+        """
+        return sum(self.delete_data_from_store(schema_keyname, uid_data) is not None
+                   for uid_data in uids_data)
+
+    @abstractmethod
+    def get_changes_from_store(self, schema_keyname: str, after: Optional[int],
+                               limit: int) -> dict:
+        """Get the changes made to the store of the schema after a sequence number.
+
+        Every insert, update and delete of a store is numbered with the next sequence
+        number of the store, and the most recent changes are kept for a while. The
+        numbers only make sense along with the epoch of the store they were given by.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        after : int, optional
+            The sequence number of the last change already seen. If None, no change
+            is returned, only the sequence number to follow the store from.
+        limit : int
+            Maximum number of changes returned.
+
+        Returns
+        -------
+        dict
+            The ``changes`` in order, each one with its ``seq``, its ``op`` among
+            ``insert``, ``update`` and ``delete``, the ``uid`` of the record and its
+            ``data`` after the change (None for deletions); the ``last_seq`` and the
+            ``epoch`` of the store; the ``position`` the changes were read up to, to
+            be given as ``after`` next; and whether the changes following ``after``
+            have ``expired``, in which case the store is to be read again.
+        """
+        raise NotImplementedError
+
+    def get_store_generation(self, schema_keyname: str) -> Optional[str]:
+        """Get the generation of the store of the schema.
+
+        The generation is an opaque string changed by every insert, update and delete
+        of the store, so equal generations mean the records have not changed. It is
+        read without reading the records.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+
+        Returns
+        -------
+        str, optional
+            The generation of the store, None if the store does not exist or the
+            implementation does not keep generations.
+        """
+        return None
+
+    def aggregate_data_in_store(self, schema_keyname: str, params: Optional[dict],
+                                group_by: Optional[List[str]] = None,
+                                metrics: Optional[Dict[str, Tuple[str, str]]] = None
+                                ) -> List[dict]:
+        """Count and aggregate the filtered data of the store of the schema.
+
+        Falls back to a single pass over `iter_data_from_store`; backends able to
+        aggregate by themselves override it.
+
+        Parameters
+        ----------
+        schema_keyname : str
+            The name of the schema whose store is to be accessed.
+        params : dict, optional
+            Parameters to filter the data.
+        group_by : list of str, optional
+            Fields whose values define the groups. If None, every record is in one group.
+        metrics : dict, optional
+            Name of each metric mapped to its ``(aggregation, field)`` pair, as
+            normalized by `normalize_aggregation`.
+
+        Returns
+        -------
+        list of dict
+            For every group, its values of the grouped fields, its ``count`` and its metrics.
+        """
+        aggregator = Aggregator(group_by or [], metrics or {})
+        for _, item in self.iter_data_from_store(schema_keyname, params):
+            aggregator.add(item)
+        return aggregator.result()
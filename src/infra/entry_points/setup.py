@@ -1,5 +1,13 @@
 from bisslog import bisslog_db as db
 
+from ..database.implementations.caching.schema_caching_division import SchemaCachingDivision
+from ..database.implementations.instrumentation.instrumented_division import \
+    InstrumentedDivision
+from ..database.implementations.vanilla_cache.async_vanilla_cache_divisions import (
+    AsyncSchemaDefVersionVanillaCacheDiv, AsyncSchemaVanillaCacheDivision,
+    AsyncStoresVanillaCacheDivision)
+from ..database.implementations.vanilla_cache.job_checkpoint_vanilla_cache_division import \
+    JobCheckpointVanillaCacheDivision
 from ..database.implementations.vanilla_cache.schema_def_version_vanilla_cache_div import \
     SchemaDefVersionVanillaCacheDiv
 from ..database.implementations.vanilla_cache.schema_vanilla_cache_division import \
@@ -9,5 +17,17 @@ from ..database.implementations.vanilla_cache.stores_vanilla_cache_division impo
 
 
 def setup():
-    db.register_adapters(stores=StoresVanillaCacheDivision(), schema=SchemaVanillaCacheDivision(),
-                         schema_version=SchemaDefVersionVanillaCacheDiv())
+    # the store migrations write from a background thread, and the pruning of the
+    # schema versions may run on several, so the divisions are all thread-safe
+    stores = StoresVanillaCacheDivision(thread_safe=True)
+    schema = SchemaCachingDivision(SchemaVanillaCacheDivision(thread_safe=True))
+    schema_version = SchemaDefVersionVanillaCacheDiv(thread_safe=True)
+    divisions = {
+        "stores": stores, "schema": schema, "schema_version": schema_version,
+        "job_checkpoint": JobCheckpointVanillaCacheDivision(thread_safe=True),
+        "stores_async": AsyncStoresVanillaCacheDivision(stores),
+        "schema_async": AsyncSchemaVanillaCacheDivision(schema),
+        "schema_version_async": AsyncSchemaDefVersionVanillaCacheDiv(schema_version),
+    }
+    db.register_adapters(**{name: InstrumentedDivision(division, name)
+                            for name, division in divisions.items()})
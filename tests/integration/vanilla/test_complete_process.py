@@ -16,7 +16,7 @@ GET_COMPANY_DATA = GetCompanyData()
 
 db.register_adapters(schema=SchemaVanillaCacheDivision(),
                      stores=StoresVanillaCacheDivision(),
-                     schema_def_version=SchemaDefVersionVanillaCacheDiv())
+                     schema_version=SchemaDefVersionVanillaCacheDiv())
 
 def test_complete_process():
     """
@@ -0,0 +1,91 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.aggregate_company_data import AggregateCompanyData
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+RECORDS = [{"name": "a", "country": "co", "revenue": 10, "sector": "tech"},
+           {"name": "b", "country": "co", "revenue": 2.5, "sector": "bank"},
+           {"name": "c", "country": "es", "revenue": "n/a", "sector": "tech"},
+           {"name": "d", "country": "es", "revenue": None},
+           {"name": "e", "revenue": 7}]
+METRICS = {"total": {"sum": "revenue"}, "low": {"min": "revenue"},
+           "high": {"max": "revenue"}, "sectors": {"distinct": "sector"}}
+
+
+def make_stores(layout="dict"):
+    schema = Schema(schema_keyname="company", schema_name="Company",
+                    schema_description="Company schema for tests",
+                    current_schema_definition={
+                        "type": "object",
+                        "properties": {"country": {"type": "string", "x-index": True},
+                                       "revenue": {"type": "number", "x-index": "sorted"}}
+                    })
+    stores = StoresVanillaCacheDivision(layout=layout)
+    stores.create_store_of_schema(schema)
+    stores.insert_many_into_store("company", [dict(record) for record in RECORDS])
+    return stores
+
+
+def by_country(groups):
+    return sorted(groups, key=lambda group: str(group.get("country")))
+
+
+@pytest.fixture(params=["dict", "columnar"])
+def mock_db(request):
+    database = MagicMock()
+    database.stores = make_stores(request.param)
+    with patch("src.domain.use_cases.company_data.aggregate_company_data.db", database):
+        yield database
+
+
+def test_count_without_filter(mock_db):
+    """A plain count should be answered from the size of the store."""
+    assert AggregateCompanyData()("company") == {"groups": [{"count": 5}]}
+
+
+def test_grouped_metrics(mock_db):
+    """Every group should get its count and metrics."""
+    res = AggregateCompanyData()("company", group_by="country", metrics=METRICS)
+
+    assert by_country(res["groups"]) == [
+        {"country": None, "count": 1, "total": 7, "low": 7, "high": 7, "sectors": []},
+        {"country": "co", "count": 2, "total": 12.5, "low": 2.5, "high": 10,
+         "sectors": ["bank", "tech"]},
+        {"country": "es", "count": 2, "total": 0, "low": "n/a", "high": "n/a",
+         "sectors": ["tech"]},
+    ]
+
+
+def test_filtered_aggregation_without_matches(mock_db):
+    """Filters should apply and an empty ungrouped aggregation still has a group."""
+    res = AggregateCompanyData()("company", {"revenue": {"$gt": 5}},
+                                 metrics={"total": {"sum": "revenue"}})
+    assert res == {"groups": [{"count": 2, "total": 17}]}
+
+    res = AggregateCompanyData()("company", {"country": "mx"}, metrics=METRICS)
+    assert res == {"groups": [{"count": 0, "total": 0, "low": None, "high": None,
+                               "sectors": []}]}
+
+
+@pytest.mark.parametrize("group_by, metrics", [
+    (["$country"], None),
+    (None, {"total": {"avg": "revenue"}}),
+    (None, {"total": {"sum": "revenue", "max": "revenue"}}),
+    (["count"], None),
+    (["country"], {"country": {"sum": "revenue"}}),
+])
+def test_invalid_aggregations(mock_db, group_by, metrics):
+    """Malformed groups or metrics should be rejected."""
+    with pytest.raises(ValueError):
+        AggregateCompanyData()("company", group_by=group_by, metrics=metrics)
+
+
+def test_unknown_store(mock_db):
+    """Aggregating an unknown store should raise NotFound."""
+    with pytest.raises(NotFound):
+        AggregateCompanyData()("unknown")
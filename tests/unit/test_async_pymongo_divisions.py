@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_base import SchemaBase
+from src.infra.database.implementations.pymongo.async_schema_pymongo_division import \
+    AsyncSchemaMongoDivision
+from src.infra.database.implementations.pymongo.async_stores_pymongo_division import \
+    AsyncStoresMongoDivision
+from src.infra.database.implementations.pymongo.schema_pymongo_division import \
+    SchemaMongoDivision
+from src.infra.database.implementations.pymongo.stores_pymongo_division import \
+    StoresMongoDivision
+
+SCHEMA = Schema(schema_keyname="company", schema_name="Company",
+                schema_description="Company schema for tests",
+                current_schema_definition={
+                    "type": "object",
+                    "properties": {"name": {"type": "string"},
+                                   "country": {"type": "string", "x-index": True}}
+                })
+
+
+class AsyncCursor:
+    """Async iterable over a mongomock cursor, as returned by `AsyncCollection.find`."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs) -> "AsyncCursor":
+        self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit: int) -> "AsyncCursor":
+        self._cursor.limit(limit)
+        return self
+
+    def batch_size(self, size: int) -> "AsyncCursor":
+        self._cursor.batch_size(size)
+        return self
+
+    async def __aiter__(self):
+        for document in self._cursor:
+            yield document
+
+
+class AsyncProxy:
+    """Mongomock collection or database whose methods are coroutines, as in pymongo's."""
+
+    def __init__(self, target):
+        self._target = target
+
+    def get_collection(self, name: str) -> "AsyncProxy":
+        return AsyncProxy(self._target.get_collection(name))
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(self._target.find(*args, **kwargs))
+
+    def __getattr__(self, name: str):
+        method = getattr(self._target, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class AsyncClient:
+    """Mongomock client giving async databases, the way an `AsyncMongoClient` does."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def get_database(self, name: str) -> AsyncProxy:
+        return AsyncProxy(self._client.get_database(name))
+
+
+@pytest.fixture
+def client():
+    """Provides a mongomock client shared by the sync and async divisions."""
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def stores(client):
+    """Provides an async Mongo store division with the 'company' store created."""
+    division = AsyncStoresMongoDivision(AsyncClient(client), "registry")
+    asyncio.run(division.create_store_of_schema(SCHEMA))
+    return division
+
+
+def test_async_insert_read_update_delete(stores, client):
+    """A record should go through the whole lifecycle, every write being logged."""
+    async def scenario():
+        uid = await stores.insert_data_into_store("company", {"name": "acme", "country": "co"})
+        updated = await stores.update_data_in_store("company", {"country": "es"}, uid)
+        found = await stores.get_data_from_store("company", {"country": "es"}, ["name"])
+        one = await stores.get_one_data_from_store("company", uid)
+        deleted = await stores.delete_data_from_store("company", uid)
+        missing = await stores.update_data_in_store("company", {"country": "pe"}, uid)
+        return uid, updated, found, one, deleted, missing
+
+    uid, updated, found, one, deleted, missing = asyncio.run(scenario())
+
+    assert updated == deleted == uid and missing is None
+    assert found == [{"uid": uid, "name": "acme"}]
+    assert one == {"uid": uid, "name": "acme", "country": "es"}
+    changes = StoresMongoDivision(client, "registry").get_changes_from_store("company", 0, 10)
+    assert [change["op"] for change in changes["changes"]] == ["insert", "update", "delete"]
+
+
+def test_async_bulk_writes_and_iteration(stores):
+    """Bulk writes should count their records and iteration cross batch boundaries."""
+    stores.batch_size = 2
+
+    async def scenario():
+        uids = await stores.insert_many_into_store("company",
+                                                   [{"name": f"c{i}"} for i in range(5)])
+        streamed = [position async for position, _ in
+                    stores.iter_data_from_store("company", None, fields=["name"])]
+        rest = [position async for position, _ in
+                stores.iter_data_from_store("company", {}, uids[1])]
+        deleted = await stores.delete_many_from_store("company", uids[:3] + ["bad"])
+        remaining = await stores.get_data_from_store("company", None)
+        return uids, streamed, rest, deleted, remaining
+
+    uids, streamed, rest, deleted, remaining = asyncio.run(scenario())
+
+    assert streamed == uids and rest == uids[2:]
+    assert deleted == 3
+    assert [record["uid"] for record in remaining] == uids[3:]
+
+
+def test_async_and_sync_stores_share_documents(stores, client):
+    """Both divisions should read the records and sequence numbers written by the other."""
+    sync_stores = StoresMongoDivision(client, "registry")
+    uid = sync_stores.insert_data_into_store("company", {"name": "acme"})
+
+    assert asyncio.run(stores.get_one_data_from_store("company", uid)) == {
+        "uid": uid, "name": "acme"}
+    asyncio.run(stores.update_data_in_store("company", {"name": "acme inc"}, uid))
+    assert sync_stores.get_one_data_from_store("company", uid)["name"] == "acme inc"
+    assert sync_stores.get_changes_from_store("company", None, 10)["last_seq"] == 2
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_schema_lifecycle(client, asynchronous):
+    """Both schema divisions should store, update and delete schemas the same way."""
+    if asynchronous:
+        division = AsyncSchemaMongoDivision(AsyncClient(client), "registry")
+    else:
+        division = SchemaMongoDivision(client, "registry")
+
+    async def run(result):
+        return await result if asynchronous else result
+
+    async def scenario():
+        schema_id = await run(division.create_schema(Schema(**vars(SCHEMA))))
+        renamed = await run(division.update_schema(
+            SchemaBase("company", "Companies", "Companies renamed")))
+        redefined = await run(division.update_schema_definition(
+            "company", "v2", {"type": "object"}))
+        schema = await run(division.get_schema("company"))
+        listed = await run(division.get_schemas({}))
+        deleted = await run(division.delete_schema("company"))
+        missing = await run(division.delete_schema("company"))
+        return schema_id, renamed, redefined, schema, listed, deleted, missing
+
+    schema_id, renamed, redefined, schema, listed, deleted, missing = asyncio.run(scenario())
+
+    assert renamed == redefined == deleted == schema_id and missing is None
+    assert (schema.schema_id, schema.schema_name, schema.current_version) == (
+        schema_id, "Companies", "v2")
+    assert listed == [schema]
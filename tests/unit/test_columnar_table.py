@@ -0,0 +1,85 @@
+import pytest
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.columnar import (ColumnarTable,
+                                                                       column_kinds)
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+DEFINITION = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "size": {"enum": ["small", "large"]},
+        "revenue": {"type": "number"},
+        "employees": {"type": "integer"},
+        "listed": {"type": "boolean"},
+        "address": {"type": "object"},
+    }
+}
+
+
+def test_column_kinds_from_definition():
+    """Scalar properties and string enums get columns, the others spill."""
+    assert column_kinds(DEFINITION) == {"name": "string", "size": "string",
+                                        "revenue": "number", "employees": "integer",
+                                        "listed": "boolean"}
+
+
+def test_records_are_kept_as_given():
+    """Values, including their types, should be read back unchanged."""
+    table = ColumnarTable(column_kinds(DEFINITION))
+    records = [
+        {"uid": "a", "name": "acme", "size": "small", "revenue": 1.5, "employees": 10,
+         "listed": False, "address": {"city": "Bogota"}},
+        {"uid": "b", "revenue": 3, "employees": 2 ** 70, "listed": 1, "extra": [1, 2]},
+        {"uid": "c", "name": 7, "revenue": True, "employees": None},
+    ]
+    for record in records:
+        table[record["uid"]] = dict(record)
+
+    for record in records:
+        assert table[record["uid"]] == record
+    assert isinstance(table["b"]["revenue"], int)
+    assert table["c"]["revenue"] is True
+    assert len(table) == 3 and "b" in table and table.get("z") is None
+
+
+def test_rows_are_reused_and_strings_stop_being_encoded():
+    """Deleted rows should be reused and large dictionaries turned into references."""
+    table = ColumnarTable({"name": "string"}, dictionary_limit=4)
+    for i in range(3):
+        table[str(i)] = {"name": "same"}
+    assert table.pop("1") == {"uid": "1", "name": "same"}
+    table["new"] = {}
+    assert table["new"] == {"uid": "new"}
+
+    for i in range(10):
+        table[f"n{i}"] = {"name": f"name-{i}"}
+
+    assert table["0"]["name"] == "same" and table["n9"]["name"] == "name-9"
+    assert sorted(uid for uid, _ in table.items()) == sorted(table)
+    with pytest.raises(KeyError):
+        table.pop("1")
+
+
+def test_columnar_layout_chosen_by_schema_and_restored(tmp_path):
+    """The x-layout keyword should select the layout, which survives a restart."""
+    schema = Schema(schema_keyname="company", schema_name="Company",
+                    schema_description="Company schema for tests",
+                    current_schema_definition=dict(DEFINITION, **{"x-layout": "columnar"}))
+    stores = StoresVanillaCacheDivision(VanillaPersistence(str(tmp_path), "stores"))
+    stores.create_store_of_schema(schema)
+    uid = stores.insert_data_into_store("company", {"name": "acme", "revenue": 2.5})
+    stores.checkpoint()
+    stores.update_data_in_store("company", {"employees": 3}, uid)
+    assert isinstance(stores._stores["company"], ColumnarTable)
+    stores._persistence.close()
+
+    restored = StoresVanillaCacheDivision(VanillaPersistence(str(tmp_path), "stores"))
+
+    assert restored.get_one_data_from_store("company", uid) == {
+        "uid": uid, "name": "acme", "revenue": 2.5, "employees": 3}
+    with pytest.raises(ValueError):
+        StoresVanillaCacheDivision(layout="rows")
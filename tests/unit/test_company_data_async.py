@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import patch, MagicMock
+
+import pytest
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.delete_company_data_async import delete_data_company_async
+from src.domain.use_cases.company_data.get_company_data_async import GetCompanyDataAsync
+from src.domain.use_cases.company_data.insert_company_data_async import InsertCompanyDataAsync
+from src.domain.use_cases.company_data.update_company_data_async import UpdateCompanyDataAsync
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+from src.infra.database.implementations.vanilla_cache.async_vanilla_cache_divisions import (
+    AsyncSchemaVanillaCacheDivision, AsyncStoresVanillaCacheDivision)
+
+MODULE = "src.domain.use_cases.company_data."
+
+
+@pytest.fixture
+def mock_db():
+    """Provides async vanilla divisions with a schema and store for 'person'."""
+    schema = Schema(schema_keyname="person", schema_name="Person",
+                    schema_description="Person schema for tests",
+                    current_schema_definition={
+                        "type": "object",
+                        "properties": {"name": {"type": "string"},
+                                       "country": {"type": "string", "x-index": True}},
+                        "required": ["name"]
+                    })
+    database = MagicMock()
+    database.schema_async = AsyncSchemaVanillaCacheDivision()
+    database.stores_async = AsyncStoresVanillaCacheDivision()
+    database.schema_async.division.create_schema(schema)
+    database.stores_async.division.create_store_of_schema(schema)
+    modules = ("insert_company_data_async", "get_company_data_async",
+               "update_company_data_async", "delete_company_data_async")
+    patches = [patch(MODULE + module + ".db", database) for module in modules]
+    for patcher in patches:
+        patcher.start()
+    yield database
+    for patcher in patches:
+        patcher.stop()
+    VALIDATOR_CACHE.invalidate("person")
+
+
+def test_insert_update_get_and_delete(mock_db):
+    """The async use cases should run the whole lifecycle of a record."""
+    async def scenario():
+        inserted = await InsertCompanyDataAsync()("person", {"name": "Ana", "country": "co"})
+        uid = inserted["inserted"]
+        await UpdateCompanyDataAsync()("person", {"country": "es"}, uid)
+        found = await GetCompanyDataAsync()("person", {"country": "es"})
+        deleted = await delete_data_company_async("person", uid)
+        remaining = await GetCompanyDataAsync()("person")
+        return uid, found, deleted, remaining
+
+    uid, found, deleted, remaining = asyncio.run(scenario())
+
+    assert [item["uid"] for item in found["data"]] == [uid]
+    assert deleted == {"deleted": uid}
+    assert remaining == {"data": []}
+
+
+def test_insert_reports_errors_and_missing_schema(mock_db):
+    """Invalid data should be reported and unknown schemas rejected."""
+    assert "errors" in asyncio.run(InsertCompanyDataAsync()("person", {"country": "co"}))
+    with pytest.raises(NotFound):
+        asyncio.run(InsertCompanyDataAsync()("unknown", {"name": "Ana"}))
+
+
+def test_pages_are_served_with_cursor(mock_db):
+    """Paginated reads should resume from the returned cursor, like the sync use case."""
+    mock_db.stores_async.division.insert_many_into_store(
+        "person", [{"name": str(i)} for i in range(5)])
+
+    async def read_all():
+        names, cursor = [], None
+        while True:
+            page = await GetCompanyDataAsync()("person", limit=2, cursor=cursor,
+                                               fields=["name"])
+            names.extend(item["name"] for item in page["data"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return names
+
+    assert asyncio.run(read_all()) == ["0", "1", "2", "3", "4"]
+
+
+def test_concurrent_requests_share_the_loop(mock_db):
+    """Many concurrent inserts on one event loop should all be stored."""
+    async def scenario():
+        use_case = InsertCompanyDataAsync()
+        await asyncio.gather(*(use_case("person", {"name": str(i)}) for i in range(500)))
+
+    asyncio.run(scenario())
+
+    assert len(mock_db.stores_async.division.get_data_from_store("person", None)) == 500
+
+
+def test_delete_missing_data_raises(mock_db):
+    """Deleting an unknown uid should raise NotFound."""
+    with pytest.raises(NotFound):
+        asyncio.run(delete_data_company_async("person", "missing"))
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+from jsonschema.validators import Draft7Validator
+
+from src.domain.validation.compiled_validator import compile_validator
+
+COMPANY = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 1, "maxLength": 12},
+        "country": {"type": "string", "pattern": "^[a-z]{2}$", "x-index": True},
+        "size": {"enum": ["small", "medium", "large"]},
+        "revenue": {"type": "number", "minimum": 0, "exclusiveMaximum": 1e9},
+        "employees": {"type": "integer", "exclusiveMinimum": 0, "maximum": 100000},
+        "listed": {"type": "boolean"},
+        "parent": {"type": ["string", "null"], "maxLength": 0},
+        "rating": {"enum": [1, 2.5, None, True, "n/a"]},
+        "address": {"type": "object",
+                    "properties": {"city": {"type": "string"}, "zip": {"type": "integer"}},
+                    "required": ["city"], "additionalProperties": False},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "contact": {"$ref": "#/definitions/contact"},
+        "blocked": False,
+        "anything": True,
+    },
+    "required": ["name", "country"],
+    "additionalProperties": {"type": ["string", "number"]},
+    "definitions": {"contact": {"type": "object", "required": ["email"]}},
+}
+
+SCHEMAS = [
+    COMPANY,
+    {"type": "object", "properties": {"a": {"type": "string"}}, "additionalProperties": False},
+    {"type": "object", "dependencies": {"a": ["b"]}, "properties": {"a": {"minimum": 3}}},
+    {"type": ["object", "array"], "minProperties": 1, "required": []},
+    {"enum": [[1], {"a": 1}]},
+    {"type": []},
+    {"title": "only annotations", "x-layout": "columnar", "format": "email"},
+    True,
+    False,
+]
+
+VALUES = [None, True, False, 0, 1, -1, 1.0, 2.5, 1e12, float("nan"), "", "co", "COL",
+          "medium", "n/a", "x" * 20, [], ["a", 1], {}, {"city": "Bogota"}, {"email": "a@b"},
+          {"zip": "1", "street": "x"}]
+FIELDS = list(COMPANY["properties"]) + ["extra", "other"]
+
+
+def error_pairs(validator, instance):
+    return [(repr(error.instance), error.message) for error in validator.iter_errors(instance)]
+
+
+def random_record(rng: random.Random) -> dict:
+    return {field: rng.choice(VALUES) for field in rng.sample(FIELDS, rng.randint(0, 8))}
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+def test_errors_match_jsonschema_on_random_instances(schema):
+    """The compiled validator should report the very errors of Draft7Validator."""
+    rng = random.Random(7)
+    compiled, reference = compile_validator(schema), Draft7Validator(schema)
+    instances = [random_record(rng) for _ in range(400)] + VALUES
+
+    for instance in instances:
+        expected = error_pairs(reference, instance)
+        assert sorted(error_pairs(compiled, instance)) == sorted(expected), instance
+        assert compiled.is_valid(instance) is not expected
+
+
+def test_errors_keep_the_jsonschema_order():
+    """Errors should come in the order of the keywords of the schema."""
+    record = {"name": "", "country": "COL", "employees": 0, "address": {"zip": 1}}
+
+    assert error_pairs(compile_validator(COMPANY), record) == error_pairs(
+        Draft7Validator(COMPANY), record)
+
+
+def test_unsupported_keywords_fall_back_to_jsonschema():
+    """Only the subschemas with unsupported keywords should be left to jsonschema."""
+    assert compile_validator(COMPANY).fallbacks == 2
+    assert compile_validator(SCHEMAS[1]).fallbacks == 0
+    assert compile_validator(SCHEMAS[2]).fallbacks == 1
+
+
+def test_subschemas_resolve_references_against_the_root():
+    """A property compiled on its own should resolve references in its definition."""
+    validator = compile_validator(COMPANY["properties"]["contact"], root=COMPANY)
+
+    assert error_pairs(validator, {}) == [("{}", "'email' is a required property")]
+
+
+def test_schema_values_are_not_injected_in_the_source():
+    """Property names and patterns are passed as constants, never as code."""
+    schema = {"properties": {"')\nimport os#": {"pattern": "'\"; x"}}, "required": ["\n"]}
+    validator = compile_validator(schema)
+
+    assert "import os" not in validator.source
+    assert error_pairs(validator, {"')\nimport os#": "a"}) == error_pairs(
+        Draft7Validator(schema), {"')\nimport os#": "a"})
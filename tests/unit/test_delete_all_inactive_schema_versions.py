@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.domain.use_cases.schema.delete_all_inactive_schema_version import (
+    JOB_NAME, delete_all_inactive_schema_versions)
+from src.infra.database.implementations.vanilla_cache.job_checkpoint_vanilla_cache_division import \
+    JobCheckpointVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.schema_def_version_vanilla_cache_div import \
+    SchemaDefVersionVanillaCacheDiv
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+
+DEFINITION = {"type": "object", "properties": {"name": {"type": "string"}}}
+
+
+@pytest.fixture
+def mock_db():
+    """Provides five schemas, each with a current, an old and a recent version."""
+    database = MagicMock()
+    database.schema = SchemaVanillaCacheDivision(thread_safe=True)
+    database.schema_version = SchemaDefVersionVanillaCacheDiv(thread_safe=True)
+    database.job_checkpoint = JobCheckpointVanillaCacheDivision(thread_safe=True)
+    now = datetime.now()
+    for i in range(5):
+        keyname = f"schema_{i}"
+        database.schema.create_schema(Schema(keyname, keyname, "Schema for pruning tests",
+                                             DEFINITION))
+        uids = [database.schema_version.create_schema_version(
+            SchemaDefinitionVersion(keyname, DEFINITION, created_at=now - timedelta(days=age)))
+            for age in (200, 100, 1)]
+        database.schema.update_schema_definition(keyname, uids[0], DEFINITION)
+    with patch("src.domain.use_cases.schema.delete_all_inactive_schema_version.db", database):
+        yield database
+
+
+def test_every_schema_is_pruned_and_reported(mock_db):
+    """Old versions other than the current one should be deleted and measured."""
+    res = delete_all_inactive_schema_versions(days=30, batch_size=2)
+
+    assert res["completed"] and res["resume_after"] is None
+    assert res["deleted"] == 5
+    assert sorted(res["result"]) == [f"schema_{i}" for i in range(5)]
+    report = res["result"]["schema_0"]
+    assert len(report["deleted"]) == 1
+    assert report["bytes_reclaimed"] == len(
+        '{"type":"object","properties":{"name":{"type":"string"}}}')
+    assert res["bytes_reclaimed"] == 5 * report["bytes_reclaimed"]
+    assert len(mock_db.schema_version.get_schema_versions("schema_3")) == 2
+    assert mock_db.job_checkpoint.get_checkpoint(JOB_NAME) is None
+
+
+def test_run_out_of_time_is_resumed(mock_db):
+    """A run exhausting its budget should save its progress and the next one resume it."""
+    first = delete_all_inactive_schema_versions(days=30, batch_size=2, time_budget=0)
+
+    assert not first["completed"]
+    assert sorted(first["result"]) == ["schema_0", "schema_1"]
+    assert mock_db.job_checkpoint.get_checkpoint(JOB_NAME) == {"after": "schema_1"}
+
+    second = delete_all_inactive_schema_versions(days=30, batch_size=2)
+
+    assert second["completed"]
+    assert sorted(second["result"]) == ["schema_2", "schema_3", "schema_4"]
+
+
+def test_failed_run_is_resumed_from_last_batch(mock_db):
+    """A failure should keep the progress of the batches already processed."""
+    original = mock_db.schema_version.delete_inactive_schema_versions
+
+    def failing(schema_keyname, **kwargs):
+        if schema_keyname == "schema_3":
+            raise RuntimeError("database unavailable")
+        return original(schema_keyname=schema_keyname, **kwargs)
+
+    with patch.object(mock_db.schema_version, "delete_inactive_schema_versions", failing):
+        with pytest.raises(RuntimeError):
+            delete_all_inactive_schema_versions(days=30, batch_size=2)
+
+    res = delete_all_inactive_schema_versions(days=30, batch_size=2)
+
+    assert sorted(res["result"]) == ["schema_2", "schema_3", "schema_4"]
+
+
+def test_parallel_workers(mock_db):
+    """Schemas of a batch can be processed by a worker pool."""
+    res = delete_all_inactive_schema_versions(days=30, batch_size=3, workers=3)
+
+    assert res["completed"] and res["deleted"] == 5
+
+
+def test_invalid_options(mock_db):
+    """Non-positive batch sizes and worker counts should be rejected."""
+    with pytest.raises(ValueError):
+        delete_all_inactive_schema_versions(batch_size=0)
+    with pytest.raises(ValueError):
+        delete_all_inactive_schema_versions(workers=0)
+
+
+def test_schema_pages_follow_keynames(tmp_path):
+    """Pages of schemas should be ordered by keyname through creations, deletions and restarts."""
+    schemas = SchemaVanillaCacheDivision(VanillaPersistence(str(tmp_path), "schemas"))
+    for keyname in ("delta", "alpha", "echo", "charlie", "bravo", "alpha"):
+        schemas.create_schema(Schema(keyname, keyname, "Schema for paging tests", DEFINITION))
+    schemas.delete_schema("charlie")
+
+    for division in (schemas,
+                     SchemaVanillaCacheDivision(VanillaPersistence(str(tmp_path), "schemas"))):
+        assert [s.schema_keyname for s in division.get_schemas_page(limit=2)] == [
+            "alpha", "bravo"]
+        assert [s.schema_keyname for s in division.get_schemas_page("bravo", 2)] == [
+            "delta", "echo"]
+        assert [s.schema_keyname for s in division.get_schemas_page("cat")] == [
+            "delta", "echo"]
+        assert division.get_schemas_page("echo") == []
@@ -0,0 +1,109 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.get_company_data import GetCompanyData
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+@pytest.fixture
+def stores():
+    """Provides a vanilla store with 25 'city' records."""
+    schema = Schema(schema_keyname="city", schema_name="City",
+                    schema_description="City schema for tests",
+                    current_schema_definition={"type": "object"})
+    division = StoresVanillaCacheDivision()
+    division.create_store_of_schema(schema)
+    for i in range(25):
+        division.insert_data_into_store("city", {"name": f"city{i}", "even": i % 2 == 0})
+    database = MagicMock()
+    database.stores = division
+    with patch("src.domain.use_cases.company_data.get_company_data.db", database):
+        yield division
+
+
+def test_without_pagination_returns_everything(stores):
+    """Without limit nor cursor the whole store is returned."""
+    res = GetCompanyData()("city")
+
+    assert len(res["data"]) == 25
+    assert "next_cursor" not in res
+
+
+def test_pages_cover_the_store_once(stores):
+    """Following next_cursor should visit every record exactly once."""
+    use_case = GetCompanyData()
+    seen = []
+    res = use_case("city", limit=10)
+    seen.extend(res["data"])
+    while res["next_cursor"]:
+        stores.insert_data_into_store("city", {"name": "late", "even": False})
+        res = use_case("city", limit=10, cursor=res["next_cursor"])
+        seen.extend(res["data"])
+
+    names = [item["name"] for item in seen]
+    assert names[:25] == [f"city{i}" for i in range(25)]
+    assert len(set(item["uid"] for item in seen)) == len(seen)
+
+
+def test_pagination_options_in_params(stores):
+    """limit and cursor mapped from the query params should not be used as filters."""
+    res = GetCompanyData()("city", {"even": True, "limit": "5"})
+
+    assert len(res["data"]) == 5
+    assert all(item["even"] for item in res["data"])
+    res = GetCompanyData()("city", {"even": True, "cursor": res["next_cursor"]})
+    assert len(res["data"]) == 8
+    assert res["next_cursor"] is None
+
+
+@pytest.mark.parametrize("kwargs", [{"limit": 0}, {"limit": "many"}, {"cursor": "not-a-cursor"}])
+def test_invalid_pagination(stores, kwargs):
+    """Invalid limits or cursors should raise ValueError."""
+    with pytest.raises(ValueError):
+        GetCompanyData()("city", **kwargs)
+
+
+def test_fields_projection(stores):
+    """Only the requested fields, plus uid, should be returned."""
+    res = GetCompanyData()("city", {"even": True, "fields": "name"})
+
+    assert len(res["data"]) == 13
+    assert all(set(item) == {"uid", "name"} for item in res["data"])
+
+    res = GetCompanyData()("city", limit=3, fields=["even", "missing"])
+    assert all(set(item) == {"uid", "even"} for item in res["data"])
+    assert "name" in stores.get_one_data_from_store("city", res["data"][0]["uid"])
+
+
+def test_unchanged_store_is_not_modified(stores):
+    """A known generation should be answered without reading the store until a write."""
+    use_case = GetCompanyData()
+    generation = use_case("city")["generation"]
+
+    with patch.object(stores, "get_data_from_store") as get_data:
+        assert use_case("city", if_generation=generation) == {"not_modified": True,
+                                                              "generation": generation}
+        assert use_case("city", {"if_generation": f'W/"{generation}"'})["not_modified"]
+        get_data.assert_not_called()
+
+    uid = stores.insert_data_into_store("city", {"name": "late", "even": False})
+    res = use_case("city", limit=5, if_generation=generation)
+    assert len(res["data"]) == 5 and res["generation"] != generation
+    stores.delete_data_from_store("city", uid)
+    assert use_case("city", if_generation=res["generation"])["generation"] not in (
+        generation, res["generation"])
+
+
+def test_recreated_store_gets_a_new_generation(stores):
+    """Generations of a store created again should not match the previous ones."""
+    generation = GetCompanyData()("city")["generation"]
+    stores.create_store_of_schema(Schema(schema_keyname="city", schema_name="City",
+                                         schema_description="City schema for tests",
+                                         current_schema_definition={"type": "object"}))
+    for i in range(25):
+        stores.insert_data_into_store("city", {"name": f"other{i}", "even": True})
+
+    assert "data" in GetCompanyData()("city", if_generation=generation)
@@ -0,0 +1,98 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.get_company_data_changes import GetCompanyDataChanges
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+SCHEMA = Schema(schema_keyname="city", schema_name="City",
+                schema_description="City schema for tests",
+                current_schema_definition={"type": "object"})
+
+
+@pytest.fixture
+def stores():
+    """Provides an empty vanilla 'city' store keeping its last 8 changes."""
+    division = StoresVanillaCacheDivision(change_log_retention=8)
+    division.create_store_of_schema(SCHEMA)
+    database = MagicMock()
+    database.stores = division
+    with patch("src.domain.use_cases.company_data.get_company_data_changes.db", database):
+        yield division
+
+
+def test_changes_replay_the_store(stores):
+    """Applying the changes since the first token should rebuild the store."""
+    use_case = GetCompanyDataChanges()
+    token = use_case("city")["next_token"]
+    uids = stores.insert_many_into_store("city", [{"name": "bogota"}, {"name": "lima"}])
+    stores.update_data_in_store("city", {"name": "quito"}, uids[1])
+    stores.delete_data_from_store("city", uids[0])
+
+    replica, res = {}, {"has_more": True, "next_token": token}
+    while res["has_more"]:
+        res = use_case("city", since=res["next_token"], limit=2)
+        for change in res["changes"]:
+            if change["op"] == "delete":
+                replica.pop(change["uid"], None)
+            else:
+                replica[change["uid"]] = change["data"]
+
+    assert [change["op"] for change in use_case("city", since=token)["changes"]] == [
+        "insert", "insert", "update", "delete"]
+    assert replica == {uids[1]: {"uid": uids[1], "name": "quito"}}
+    assert res["next_token"] == token[:-1] + "4" and not res["reset"]
+
+
+def test_expired_token_asks_for_a_reset(stores):
+    """A token older than the retained changes should ask the consumer to reset."""
+    use_case = GetCompanyDataChanges()
+    epoch = use_case("city")["next_token"].rpartition("-")[0]
+    for i in range(20):
+        stores.insert_data_into_store("city", {"name": f"city{i}"})
+
+    assert use_case("city", since=f"{epoch}-12")["changes"][0]["seq"] == 13
+    res = use_case("city", since=f"{epoch}-1")
+    assert res == {"changes": [], "next_token": f"{epoch}-20", "reset": True,
+                   "has_more": False}
+    assert use_case("city", since=f"{epoch}-21")["reset"]
+
+
+def test_token_of_a_store_created_again_asks_for_a_reset(stores):
+    """The sequence numbers of a store should not be taken for the ones of the next."""
+    use_case = GetCompanyDataChanges()
+    stores.insert_data_into_store("city", {"name": "bogota"})
+    token = use_case("city")["next_token"]
+    stores.create_store_of_schema(SCHEMA)
+    stores.insert_many_into_store("city", [{"name": "lima"}, {"name": "quito"}])
+
+    res = use_case("city", since=token)
+    assert res["reset"] and res["changes"] == []
+    assert res["next_token"] != token and res["next_token"].endswith("-2")
+    assert not use_case("city", since=res["next_token"])["reset"]
+
+
+@pytest.mark.parametrize("since", ["abc", "12", "e-x", "e-1.5", "-3", "e-", 3, True])
+def test_invalid_token_is_rejected(stores, since):
+    """Only the tokens returned as next_token should be accepted."""
+    with pytest.raises(ValueError):
+        GetCompanyDataChanges()("city", since=since)
+
+
+def test_change_log_survives_restart(tmp_path):
+    """The sequence numbers should go on from where they were after a restart."""
+    stores = StoresVanillaCacheDivision(VanillaPersistence(str(tmp_path), "stores"))
+    stores.create_store_of_schema(SCHEMA)
+    uid = stores.insert_data_into_store("city", {"name": "bogota"})
+    stores.checkpoint()
+    stores.update_data_in_store("city", {"name": "cali"}, uid)
+
+    restarted = StoresVanillaCacheDivision(VanillaPersistence(str(tmp_path), "stores"))
+    restarted.delete_data_from_store("city", uid)
+
+    changes = restarted.get_changes_from_store("city", 0, 10)["changes"]
+    assert [(change["seq"], change["op"]) for change in changes] == [
+        (1, "insert"), (2, "update"), (3, "delete")]
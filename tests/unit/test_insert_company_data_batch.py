@@ -0,0 +1,61 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.insert_company_data_batch import InsertCompanyDataBatch
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+@pytest.fixture
+def mock_db():
+    """Provides a database with a vanilla schema and store for 'person'."""
+    schema = Schema(schema_keyname="person", schema_name="Person",
+                    schema_description="Person schema for tests",
+                    current_schema_definition={
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}, "age": {"type": "integer"}},
+                        "required": ["name"]
+                    })
+    database = MagicMock()
+    database.schema = SchemaVanillaCacheDivision()
+    database.stores = StoresVanillaCacheDivision()
+    database.schema.create_schema(schema)
+    database.stores.create_store_of_schema(schema)
+    with patch("src.domain.use_cases.company_data.insert_company_data_batch.db", database):
+        yield database
+
+
+def test_batch_reports_each_record_by_index(mock_db):
+    """Valid records should be inserted and invalid ones reported with their errors."""
+    records = [{"name": "Ana", "age": 30}, {"age": "old"}, {"name": "Luis"}]
+
+    result = InsertCompanyDataBatch()("person", records)
+
+    assert result["inserted"] == 2
+    assert result["failed"] == 1
+    assert [r["index"] for r in result["results"]] == [0, 1, 2]
+    assert "inserted" in result["results"][0]
+    assert "inserted" in result["results"][2]
+    assert len(result["results"][1]["errors"]) == 2
+    stored = mock_db.stores.get_data_from_store("person", None)
+    assert {item["uid"] for item in stored} == {result["results"][0]["inserted"],
+                                                result["results"][2]["inserted"]}
+
+
+def test_batch_without_valid_records_skips_store(mock_db):
+    """A batch with only invalid records should not touch the store."""
+    result = InsertCompanyDataBatch()("person", [{"age": 1}])
+
+    assert result["inserted"] == 0
+    assert mock_db.stores.get_data_from_store("person", None) == []
+
+
+def test_batch_unknown_schema(mock_db):
+    """An unknown schema keyname should raise NotFound."""
+    with pytest.raises(NotFound):
+        InsertCompanyDataBatch()("unknown", [{"name": "Ana"}])
@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.domain.metrics.registry import MetricsRegistry, METRICS
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.insert_company_data import InsertCompanyData
+from src.domain.use_cases.metrics.get_metrics import GetMetrics
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+from src.infra.database.implementations.instrumentation.instrumented_division import \
+    InstrumentedDivision
+from src.infra.database.implementations.vanilla_cache.async_vanilla_cache_divisions import \
+    AsyncSchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+SCHEMA = Schema(schema_keyname="person", schema_name="Person",
+                schema_description="Person schema for tests",
+                current_schema_definition={"type": "object",
+                                           "properties": {"name": {"type": "string"}},
+                                           "required": ["name"]})
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_histogram_is_rendered_cumulatively(registry):
+    """Buckets should be cumulative and include values equal to their bound."""
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0), op="get")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{op="get",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{op="get",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{op="get",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{op="get"} 4' in text
+    assert registry.histogram("latency_seconds", "Latency.", op="get") is histogram
+
+
+def test_kind_conflict_and_label_escaping(registry):
+    """A name keeps its kind and label values are escaped."""
+    registry.counter("events_total", "Events.", source='a "quoted"\nvalue').inc(2)
+
+    assert 'events_total{source="a \\"quoted\\"\\nvalue"} 2' in registry.render_prometheus()
+    with pytest.raises(ValueError):
+        registry.histogram("events_total", "Events.")
+
+
+def test_division_calls_errors_and_latencies(registry):
+    """Each method should count its calls and errors and time them."""
+    schema_division = SchemaVanillaCacheDivision()
+    division = InstrumentedDivision(schema_division, "schema", registry)
+    division.create_schema(SCHEMA)
+    assert division.get_schema("person").schema_name == "Person"
+    with patch.object(schema_division, "update_schema_definition",
+                      side_effect=RuntimeError("unavailable")):
+        with pytest.raises(RuntimeError):
+            division.update_schema_definition("person", None, {})
+
+    text = registry.render_prometheus()
+
+    assert 'division_calls_total{division="schema",method="get_schema"} 1' in text
+    assert 'division_errors_total{division="schema",method="get_schema"} 0' in text
+    assert ('division_errors_total{division="schema",method="update_schema_definition"} 1'
+            in text)
+    assert ('division_call_duration_seconds_count{division="schema",method="create_schema"} 1'
+            in text)
+    assert division.get_schema is division.get_schema
+
+
+def test_async_division_is_timed_until_completion(registry):
+    """Coroutine methods should stay awaitable and be measured."""
+    division = InstrumentedDivision(AsyncSchemaVanillaCacheDivision(), "schema_async",
+                                    registry)
+    asyncio.run(division.create_schema(SCHEMA))
+
+    assert asyncio.run(division.get_schema("person")).schema_keyname == "person"
+    assert ('division_calls_total{division="schema_async",method="get_schema"} 1'
+            in registry.render_prometheus())
+
+
+def test_insert_separates_validation_from_store_time():
+    """The insert use case should time validation apart from the store division."""
+    database = MagicMock()
+    database.schema = SchemaVanillaCacheDivision()
+    database.schema.create_schema(SCHEMA)
+    stores = StoresVanillaCacheDivision()
+    stores.create_store_of_schema(SCHEMA)
+    database.stores = InstrumentedDivision(stores, "stores")
+    METRICS.clear()
+    try:
+        with patch("src.domain.use_cases.company_data.insert_company_data.db", database):
+            InsertCompanyData()("person", {"name": "Ana"})
+            InsertCompanyData()("person", {"name": 1})
+
+        body = GetMetrics()()["body"]
+    finally:
+        VALIDATOR_CACHE.invalidate("person")
+
+    assert ('use_case_stage_duration_seconds_count{stage="validation",'
+            'use_case="insert_company_data"} 2' in body)
+    assert ('division_calls_total{division="stores",method="insert_data_into_store"} 1'
+            in body)
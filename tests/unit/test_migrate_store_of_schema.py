@@ -0,0 +1,127 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.migration.store_migration_runner import StoreMigrationRunner
+from src.domain.model.schema import Schema
+from src.domain.use_cases.schema.get_store_migration_status import GetStoreMigrationStatus
+from src.domain.use_cases.schema.migrate_store_of_schema import (
+    COMPLETED, FAILED, PENDING, RUNNING, MigrateStoreOfSchema, migration_job_name,
+    register_store_transform)
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+from src.infra.database.implementations.vanilla_cache.job_checkpoint_vanilla_cache_division import \
+    JobCheckpointVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+MODULES = ("src.domain.use_cases.schema.migrate_store_of_schema",
+           "src.domain.use_cases.schema.get_store_migration_status",
+           "src.domain.migration.store_migration_runner")
+NEW_DEFINITION = {"type": "object",
+                  "properties": {"name": {"type": "string"},
+                                 "country": {"type": "string", "default": "co"}},
+                  "required": ["name", "country"]}
+
+
+@pytest.fixture
+def mock_db():
+    """Provides a 'company' store of 10 records, 3 of them without a name."""
+    database = MagicMock()
+    database.schema = SchemaVanillaCacheDivision(thread_safe=True)
+    database.stores = StoresVanillaCacheDivision(thread_safe=True)
+    database.job_checkpoint = JobCheckpointVanillaCacheDivision()
+    schema = Schema("company", "Company", "Company schema for migration tests",
+                    {"type": "object"}, current_version="v1")
+    database.schema.create_schema(schema)
+    database.stores.create_store_of_schema(schema)
+    database.stores.insert_many_into_store(
+        "company", [{"name": f"c{i}"} if i % 3 else {"code": i} for i in range(10)])
+    database.schema.update_schema_definition("company", "v2", NEW_DEFINITION)
+    patches = [patch(module + ".db", database) for module in MODULES]
+    for patcher in patches:
+        patcher.start()
+    yield database
+    for patcher in patches:
+        patcher.stop()
+    register_store_transform("company", None)
+    VALIDATOR_CACHE.invalidate("company")
+
+
+def test_records_are_revalidated_and_defaults_filled(mock_db):
+    """Valid records get their defaults, invalid ones are reported and left untouched."""
+    res = MigrateStoreOfSchema()("company", batch_size=3, fill_defaults=True)
+
+    assert res["state"] == COMPLETED and res["version"] == "v2"
+    assert (res["scanned"], res["migrated"], res["invalid"]) == (10, 6, 4)
+    assert res["invalid_sample"][0]["errors"] == [
+        "Error in '{'code': 0, 'country': 'co'}': 'name' is a required property"]
+    records = mock_db.stores.get_data_from_store("company", None)
+    assert sum(record.get("country") == "co" for record in records) == 6
+    assert GetStoreMigrationStatus()("company") == res
+
+
+def test_without_transform_nothing_is_written(mock_db):
+    """A plain migration only re-validates the records."""
+    with patch.object(mock_db.stores, "update_data_in_store") as update:
+        res = MigrateStoreOfSchema()("company")
+
+    assert (res["scanned"], res["migrated"], res["invalid"]) == (10, 0, 10)
+    update.assert_not_called()
+
+
+def test_run_out_of_time_is_resumed(mock_db):
+    """A run exhausting its budget should save its progress and the next one resume it."""
+    register_store_transform("company", lambda record: {"country": "es", "name": "x"})
+    first = MigrateStoreOfSchema()("company", batch_size=4, time_budget=0)
+
+    assert first["state"] == RUNNING and first["scanned"] == 4
+    assert mock_db.job_checkpoint.get_checkpoint(migration_job_name("company")) == first
+
+    second = MigrateStoreOfSchema()("company", batch_size=4)
+
+    assert second["state"] == COMPLETED
+    assert (second["scanned"], second["migrated"], second["invalid"]) == (10, 10, 0)
+
+
+def test_definition_change_restarts_the_migration(mock_db):
+    """Progress made for an older definition should be discarded."""
+    MigrateStoreOfSchema()("company", batch_size=4, time_budget=0)
+    mock_db.schema.update_schema_definition("company", "v3", {"type": "object"})
+
+    res = MigrateStoreOfSchema()("company", batch_size=4)
+
+    assert res["version"] == "v3" and res["scanned"] == 10 and res["invalid"] == 0
+
+
+def test_failures_are_saved(mock_db):
+    """A failing batch should leave the migration failed, with its error."""
+    with patch.object(mock_db.stores, "iter_data_from_store",
+                      side_effect=RuntimeError("unavailable")):
+        with pytest.raises(RuntimeError):
+            MigrateStoreOfSchema()("company")
+
+    status = GetStoreMigrationStatus()("company")
+    assert status["state"] == FAILED and status["error"] == "unavailable"
+    with pytest.raises(NotFound):
+        GetStoreMigrationStatus()("unknown")
+
+
+def test_runner_migrates_in_the_background(mock_db):
+    """A scheduled store should be pending at once and migrated by the worker."""
+    runner = StoreMigrationRunner(batch_size=4, duty_cycle=0.5, fill_defaults=True)
+    with patch.object(runner, "_work"):
+        assert runner.schedule("company")
+    assert GetStoreMigrationStatus()("company")["state"] == PENDING
+    runner.stop()
+
+    runner.schedule("company")
+    runner.join()
+    runner.stop()
+
+    status = GetStoreMigrationStatus()("company")
+    assert status["state"] == COMPLETED and status["migrated"] == 6
+    assert not StoreMigrationRunner(enabled=False).schedule("company")
+    assert not StoreMigrationRunner().schedule("deleted")
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from src.domain.query.filters import compile_params, range_bounds, validate_params
+from src.infra.database.implementations.vanilla_cache.sorted_index import SortedIndex, SortedKeys
+
+
+@pytest.mark.parametrize("params", [
+    {"$where": "1"},
+    {"revenue": {"$regex": "a"}},
+    {"revenue": {"$gt": 1, "name": "a"}},
+    {"country": {"$in": "co"}},
+])
+def test_invalid_filters(params):
+    """Unknown operators, operator fields and malformed expressions are rejected."""
+    with pytest.raises(ValueError):
+        validate_params(params)
+
+
+def test_operators_semantics():
+    """Range operators only match values of the kind of their bound."""
+    records = [{"revenue": 10}, {"revenue": 20.5}, {"revenue": "30"}, {"revenue": True}, {}]
+    matches = compile_params({"revenue": {"$gt": 5, "$lte": 20.5}})
+    assert [r for r in records if matches(r)] == records[:2]
+
+    matches = compile_params({"revenue": {"$ne": 10}, "name": {"$in": [None, "acme"]}})
+    assert [r for r in records if matches(r)] == records[1:]
+    assert compile_params({"address": {"city": "x"}})({"address": {"city": "x"}})
+
+
+def test_range_bounds_are_merged():
+    """The tightest bounds of an expression should be kept."""
+    assert range_bounds({"$gt": 1, "$gte": 1, "$lt": 9, "$lte": 5}) == (1, False, 5, True)
+    assert range_bounds({"$in": [1]}) is None
+    assert range_bounds({"$gt": 1, "$lt": "z"}) is None
+    assert range_bounds({"$gt": {"a": 1}, "$gte": {"a": 2}}) is None
+
+
+def test_sorted_keys_match_a_sorted_list():
+    """Random inserts and removes should keep the buckets in order."""
+    keys = SortedKeys()
+    keys.load = 4
+    rnd = random.Random(3)
+    expected = set()
+    for _ in range(500):
+        key = rnd.randrange(200)
+        if key in expected:
+            keys.remove(key)
+            expected.discard(key)
+        else:
+            keys.add(key)
+            expected.add(key)
+    assert list(keys.irange()) == sorted(expected)
+    assert list(keys.irange(50, False, 120, True)) == [k for k in sorted(expected)
+                                                        if 50 < k <= 120]
+    assert len(keys) == len(expected)
+
+
+def test_sorted_index_keeps_kinds_apart():
+    """Numbers and strings are indexed in their own order, other values are skipped."""
+    index = SortedIndex()
+    for uid, value in enumerate([1, 2.5, "b", True, None, float("nan"), 3]):
+        index.add(value, uid)
+
+    assert index.range(2, True, None, True) == {1, 6}
+    assert index.range(None, True, "z", False) == {2}
+    assert index.range(None, True, None, True) is None
+    index.remove(3, 6)
+    assert index.range(2, True) == {1}
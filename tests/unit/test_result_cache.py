@@ -0,0 +1,130 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.domain.metrics.registry import MetricsRegistry
+from src.domain.model.schema import Schema
+from src.domain.query.result_cache import ResultCache
+from src.domain.use_cases.company_data.get_company_data import GetCompanyData
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+def make_schema(schema_keyname: str) -> Schema:
+    """Build a schema with an indexed 'country' property."""
+    return Schema(schema_keyname=schema_keyname, schema_name=schema_keyname.title(),
+                  schema_description="Schema for tests",
+                  current_schema_definition={
+                      "type": "object",
+                      "properties": {"country": {"type": "string", "x-index": True}}
+                  })
+
+
+@pytest.fixture
+def cache():
+    """Provides a result cache of 10 records, up to 6 per result, with 'city' opted in."""
+    return ResultCache(max_records=10, max_result_records=6, schemas=["city"],
+                       registry=MetricsRegistry())
+
+
+@pytest.fixture
+def stores(cache):
+    """Provides vanilla 'city' and 'town' stores read through the given cache."""
+    division = StoresVanillaCacheDivision()
+    for keyname in ("city", "town"):
+        division.create_store_of_schema(make_schema(keyname))
+        for i in range(6):
+            division.insert_data_into_store(keyname, {"name": f"{keyname}{i}",
+                                                      "country": "co" if i % 2 else "es"})
+    database = MagicMock()
+    database.stores = division
+    with patch("src.domain.use_cases.company_data.get_company_data.db", database), \
+            patch("src.domain.use_cases.company_data.get_company_data.RESULT_CACHE", cache):
+        yield division
+
+
+def test_repeated_reads_are_served_from_the_cache(cache, stores):
+    """The same read, whatever the order of its params, should only scan the store once."""
+    use_case = GetCompanyData()
+    first = use_case("city", {"country": "co", "name": {"$ne": "x"}})
+
+    with patch.object(stores, "get_data_from_store") as get_data:
+        assert use_case("city", {"name": {"$ne": "x"}, "country": "co"}) == first
+        get_data.assert_not_called()
+    assert use_case("city", {"country": "co"}, fields="name")["data"] != first["data"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_writes_invalidate_only_their_store(cache, stores):
+    """A write should drop the results of its store, not the ones of the others."""
+    cache.enable("town")
+    use_case = GetCompanyData()
+    use_case("city", {"country": "co"})
+    use_case("town", limit=2)
+
+    uid = stores.insert_data_into_store("city", {"name": "late", "country": "co"})
+    assert len(use_case("city", {"country": "co"})["data"]) == 4
+    use_case("town", limit=2)
+    stores.update_data_in_store("city", {"country": "es"}, uid)
+    assert len(use_case("city", {"country": "co"})["data"]) == 3
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 4, 2)
+
+
+def test_schemas_not_opted_in_are_not_cached(cache, stores):
+    """Reads of schemas not opted in should neither be cached nor counted."""
+    GetCompanyData()("town")
+    GetCompanyData()("town")
+
+    assert cache.stats()["size"] == 0 and cache.stats()["misses"] == 0
+    cache.enable("town")
+    GetCompanyData()("town", {"country": "es"})
+    cache.disable("town")
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_results_are_evicted(cache):
+    """The cache should hold at most max_records records, evicting the oldest reads."""
+    keys = [cache.key("city", {"n": i}) for i in range(4)]
+    records = [{"uid": str(i)} for i in range(3)]
+    for key in keys[:3]:
+        assert cache.put(key, "g-1", {"data": records}, 3)
+    cache.get(keys[0], "g-1")
+    cache.put(keys[3], "g-1", {"data": records}, 3)
+
+    assert cache.get(keys[1], "g-1") is None
+    assert cache.get(keys[0], "g-1") is not None
+    assert not cache.put(cache.key("city", {"big": True}), "g-1", {"data": records * 3}, 9)
+    assert cache.stats()["records"] == 9 and cache.stats()["evictions"] == 1
+
+
+def test_hit_rate_metrics():
+    """Lookups should be counted per schema and result in the registry."""
+    registry = MetricsRegistry()
+    cache = ResultCache(schemas=["city"], registry=registry)
+    key = cache.key("city", None)
+    cache.get(key, "g-1")
+    cache.put(key, "g-1", {"data": []}, 0)
+    cache.get(key, "g-1")
+    cache.get(key, "g-1")
+
+    metrics = registry.render_prometheus()
+    assert 'company_data_cache_lookups_total{result="hit",schema="city"} 2' in metrics
+    assert 'company_data_cache_lookups_total{result="miss",schema="city"} 1' in metrics
+    assert cache.stats()["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_cached_results_are_not_shared(cache, stores):
+    """Callers changing the records they got should not change the cached ones."""
+    stores.insert_data_into_store("city", {"name": "nested", "country": "pe",
+                                           "tags": {"capital": True}})
+    use_case = GetCompanyData()
+    first = use_case("city", {"country": "pe"})
+    first["data"][0]["name"] = "changed"
+    first["data"][0]["tags"]["capital"] = False
+    first["data"].clear()
+
+    second = use_case("city", {"country": "pe"})
+    assert cache.stats()["hits"] == 1
+    assert second["data"][0]["name"] == "nested" and second["data"][0]["tags"]["capital"]
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_base import SchemaBase
+from src.infra.database.implementations.caching.schema_caching_division import \
+    SchemaCachingDivision
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Provides a manually advanced clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def inner():
+    """Provides a vanilla schema division spied by a mock."""
+    return MagicMock(wraps=SchemaVanillaCacheDivision())
+
+
+@pytest.fixture
+def cached(inner, clock):
+    """Provides the caching division around the spied one."""
+    return SchemaCachingDivision(inner, max_size=2, ttl=10, negative_ttl=1, clock=clock)
+
+
+def make_schema(keyname: str) -> Schema:
+    """Build a schema with the given keyname."""
+    return Schema(schema_keyname=keyname, schema_name="Some Name",
+                  schema_description="Some schema description",
+                  current_schema_definition={"type": "object"})
+
+
+def test_read_through_and_ttl(cached, inner, clock):
+    """Lookups should reach the wrapped division only on misses and after the TTL."""
+    cached.create_schema(make_schema("company"))
+
+    assert cached.get_schema("company").schema_keyname == "company"
+    cached.get_schema("company")
+    assert inner.get_schema.call_count == 1
+
+    clock.now = 11
+    cached.get_schema("company")
+    assert inner.get_schema.call_count == 2
+    assert cached.stats()["hits"] == 1
+
+
+def test_negative_caching(cached, inner, clock):
+    """Unknown keynames should be remembered for the negative TTL."""
+    assert cached.get_schema("unknown") is None
+    assert cached.get_schema("unknown") is None
+    assert inner.get_schema.call_count == 1
+    assert cached.stats()["negative_hits"] == 1
+
+    clock.now = 2
+    cached.get_schema("unknown")
+    assert inner.get_schema.call_count == 2
+
+
+def test_writes_invalidate(cached, inner):
+    """Creating, updating or deleting a schema should drop its cached entry."""
+    assert cached.get_schema("company") is None
+    cached.create_schema(make_schema("company"))
+    assert cached.get_schema("company") is not None
+
+    cached.update_schema_definition("company", 2, {"type": "array"})
+    assert cached.get_schema("company").current_schema_definition == {"type": "array"}
+
+    cached.update_schema(SchemaBase("company", "New Name", "New schema description"))
+    assert cached.get_schema("company").schema_name == "New Name"
+
+    cached.delete_schema("company")
+    assert cached.get_schema("company") is None
+    assert inner.get_schema.call_count == 5
+
+
+def test_lru_eviction(cached, inner):
+    """Exceeding max_size should evict the least recently used keyname."""
+    for keyname in ("first", "second", "first", "third", "first"):
+        cached.get_schema(keyname)
+
+    assert cached.stats()["evictions"] == 1
+    assert inner.get_schema.call_count == 3
+
+
+def test_invalidation_during_a_miss_is_kept(cached, inner):
+    """A schema read before a racing invalidation should not be cached."""
+    cached.create_schema(make_schema("company"))
+    stale = inner.get_schema("company")
+
+    def read_then_invalidate(keyname):
+        # another thread updates the schema after the read reached the backend
+        cached.update_schema_definition(keyname, 2, {"type": "array"})
+        return stale
+
+    inner.get_schema.side_effect = read_then_invalidate
+    assert cached.get_schema("company") is stale
+    inner.get_schema.side_effect = None
+
+    assert cached.get_schema("company").current_schema_definition == {"type": "array"}
+    assert cached.get_schema("company").current_schema_definition == {"type": "array"}
+    assert cached.stats()["hits"] == 1
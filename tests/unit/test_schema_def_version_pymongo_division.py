@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.implementations.pymongo.schema_def_version_pymongo_division import \
+    SchemaDefVersionMongoDivision
+
+
+@pytest.fixture
+def versions():
+    """Provides a Mongo schema version division over mongomock."""
+    return SchemaDefVersionMongoDivision(mongomock.MongoClient(), "registry")
+
+
+def create_version(division, keyname: str, age_days: int) -> str:
+    """Create a version of a schema created some days ago."""
+    return division.create_schema_version(SchemaDefinitionVersion(
+        schema_keyname=keyname, schema_definition={"type": "object"},
+        created_at=datetime.now() - timedelta(days=age_days)))
+
+
+def test_compound_index_is_created(versions):
+    """The (schema_keyname, created_at) index should exist after initialization."""
+    indexes = versions.get_collection("schema_versions").index_information()
+
+    assert indexes["schema_keyname_created_at"]["key"] == [("schema_keyname", 1),
+                                                           ("created_at", 1)]
+
+
+def test_versions_are_sorted_and_paginated(versions):
+    """Versions should be listed oldest first and support limit/offset."""
+    uids = [create_version(versions, "company", age) for age in (10, 30, 20)]
+    create_version(versions, "language", 5)
+
+    listed = versions.get_schema_versions("company")
+    assert [v.schema_version_id for v in listed] == [uids[1], uids[2], uids[0]]
+    page = versions.get_schema_versions("company", limit=1, offset=1)
+    assert [v.schema_version_id for v in page] == [uids[2]]
+    assert versions.get_schema_version(uids[0]).schema_keyname == "company"
+
+
+def test_delete_inactive_versions_keeps_current_and_recent(versions):
+    """Only old versions other than the current one should be pruned."""
+    old_current = create_version(versions, "company", 90)
+    old = create_version(versions, "company", 60)
+    recent = create_version(versions, "company", 1)
+    other = create_version(versions, "language", 90)
+
+    deleted = versions.delete_inactive_schema_versions("company", old_current, days=30)
+
+    assert deleted == [old]
+    remaining = {v.schema_version_id for v in versions.get_schema_versions("company")}
+    assert remaining == {old_current, recent}
+    assert versions.get_schema_version(other) is not None
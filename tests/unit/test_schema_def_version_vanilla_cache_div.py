@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.schema_def_version_vanilla_cache_div import \
+    SchemaDefVersionVanillaCacheDiv
+
+
+@pytest.fixture
+def versions():
+    """Provides a division with versions of two schemas, inserted out of date order."""
+    division = SchemaDefVersionVanillaCacheDiv()
+    now = datetime.now()
+    for keyname, days_ago in [("company", 90), ("company", 10), ("person", 70),
+                              ("company", 120), ("company", 1)]:
+        division.create_schema_version(SchemaDefinitionVersion(
+            keyname, {"type": "object", "title": f"{keyname}-{days_ago}"},
+            created_at=now - timedelta(days=days_ago)))
+    return division
+
+
+def titles(versions):
+    """Get the titles of the definitions of the given versions."""
+    return [v.schema_definition["title"] for v in versions]
+
+
+def test_versions_are_listed_by_creation_date(versions):
+    """Versions of a schema should be listed oldest first, paginated and with their uid."""
+    listed = versions.get_schema_versions("company")
+
+    assert titles(listed) == ["company-120", "company-90", "company-10", "company-1"]
+    assert titles(versions.get_schema_versions("company", limit=2, offset=1)) == [
+        "company-90", "company-10"]
+    assert all(versions.get_schema_version(v.schema_version_id) is v for v in listed)
+    assert versions.get_schema_versions("unknown") == []
+
+
+def test_inactive_versions_are_pruned_except_current(versions):
+    """Old versions of the schema should be deleted, keeping the current and other schemas."""
+    current = versions.get_schema_versions("company")[0].schema_version_id
+
+    deleted = versions.delete_inactive_schema_versions("company", current, days=60)
+
+    assert len(deleted) == 1
+    assert versions.get_schema_version(deleted[0]) is None
+    assert titles(versions.get_schema_versions("company")) == [
+        "company-120", "company-10", "company-1"]
+    assert titles(versions.get_schema_versions("person")) == ["person-70"]
+
+
+def test_delete_schema_version(versions):
+    """Deleting a version should remove it from the listing; unknown uids give None."""
+    uid = versions.get_schema_versions("company")[1].schema_version_id
+
+    assert versions.delete_schema_version(uid) == uid
+    assert versions.delete_schema_version(uid) is None
+    assert titles(versions.get_schema_versions("company")) == [
+        "company-120", "company-10", "company-1"]
+
+
+def test_index_is_rebuilt_on_restart(tmp_path):
+    """The per-schema ordering should be restored from the snapshot and the log."""
+    division = SchemaDefVersionVanillaCacheDiv(VanillaPersistence(str(tmp_path), "versions"))
+    now = datetime.now()
+    for days_ago in (5, 50, 20):
+        division.create_schema_version(SchemaDefinitionVersion(
+            "company", {"type": "object", "title": str(days_ago)},
+            created_at=now - timedelta(days=days_ago)))
+    division.checkpoint()
+    division.delete_inactive_schema_versions("company", None, days=30)
+
+    restored = SchemaDefVersionVanillaCacheDiv(VanillaPersistence(str(tmp_path), "versions"))
+
+    assert titles(restored.get_schema_versions("company")) == ["20", "5"]
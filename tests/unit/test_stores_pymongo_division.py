@@ -0,0 +1,204 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.pymongo.stores_pymongo_division import \
+    StoresMongoDivision
+
+
+def make_schema(definition: dict) -> Schema:
+    """Build the 'company' schema with the given definition."""
+    return Schema(schema_keyname="company", schema_name="Company",
+                  schema_description="Company schema for tests",
+                  current_schema_definition=definition)
+
+
+@pytest.fixture
+def stores():
+    """Provides a Mongo store division over mongomock with the 'company' store created."""
+    division = StoresMongoDivision(mongomock.MongoClient(), "registry")
+    division.create_store_of_schema(make_schema({
+        "type": "object",
+        "properties": {"name": {"type": "string"},
+                       "country": {"type": "string", "x-index": True}}
+    }))
+    return division
+
+
+def test_indexes_follow_definition(stores):
+    """Store creation and alteration should keep the x-index indexes in sync."""
+    collection = stores.get_collection("store_company")
+    assert "x_index_country" in collection.index_information()
+
+    stores.alter_store_of_schema(make_schema({
+        "type": "object",
+        "properties": {"name": {"type": "string", "x-index": True},
+                       "country": {"type": "string"}}
+    }))
+
+    indexes = collection.index_information()
+    assert "x_index_name" in indexes
+    assert "x_index_country" not in indexes
+
+
+def test_insert_read_update_delete(stores):
+    """A record should go through the whole lifecycle with a string uid."""
+    uid = stores.insert_data_into_store("company", {"name": "acme", "country": "co"})
+
+    assert stores.get_one_data_from_store("company", uid) == {"uid": uid, "name": "acme",
+                                                              "country": "co"}
+    assert stores.update_data_in_store("company", {"country": "es"}, uid) == uid
+    assert stores.get_data_from_store("company", {"country": "es"})[0]["uid"] == uid
+    assert stores.get_data_from_store("company", {"uid": uid}, ["name"]) == [
+        {"uid": uid, "name": "acme"}]
+    assert stores.delete_data_from_store("company", uid) == uid
+    assert stores.delete_data_from_store("company", uid) is None
+    assert stores.get_one_data_from_store("company", "not-an-object-id") is None
+
+
+def test_bulk_insert_and_delete(stores):
+    """Bulk operations should return uids in order and count deletions."""
+    uids = stores.insert_many_into_store("company", [{"name": f"c{i}"} for i in range(5)])
+
+    assert [stores.get_one_data_from_store("company", uid)["name"] for uid in uids] == [
+        f"c{i}" for i in range(5)]
+    assert stores.delete_many_from_store("company", uids[:3] + ["bad"]) == 3
+    assert len(stores.get_data_from_store("company", None)) == 2
+
+
+def test_iter_pages_through_batches(stores):
+    """Streaming should cross batch boundaries and resume after a position."""
+    stores.batch_size = 2
+    uids = stores.insert_many_into_store("company", [{"name": f"c{i}"} for i in range(5)])
+
+    streamed = list(stores.iter_data_from_store("company", None, fields=["name"]))
+
+    assert [position for position, _ in streamed] == uids
+    assert all(set(record) == {"uid", "name"} for _, record in streamed)
+    rest = [position for position, _ in stores.iter_data_from_store("company", {}, uids[2])]
+    assert rest == uids[3:]
+
+
+def test_query_operators(stores):
+    """Operator expressions, including on uid, should be applied by Mongo."""
+    uids = stores.insert_many_into_store("company", [{"name": f"c{i}", "revenue": i * 10}
+                                                     for i in range(5)])
+
+    res = stores.get_data_from_store("company", {"revenue": {"$gte": 10, "$lt": 40},
+                                                 "name": {"$ne": "c2"}})
+    assert [item["uid"] for item in res] == [uids[1], uids[3]]
+    res = stores.get_data_from_store("company", {"uid": {"$in": uids[:2] + ["bad"]}})
+    assert sorted(item["uid"] for item in res) == sorted(uids[:2])
+    assert stores.get_data_from_store("company", {"uid": {"$gt": "bad"}}) == []
+    streamed = stores.iter_data_from_store("company", {"uid": {"$ne": uids[0]}}, uids[1])
+    assert [position for position, _ in streamed] == uids[2:]
+    with pytest.raises(ValueError):
+        stores.get_data_from_store("company", {"$where": "true"})
+
+
+def test_aggregation_pipeline_matches_vanilla(stores):
+    """The aggregation pushed down to Mongo should give the vanilla store's result."""
+    records = [{"name": "a", "country": "co", "revenue": 10, "sector": "tech"},
+               {"name": "b", "country": "co", "revenue": 2.5, "sector": "bank"},
+               {"name": "c", "country": "es", "revenue": "n/a", "sector": "tech"},
+               {"name": "e", "revenue": 7}]
+    stores.insert_many_into_store("company", [dict(record) for record in records])
+    # mongomock lacks the $type expression used by min and max
+    metrics = {"total": ("sum", "revenue"), "sectors": ("distinct", "sector")}
+
+    res = stores.aggregate_data_in_store("company", {"name": {"$ne": "b"}}, ["country"],
+                                         metrics)
+
+    assert sorted(res, key=lambda group: str(group["country"])) == [
+        {"country": None, "count": 1, "total": 7, "sectors": []},
+        {"country": "co", "count": 1, "total": 10, "sectors": ["tech"]},
+        {"country": "es", "count": 1, "total": 0, "sectors": ["tech"]},
+    ]
+    assert stores.aggregate_data_in_store("company", None) == [{"count": 4}]
+    assert stores.aggregate_data_in_store("company", {"uid": "bad"}) == [{"count": 0}]
+
+
+def test_writes_are_logged_as_changes(stores):
+    """Every write should be numbered in the change log, the oldest dropped beyond it."""
+    stores.change_log_retention = 4
+    uids = stores.insert_many_into_store("company", [{"name": "a"}, {"name": "b"}])
+    stores.update_data_in_store("company", {"name": "c"}, uids[0])
+    stores.delete_many_from_store("company", uids + ["bad"])
+
+    changes = stores.get_changes_from_store("company", 1, 10)
+    assert [(change["seq"], change["op"]) for change in changes["changes"]] == [
+        (2, "insert"), (3, "update"), (4, "delete"), (5, "delete")]
+    assert changes["changes"][1]["data"] == {"uid": uids[0], "name": "c"}
+    assert stores.get_changes_from_store("company", None, 10)["last_seq"] == 5
+    assert stores.get_changes_from_store("company", 0, 10)["expired"]
+    assert stores.get_changes_from_store("company", 6, 10)["expired"]
+
+
+def test_generation_changes_with_every_write(stores):
+    """The generation should only change when the store is written."""
+    first = stores.get_store_generation("company")
+    uid = stores.insert_data_into_store("company", {"name": "acme"})
+    second = stores.get_store_generation("company")
+
+    assert stores.get_store_generation("company") == second != first
+    stores.update_data_in_store("company", {"name": "acme inc"}, uid)
+    assert stores.get_store_generation("company") not in (first, second)
+
+
+def test_generation_waits_for_reserved_changes_to_be_written(stores, monkeypatch):
+    """A read between the reservation and the write should not get the next generation."""
+    uid = stores.insert_data_into_store("company", {"name": "acme"})
+    before = stores.get_store_generation("company")
+    reserve = stores._reserve
+    seen = []
+
+    def reserve_and_read(schema_keyname, count):
+        seq = yield from reserve(schema_keyname, count)
+        seen.append((stores.get_store_generation("company"),
+                     stores.get_one_data_from_store("company", uid)["name"]))
+        return seq
+
+    monkeypatch.setattr(stores, "_reserve", reserve_and_read)
+    stores.update_data_in_store("company", {"name": "acme inc"}, uid)
+
+    assert seen == [(before, "acme")]
+    assert stores.get_store_generation("company") != before
+
+def test_overtaken_writes_are_numbered_again(stores, monkeypatch):
+    """A write overtaken by a later numbered one should be logged after it."""
+    uid = stores.insert_data_into_store("company", {"name": "a"})
+    reserve = stores._reserve
+    races = {2: {"name": "b"}, 5: {"name": "c"}}
+
+    def racing_reserve(schema_keyname, count):
+        seq = yield from reserve(schema_keyname, count)
+        if seq in races:
+            # another update is numbered and written in the meantime
+            stores.update_data_in_store("company", races.pop(seq), uid)
+        return seq
+
+    monkeypatch.setattr(stores, "_reserve", racing_reserve)
+    stores.update_data_in_store("company", {"country": "co"}, uid)
+
+    res = stores.get_changes_from_store("company", 1, 10)
+    assert [(change["seq"], change["data"]) for change in res["changes"]] == [
+        (3, {"uid": uid, "name": "b"}), (4, {"uid": uid, "name": "b", "country": "co"})]
+    assert res["position"] == res["last_seq"] == 4
+    assert stores.get_one_data_from_store("company", uid) == res["changes"][-1]["data"]
+    assert stores.delete_many_from_store("company", [uid]) == 1
+    res = stores.get_changes_from_store("company", 4, 10)
+    assert [(change["seq"], change["op"]) for change in res["changes"]] == [
+        (6, "update"), (7, "delete")]
+
+
+def test_documents_written_without_sequence_numbers_are_updated(stores):
+    """Documents written before the change log should still be updated and deleted."""
+    res = stores.get_collection("store_company").insert_one({"name": "legacy"})
+    uid = str(res.inserted_id)
+
+    assert stores.update_data_in_store("company", {"name": "renamed"}, uid) == uid
+    assert stores.delete_many_from_store("company", [uid]) == 1
+    changes = stores.get_changes_from_store("company", 0, 10)
+    assert [change["op"] for change in changes["changes"]] == ["update", "delete"]
+    assert changes["epoch"] == stores.get_store_generation("company").rpartition("-")[0]
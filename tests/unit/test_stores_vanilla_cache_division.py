@@ -0,0 +1,166 @@
+import random
+
+import pytest
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+@pytest.fixture
+def schema():
+    """Provides a schema with an indexed 'country' property."""
+    return Schema(schema_keyname="company", schema_name="Company",
+                  schema_description="Company schema for tests",
+                  current_schema_definition={
+                      "type": "object",
+                      "properties": {
+                          "name": {"type": "string"},
+                          "country": {"type": "string", "x-index": True},
+                          "sector": {"type": "string"},
+                      }
+                  })
+
+
+@pytest.fixture(params=["dict", "columnar"])
+def stores(request, schema):
+    """Provides a vanilla store division of each layout with the 'company' store created."""
+    division = StoresVanillaCacheDivision(layout=request.param)
+    division.create_store_of_schema(schema)
+    return division
+
+
+def test_indexes_declared_in_definition(stores):
+    """Fields marked with x-index should be indexed when the store is created."""
+    assert stores.get_indexed_fields("company") == ["country"]
+
+
+def test_indexed_lookup_matches_scan(stores):
+    """Filtered reads through an index must return the same records as a full scan."""
+    for i in range(30):
+        stores.insert_data_into_store("company", {"name": f"c{i}", "country": ["co", "es"][i % 2],
+                                                  "sector": ["tech", "retail", "bank"][i % 3]})
+
+    res = stores.get_data_from_store("company", {"country": "co", "sector": "tech"})
+
+    assert len(res) == 5
+    assert all(item["country"] == "co" and item["sector"] == "tech" for item in res)
+    assert stores.get_data_from_store("company", {"country": "mx"}) == []
+
+
+def test_index_follows_updates_and_deletes(stores):
+    """The index must be maintained by updates and deletes."""
+    uid = stores.insert_data_into_store("company", {"name": "acme", "country": "co"})
+
+    stores.update_data_in_store("company", {"country": "es"}, uid)
+    assert stores.get_data_from_store("company", {"country": "co"}) == []
+    assert [i["uid"] for i in stores.get_data_from_store("company", {"country": "es"})] == [uid]
+
+    assert stores.delete_data_from_store("company", uid) == uid
+    assert stores.get_data_from_store("company", {"country": "es"}) == []
+    assert stores.delete_data_from_store("company", uid) is None
+
+
+def test_create_index_on_existing_records(stores):
+    """An index created through the store API should include the existing records."""
+    stores.insert_data_into_store("company", {"name": "acme", "sector": "tech"})
+    stores.insert_data_into_store("company", {"name": "globex"})
+
+    assert stores.create_index("company", "sector")
+    assert not stores.create_index("company", "sector")
+
+    assert len(stores.get_data_from_store("company", {"sector": "tech"})) == 1
+    assert len(stores.get_data_from_store("company", {"sector": None})) == 1
+    assert stores.drop_index("company", "sector")
+
+
+def test_unhashable_filter_falls_back_to_scan(stores):
+    """Filter values that cannot be hashed should still be answered."""
+    stores.insert_data_into_store("company", {"name": "acme", "country": ["co", "es"]})
+
+    res = stores.get_data_from_store("company", {"country": ["co", "es"]})
+
+    assert len(res) == 1
+
+
+def test_unknown_store(stores):
+    """Reading an unknown store should raise NotFound."""
+    with pytest.raises(NotFound):
+        stores.get_data_from_store("unknown", {})
+
+
+def test_iter_resumes_after_position(stores):
+    """Streaming after a position should skip the records already seen."""
+    uids = [stores.insert_data_into_store("company", {"name": f"c{i}", "country": "co"})
+            for i in range(5)]
+
+    first = list(stores.iter_data_from_store("company", None))
+    assert [item["uid"] for _, item in first] == uids
+
+    position = first[1][0]
+    stores.delete_data_from_store("company", uids[3])
+    new_uid = stores.insert_data_into_store("company", {"name": "new", "country": "co"})
+
+    rest = [item["uid"] for _, item in stores.iter_data_from_store("company", None, position)]
+    assert rest == [uids[2], uids[4], new_uid]
+    rest = [item["uid"] for _, item in
+            stores.iter_data_from_store("company", {"country": "co"}, position)]
+    assert rest == [uids[2], uids[4], new_uid]
+
+
+def test_operators_through_sorted_index_match_scan(stores):
+    """Range filters answered by a sorted index must return the records of a full scan."""
+    rnd = random.Random(5)
+    for i in range(300):
+        stores.insert_data_into_store("company", {"name": f"c{i}", "country": f"c{i % 7}",
+                                                  "revenue": rnd.choice([rnd.random() * 100,
+                                                                         rnd.randrange(100),
+                                                                         None, "n/a"])})
+    filters = [{"revenue": {"$gt": 20, "$lte": 60.5}},
+               {"revenue": {"$lt": 10}, "country": {"$in": ["c1", "c2"]}},
+               {"revenue": {"$gte": "a"}},
+               {"country": {"$ne": "c3"}, "revenue": {"$gte": 99}}]
+    expected = [sorted(item["uid"] for item in stores.get_data_from_store("company", f))
+                for f in filters]
+
+    assert stores.create_index("company", "revenue", "sorted")
+    assert stores.get_indexed_fields("company") == ["country", "revenue"]
+    for params, uids in zip(filters, expected):
+        assert stores._candidate_uids("company", params) is not None
+        assert sorted(item["uid"] for item in stores.get_data_from_store("company",
+                                                                           params)) == uids
+        assert sorted(item["uid"] for _, item in stores.iter_data_from_store("company",
+                                                                             params)) == uids
+
+    uid = stores.get_data_from_store("company", {"revenue": {"$gt": 20}})[0]["uid"]
+    stores.update_data_in_store("company", {"revenue": -1}, uid)
+    assert uid in {i["uid"] for i in stores.get_data_from_store("company",
+                                                                {"revenue": {"$lt": 0}})}
+    stores.delete_data_from_store("company", uid)
+    assert stores.get_data_from_store("company", {"revenue": {"$lt": 0}}) == []
+    unordered = {"revenue": {"$gt": {"a": 1}, "$gte": {"a": 2}}}
+    assert stores.get_data_from_store("company", unordered) == []
+    assert list(stores.iter_data_from_store("company", unordered)) == []
+    assert stores.aggregate_data_in_store("company", unordered) == [{"count": 0}]
+    with pytest.raises(ValueError):
+        stores.get_data_from_store("company", {"revenue": {"$exists": True}})
+
+
+def test_equality_through_sorted_index_match_scan(stores):
+    """Equality and $in on a field with only a sorted index must not scan the store."""
+    values = [1, 1.0, 2, 2.5, "a", True, False, None, 0]
+    for i in range(90):
+        stores.insert_data_into_store("company", {"name": f"c{i}", "rank": values[i % 9]})
+    filters = [{"rank": 2}, {"rank": "a"}, {"rank": {"$in": [2.5, "a", 7]}}, {"rank": 1},
+               {"rank": True}, {"rank": {"$in": [2, None]}}]
+    expected = [sorted(item["uid"] for item in stores.get_data_from_store("company", f))
+                for f in filters]
+
+    assert stores.create_index("company", "rank", "sorted")
+    for params, uids in zip(filters, expected):
+        assert sorted(item["uid"] for item in stores.get_data_from_store("company",
+                                                                           params)) == uids
+    assert len(stores._candidate_uids("company", {"rank": 2})) == 10
+    assert len(stores._candidate_uids("company", {"rank": {"$in": [2.5, "a", 7]}})) == 20
+    assert stores._candidate_uids("company", {"rank": 1}) is None
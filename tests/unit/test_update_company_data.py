@@ -0,0 +1,100 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from jsonschema.validators import Draft7Validator
+from bisslog.exceptions.domain_exception import NotFound
+
+from src.domain.model.schema import Schema
+from src.domain.use_cases.company_data.update_company_data import UpdateCompanyData
+from src.domain.validation.messages import validation_error_messages
+from src.domain.validation.patch_validator import PatchValidator
+from src.domain.validation.validator_cache import VALIDATOR_CACHE
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+DEFINITION = {
+    "type": "object",
+    "definitions": {"code": {"type": "string", "pattern": "^[a-z]{2}$"}},
+    "properties": {"name": {"type": "string"},
+                   "country": {"$ref": "#/definitions/code"},
+                   "employees": {"type": "integer", "minimum": 0},
+                   "listed": {"type": "boolean"},
+                   "ticker": {"type": "string"}},
+    "required": ["name"],
+    "dependencies": {"ticker": ["listed"]},
+    "additionalProperties": False
+}
+
+
+@pytest.fixture
+def mock_db():
+    """Provides vanilla divisions with a 'company' schema and one stored record."""
+    schema = Schema(schema_keyname="company", schema_name="Company",
+                    schema_description="Company schema for tests",
+                    current_schema_definition=DEFINITION)
+    database = MagicMock()
+    database.schema = SchemaVanillaCacheDivision()
+    database.stores = StoresVanillaCacheDivision()
+    database.schema.create_schema(schema)
+    database.stores.create_store_of_schema(schema)
+    database.uid = database.stores.insert_data_into_store(
+        "company", {"name": "Acme", "country": "co", "employees": 10})
+    with patch("src.domain.use_cases.company_data.update_company_data.db", database):
+        yield database
+    VALIDATOR_CACHE.invalidate("company")
+
+
+def test_valid_patch_is_applied(mock_db):
+    """A valid patch should be merged into the stored record."""
+    res = UpdateCompanyData()("company", {"employees": 12}, mock_db.uid)
+
+    assert res == {"updated": mock_db.uid}
+    assert mock_db.stores.get_one_data_from_store("company", mock_db.uid)["employees"] == 12
+
+
+def test_invalid_patch_is_rejected(mock_db):
+    """Errors of the patched properties should be reported and nothing stored."""
+    res = UpdateCompanyData()("company", {"employees": -1, "country": "COL"}, mock_db.uid)
+
+    assert sorted(res["errors"]) == [
+        "Error in '-1': -1 is less than the minimum of 0",
+        "Error in 'COL': 'COL' does not match '^[a-z]{2}$'"]
+    assert mock_db.stores.get_one_data_from_store("company", mock_db.uid)["employees"] == 10
+
+
+def test_record_constraints_are_checked_on_the_merged_record(mock_db):
+    """Unknown fields and dependencies are validated against the whole record."""
+    res = UpdateCompanyData()("company", {"ticker": "ACM", "extra": 1}, mock_db.uid)
+
+    assert len(res["errors"]) == 2
+    assert UpdateCompanyData()("company", {"ticker": "ACM", "listed": True},
+                               mock_db.uid) == {"updated": mock_db.uid}
+
+
+def test_missing_record_and_schema(mock_db):
+    """Unknown records are not updated and unknown schemas are rejected."""
+    assert UpdateCompanyData()("company", {"employees": 1}, "missing") == {"updated": None}
+    with pytest.raises(NotFound):
+        UpdateCompanyData()("unknown", {"employees": 1}, mock_db.uid)
+
+
+@pytest.mark.parametrize("record, patch_", [
+    ({"name": "Acme"}, {"employees": "many"}),
+    ({"name": "Acme", "listed": "yes"}, {"ticker": 3}),
+    ({"employees": 1}, {"country": "co"}),
+    ({"name": "Acme"}, {"ticker": "ACM", "other": None}),
+    ({"name": "Acme", "uid": "x1"}, {"uid": "x1", "listed": False}),
+])
+def test_patch_errors_match_the_full_validation(record, patch_):
+    """The patch errors should be the ones of the whole merged record on patched fields."""
+    validator = PatchValidator(DEFINITION)
+    merged = {key: value for key, value in {**record, **patch_}.items() if key != "uid"}
+    untouched = [value for key, value in record.items() if key not in patch_]
+    expected = [message for message in validation_error_messages(Draft7Validator(DEFINITION),
+                                                                 merged)
+                if not any(message.startswith(f"Error in '{value}'") for value in untouched)]
+
+    assert sorted(f"Error in '{error.instance}': {error.message}"
+                  for error in validator.iter_errors(record, patch_)) == sorted(expected)
@@ -0,0 +1,80 @@
+import os
+import pstats
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from bisslog import BasicUseCase
+
+from src.domain.profiling.use_case_profiler import (PROFILER, ProfiledUseCase,
+                                                    UseCaseProfiler)
+
+
+class EchoCompanyData(ProfiledUseCase, BasicUseCase):
+
+    def use(self, schema_keyname: str, data: dict, *args, **kwargs):
+        if data.get("fail"):
+            raise RuntimeError("failed")
+        return {"schema_keyname": schema_keyname, "kwargs": kwargs}
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    """Restores the default, disabled, profiling settings after the test."""
+    PROFILER.configure(directory=str(tmp_path))
+    yield PROFILER
+    PROFILER.configure()
+
+
+def test_disabled_profiler_writes_nothing(profiler):
+    """Without sampling nor flag, the call runs as is."""
+    with patch.object(UseCaseProfiler, "run") as run:
+        assert EchoCompanyData()("person", {})["schema_keyname"] == "person"
+
+    run.assert_not_called()
+    assert os.listdir(profiler.directory) == []
+
+
+def test_request_flag_profiles_and_is_not_forwarded(profiler):
+    """The profile keyword should profile the call without reaching the use case."""
+    res = EchoCompanyData()("person", {}, profile=True, other=1)
+
+    assert "profile" not in res["kwargs"] and res["kwargs"]["other"] == 1
+    files = os.listdir(profiler.directory)
+    assert len(files) == 1 and files[0].endswith(".prof")
+    assert "-EchoCompanyData-person-" in files[0]
+    pstats.Stats(os.path.join(profiler.directory, files[0]))
+
+
+def test_sampling_is_restricted_to_schemas_and_captures_tracemalloc(profiler):
+    """Sampled calls of other schemas are skipped and both profilers can run."""
+    profiler.configure(sample_rate=1.0, modes=("cprofile", "tracemalloc"),
+                       schemas=["person"], directory=profiler.directory)
+    EchoCompanyData()("company", {})
+    assert os.listdir(profiler.directory) == []
+
+    with pytest.raises(RuntimeError):
+        EchoCompanyData()(schema_keyname="person", data={"fail": True})
+
+    files = sorted(os.listdir(profiler.directory))
+    assert [os.path.splitext(name)[1] for name in files] == [".prof", ".tracemalloc"]
+    assert not tracemalloc.is_tracing()
+    tracemalloc.Snapshot.load(os.path.join(profiler.directory, files[1]))
+
+
+def test_settings_from_env(monkeypatch, tmp_path):
+    """The environment variables should configure the profiler."""
+    monkeypatch.setenv("USE_CASE_PROFILING_SAMPLE_RATE", "0.25")
+    monkeypatch.setenv("USE_CASE_PROFILING_MODES", "tracemalloc")
+    monkeypatch.setenv("USE_CASE_PROFILING_SCHEMAS", "person, company")
+    monkeypatch.setenv("USE_CASE_PROFILING_DIR", str(tmp_path))
+
+    profiler = UseCaseProfiler.from_env()
+
+    assert profiler.sample_rate == 0.25 and profiler.modes == ("tracemalloc",)
+    assert profiler.schemas == {"person", "company"}
+    assert profiler.directory == str(tmp_path)
+    monkeypatch.setenv("USE_CASE_PROFILING", "1")
+    assert UseCaseProfiler.from_env().sample_rate == 1.0
+    with pytest.raises(ValueError):
+        UseCaseProfiler(modes=("perf",))
@@ -0,0 +1,69 @@
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.validation.validator_cache import ValidatorCache
+
+
+def make_schema(keyname: str, version: int, definition: dict = None) -> Schema:
+    """Build a schema with the given keyname and version."""
+    return Schema(schema_keyname=keyname, schema_name="Some Name",
+                  schema_description="Some schema description",
+                  current_schema_definition=definition or {"type": "object"},
+                  current_version=version)
+
+
+def test_validator_is_reused_for_same_version():
+    """Same keyname and version should return the very same compiled validator."""
+    cache = ValidatorCache()
+    schema = make_schema("company", 1)
+
+    first = cache.get_validator(schema)
+    second = cache.get_validator(schema)
+
+    assert first is second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_new_version_compiles_new_validator():
+    """A different current version must not reuse the previous validator."""
+    cache = ValidatorCache()
+    old = cache.get_validator(make_schema("company", 1, {"type": "object"}))
+    new = cache.get_validator(make_schema("company", 2, {"type": "array"}))
+
+    assert old is not new
+    assert not new.is_valid({})
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_is_evicted():
+    """Exceeding max_size should drop the least recently used validator."""
+    cache = ValidatorCache(max_size=2)
+    cache.get_validator(make_schema("first", 1))
+    cache.get_validator(make_schema("second", 1))
+    cache.get_validator(make_schema("first", 1))
+    cache.get_validator(make_schema("third", 1))
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+    cache.get_validator(make_schema("first", 1))
+    assert cache.stats()["hits"] == 2
+
+
+def test_invalidate_drops_every_version_of_schema():
+    """Invalidating a keyname should drop all its versions and keep the rest."""
+    cache = ValidatorCache()
+    cache.get_validator(make_schema("company", 1))
+    cache.get_validator(make_schema("company", 2))
+    cache.get_validator(make_schema("language", 1))
+
+    assert cache.invalidate("company") == 2
+    assert cache.stats()["size"] == 1
+
+
+def test_invalid_max_size():
+    """The cache must hold at least one validator."""
+    with pytest.raises(ValueError, match="max_size"):
+        ValidatorCache(max_size=0)
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.domain.model.schema_definition_version import SchemaDefinitionVersion
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.schema_def_version_vanilla_cache_div import \
+    SchemaDefVersionVanillaCacheDiv
+from src.infra.database.implementations.vanilla_cache.schema_vanilla_cache_division import \
+    SchemaVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+@pytest.fixture
+def schema():
+    """Provides a schema with an indexed 'country' property."""
+    return Schema(schema_keyname="company", schema_name="Company",
+                  schema_description="Company schema for tests",
+                  current_schema_definition={
+                      "type": "object",
+                      "properties": {"country": {"type": "string", "x-index": True}}
+                  })
+
+
+def restart_stores(directory, **kwargs) -> StoresVanillaCacheDivision:
+    """Build a store division over the files of the given directory."""
+    return StoresVanillaCacheDivision(VanillaPersistence(str(directory), "stores", **kwargs))
+
+
+def test_stores_survive_restart(tmp_path, schema):
+    """Snapshot plus log tail should rebuild records, indexes and positions."""
+    stores = restart_stores(tmp_path, snapshot_every=0)
+    stores.create_store_of_schema(schema)
+    uids = stores.insert_many_into_store("company", [{"country": "co"}, {"country": "es"}])
+    stores.checkpoint()
+    uid = stores.insert_data_into_store("company", {"country": "mx"})
+    stores.update_data_in_store("company", {"country": "co"}, uid)
+    stores.delete_data_from_store("company", uids[1])
+    stores._persistence.close()
+
+    restored = restart_stores(tmp_path)
+
+    assert [item["uid"] for _, item in restored.iter_data_from_store("company", None)] == [
+        uids[0], uid]
+    assert {i["uid"] for i in restored.get_data_from_store("company", {"country": "co"})} == {
+        uids[0], uid}
+    assert restored.get_indexed_fields("company") == ["country"]
+
+
+def test_torn_log_tail_is_dropped(tmp_path, schema):
+    """A partially written last entry should be ignored and truncated."""
+    stores = restart_stores(tmp_path)
+    stores.create_store_of_schema(schema)
+    stores.insert_data_into_store("company", {"country": "co"})
+    stores._persistence.close()
+    with open(os.path.join(tmp_path, "stores.wal"), "ab") as file:
+        file.write(b"\x80\x05\x95garbage")
+
+    restored = restart_stores(tmp_path)
+    restored.insert_data_into_store("company", {"country": "es"})
+    restored._persistence.close()
+
+    assert len(restart_stores(tmp_path).get_data_from_store("company", None)) == 2
+
+
+def test_automatic_snapshot_truncates_log(tmp_path, schema):
+    """Reaching snapshot_every should write a snapshot and empty the log."""
+    wal_path = os.path.join(tmp_path, "stores.wal")
+    stores = restart_stores(tmp_path, snapshot_every=3)
+    stores.create_store_of_schema(schema)
+    stores.insert_data_into_store("company", {"country": "0"})
+    wal_size = os.path.getsize(wal_path)
+    stores.insert_data_into_store("company", {"country": "1"})
+
+    assert os.path.getsize(os.path.join(tmp_path, "stores.snapshot")) > 0
+    assert os.path.getsize(wal_path) == 0
+    stores.insert_data_into_store("company", {"country": "2"})
+    assert 0 < os.path.getsize(wal_path) < wal_size
+    stores._persistence.close()
+
+    _, entries = VanillaPersistence(str(tmp_path), "stores").load()
+    assert [operation for operation, _ in entries] == ["insert"]
+    assert len(restart_stores(tmp_path).get_data_from_store("company", None)) == 3
+
+
+def test_schemas_and_versions_survive_restart(tmp_path, schema):
+    """Schema and schema version divisions should be restored as well."""
+    schemas = SchemaVanillaCacheDivision(VanillaPersistence(str(tmp_path), "schemas"))
+    versions = SchemaDefVersionVanillaCacheDiv(VanillaPersistence(str(tmp_path), "versions"))
+    schemas.create_schema(schema)
+    uid_version = versions.create_schema_version(
+        SchemaDefinitionVersion("company", {"type": "array"}))
+    schemas.update_schema_definition("company", uid_version, {"type": "array"})
+
+    schemas = SchemaVanillaCacheDivision(VanillaPersistence(str(tmp_path), "schemas"))
+    versions = SchemaDefVersionVanillaCacheDiv(VanillaPersistence(str(tmp_path), "versions"))
+
+    assert schemas.get_schema("company").current_version == uid_version
+    assert versions.get_schema_version(uid_version).schema_definition == {"type": "array"}
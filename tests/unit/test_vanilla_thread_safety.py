@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.domain.model.schema import Schema
+from src.infra.database.implementations.vanilla_cache.job_checkpoint_vanilla_cache_division import \
+    JobCheckpointVanillaCacheDivision
+from src.infra.database.implementations.vanilla_cache.locking import ReadWriteLock
+from src.infra.database.implementations.vanilla_cache.persistence import VanillaPersistence
+from src.infra.database.implementations.vanilla_cache.stores_vanilla_cache_division import \
+    StoresVanillaCacheDivision
+
+
+def make_schema(keyname: str) -> Schema:
+    """Build a schema with an indexed 'country' property."""
+    return Schema(schema_keyname=keyname, schema_name=keyname,
+                  schema_description="Schema for thread safety tests",
+                  current_schema_definition={
+                      "type": "object",
+                      "properties": {"country": {"type": "string", "x-index": True}}
+                  })
+
+
+@pytest.fixture
+def stores():
+    """Provides a thread-safe store division with two stores and small iteration chunks."""
+    division = StoresVanillaCacheDivision(thread_safe=True)
+    division.iter_chunk_size = 7
+    division.create_store_of_schema(make_schema("a"))
+    division.create_store_of_schema(make_schema("b"))
+    return division
+
+
+def run_concurrently(*workers):
+    """Run the workers in their own threads and re-raise the first error."""
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        for future in [executor.submit(worker) for worker in workers]:
+            future.result()
+
+
+def test_concurrent_writes_and_reads(stores):
+    """Readers should never fail nor see torn records while writers mutate the store."""
+    done = threading.Event()
+
+    def writer(keyname, offset):
+        def work():
+            for i in range(300):
+                uid = stores.insert_data_into_store(keyname, {"country": "co", "n": offset + i})
+                stores.update_data_in_store(keyname, {"country": "es"}, uid)
+                if i % 3 == 0:
+                    stores.delete_data_from_store(keyname, uid)
+        return work
+
+    def reader(keyname):
+        def work():
+            while not done.is_set():
+                for item in stores.get_data_from_store(keyname, {"country": "es"}):
+                    assert item["country"] == "es"
+                positions = [seq for seq, _ in stores.iter_data_from_store(keyname, None)]
+                assert positions == sorted(positions)
+        return work
+
+    def writers():
+        try:
+            run_concurrently(writer("a", 0), writer("a", 1000), writer("b", 0))
+        finally:
+            done.set()
+
+    run_concurrently(writers, reader("a"), reader("a"), reader("b"))
+
+    assert len(stores.get_data_from_store("a", None)) == 400
+    assert len(stores.get_data_from_store("b", {"country": "es"})) == 200
+    assert not stores.get_data_from_store("a", {"country": "co"})
+
+
+def test_iteration_does_not_hold_the_lock(stores):
+    """A paused iteration should not block writers and should see later appends."""
+    for i in range(10):
+        stores.insert_data_into_store("a", {"n": i})
+    iterator = stores.iter_data_from_store("a", None)
+    first = [next(iterator) for _ in range(3)]
+
+    inserter = threading.Thread(target=stores.insert_data_into_store, args=("a", {"n": 10}))
+    inserter.start()
+    inserter.join(timeout=5)
+
+    assert not inserter.is_alive()
+    assert [item["n"] for _, item in first + list(iterator)] == list(range(11))
+
+
+def test_concurrent_writes_are_durable(tmp_path):
+    """Mutations from several threads should survive a restart across automatic snapshots."""
+    stores = StoresVanillaCacheDivision(
+        VanillaPersistence(str(tmp_path), "stores", snapshot_every=50), thread_safe=True)
+    stores.create_store_of_schema(make_schema("a"))
+    stores.create_store_of_schema(make_schema("b"))
+
+    def writer(keyname):
+        def work():
+            for i in range(200):
+                stores.insert_data_into_store(keyname, {"country": str(i % 4)})
+        return work
+
+    run_concurrently(writer("a"), writer("a"), writer("b"))
+    stores._persistence.close()
+
+    restored = StoresVanillaCacheDivision(VanillaPersistence(str(tmp_path), "stores"))
+    assert len(restored.get_data_from_store("a", None)) == 400
+    assert len(restored.get_data_from_store("b", {"country": "1"})) == 50
+
+
+def test_read_write_lock_excludes_writers():
+    """Readers should share the lock while a writer waits for all of them."""
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    lock.acquire_read()
+    acquired = threading.Event()
+
+    def write():
+        with lock.write():
+            acquired.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert not acquired.wait(0.05)
+    lock.release_read()
+    assert not acquired.wait(0.05)
+    lock.release_read()
+    writer.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_read_records_are_not_changed_by_later_updates(stores):
+    """Records returned by reads should be snapshots, safe to iterate during updates."""
+    uid = stores.insert_data_into_store("a", {"country": "co"})
+    read = stores.get_one_data_from_store("a", uid)
+    listed = stores.get_data_from_store("a", {"country": "co"})[0]
+    streamed = next(iter(stores.iter_data_from_store("a", None)))[1]
+    done = threading.Event()
+
+    def updater():
+        for i in range(2000):
+            stores.update_data_in_store("a", {f"field{i}": i}, uid)
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            for record in (read, listed, streamed):
+                assert sum(1 for _ in record.items()) == 2
+
+    run_concurrently(updater, reader)
+    assert read == {"uid": uid, "country": "co"}
+    assert len(stores.get_one_data_from_store("a", uid)) == 2002
+
+
+def test_job_checkpoints_are_thread_safe():
+    """Concurrent saves and deletes of checkpoints should never fail."""
+    checkpoints = JobCheckpointVanillaCacheDivision(thread_safe=True)
+
+    def worker(offset):
+        def work():
+            for i in range(500):
+                checkpoints.save_checkpoint(f"job{offset}", {"after": i})
+                assert checkpoints.get_checkpoint(f"job{offset}")["after"] == i
+                if i % 10 == 0:
+                    assert checkpoints.delete_checkpoint(f"job{offset}")
+        return work
+
+    run_concurrently(*(worker(offset) for offset in range(4)))
+    assert checkpoints.get_checkpoint("job0") == {"after": 499}